@@ -0,0 +1,211 @@
+"""命令行工具
+
+用法：
+    python -m src.cli export "assets/**/*.mpx" -o build/assets -f c_array --scan vertical --bit-order lsb
+
+不创建窗口：项目通过 Project.load 加载，只有包含可见文本图层时才在 offscreen 平台上
+创建 QGuiApplication 渲染文本，适合在没有显示器的构建机上批量生成固件资源
+"""
+import argparse
+import glob
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from .core.canvas import Canvas
+from .core.layer import Layer
+from .core.project import Project
+from .services.export_service import ExportService
+
+# 导出格式 -> 输出文件扩展名
+FORMAT_EXTENSIONS = {
+    "c_array": ".h",
+    "binary": ".bin",
+    "png": ".png",
+}
+
+
+def _expand_inputs(patterns: List[str]) -> List[str]:
+    """
+    展开输入文件的通配符（支持 ** 递归匹配），保持顺序并去重
+
+    Args:
+        patterns: 文件路径或通配符
+
+    Returns:
+        文件路径列表，没有匹配的通配符原样保留（加载时报告错误）
+    """
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            print(f"警告: 没有匹配的文件: {pattern}", file=sys.stderr)
+        for path in matches:
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+
+class _TextRenderer:
+    """文本图层渲染器（第一次渲染时才创建 QGuiApplication 和文本服务）"""
+
+    def __init__(self):
+        self._app = None
+        self._text_service = None
+
+    def __call__(self, layer: Layer) -> Optional[np.ndarray]:
+        if self._text_service is None:
+            # 没有显示器时使用 offscreen 平台，已设置的平台保持不变
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+            from PyQt6.QtGui import QGuiApplication
+            from .services.font_manager import FontManager
+            from .services.text_service import TextService
+
+            self._app = QGuiApplication.instance() or QGuiApplication([sys.argv[0]])
+            self._text_service = TextService(FontManager())
+        return self._text_service.render_text_object(layer.text_object)
+
+
+def flatten_project(project_path: str, render_text: _TextRenderer) -> np.ndarray:
+    """
+    加载项目并合并所有可见图层（包括文本图层）
+
+    Args:
+        project_path: 项目文件路径（.mpx 或 .mpxb）
+        render_text: 文本图层渲染函数
+
+    Returns:
+        合并后的位图数据
+
+    Raises:
+        ValueError: 项目加载失败，或有图层被跳过、解码失败
+    """
+    canvas = Canvas(1, 1, layer_storage="auto")
+    project = Project(canvas)
+    # 延迟加载：隐藏图层不会被解码
+    if not project.load(project_path, lazy=True):
+        raise ValueError("加载项目失败")
+
+    has_text = any(
+        layer.visible and layer.layer_type == "text" and layer.text_object
+        for layer in canvas.layers
+    )
+    data = canvas.merge_visible_layers(render_text if has_text else None)
+
+    # 被跳过或解码失败的图层会导出为空白，不能当作成功
+    if project.load_errors:
+        raise ValueError("图层数据损坏: " + "; ".join(project.load_errors))
+    return data
+
+
+def export_file(data: np.ndarray, output_path: str, format_type: str,
+                scan_mode: str, msb_first: bool, invert: bool) -> None:
+    """
+    按导出对话框相同的选项写入导出文件
+
+    Args:
+        data: 位图数据
+        output_path: 输出文件路径
+        format_type: 导出格式 ('c_array' | 'binary' | 'png')
+        scan_mode: 扫描模式 ('horizontal' | 'vertical')
+        msb_first: 是否 MSB first
+        invert: 是否反色
+    """
+    if format_type == "c_array":
+        array_name = Path(output_path).stem.replace("-", "_").replace(" ", "_")
+        c_code = ExportService.export_to_c_array(data, array_name, scan_mode, msb_first, invert)
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(c_code)
+    elif format_type == "binary":
+        with open(output_path, "wb") as f:
+            f.write(ExportService.export_to_binary(data, scan_mode, msb_first, invert))
+    elif not ExportService.export_to_png(data, output_path, invert):
+        raise OSError("写入 PNG 失败")
+
+
+def run_export(args: argparse.Namespace) -> int:
+    """
+    批量导出项目文件
+
+    Args:
+        args: 命令行参数
+
+    Returns:
+        退出码（有文件失败时为 1）
+    """
+    inputs = _expand_inputs(args.inputs)
+    if not inputs:
+        print("错误: 没有要导出的项目文件", file=sys.stderr)
+        return 1
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    render_text = _TextRenderer()
+    msb_first = args.bit_order == "msb"
+    extension = FORMAT_EXTENSIONS[args.format]
+    failed = 0
+
+    for input_path in inputs:
+        output_dir = args.output_dir or os.path.dirname(input_path)
+        output_path = os.path.join(output_dir, Path(input_path).stem + extension)
+        try:
+            data = flatten_project(input_path, render_text)
+            export_file(data, output_path, args.format, args.scan, msb_first, args.invert)
+        except Exception as e:
+            failed += 1
+            print(f"失败: {input_path}: {e}", file=sys.stderr)
+            continue
+        if not args.quiet:
+            print(f"{input_path} -> {output_path} ({data.shape[1]}x{data.shape[0]})")
+
+    if failed:
+        print(f"{failed}/{len(inputs)} 个文件导出失败", file=sys.stderr)
+        return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """创建命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="MonoPixel Editor 命令行工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="批量导出项目文件（合并所有可见图层）")
+    export_parser.add_argument("inputs", nargs="+", help="项目文件或通配符（支持 **）")
+    export_parser.add_argument("-o", "--output-dir",
+                               help="输出目录（默认与项目文件相同），输出文件名为项目文件名加格式扩展名")
+    export_parser.add_argument("-f", "--format", choices=sorted(FORMAT_EXTENSIONS), default="c_array",
+                               help="导出格式（默认 c_array）")
+    export_parser.add_argument("--scan", choices=["horizontal", "vertical"], default="horizontal",
+                               help="扫描模式：horizontal 逐行，vertical 为 Page mode（默认 horizontal）")
+    export_parser.add_argument("--bit-order", choices=["msb", "lsb"], default="msb",
+                               help="位序（默认 msb）")
+    export_parser.add_argument("--invert", action="store_true", help="反色")
+    export_parser.add_argument("-q", "--quiet", action="store_true", help="不输出每个文件的导出结果")
+    export_parser.set_defaults(func=run_export)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口
+
+    Args:
+        argv: 命令行参数（不含程序名），为 None 时使用 sys.argv
+
+    Returns:
+        退出码
+    """
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
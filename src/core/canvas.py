@@ -1,27 +1,36 @@
 """画布数据模型"""
 import numpy as np
-from typing import List, Optional
+from typing import List, Optional, Tuple, Callable
 from .layer import Layer
+from .layer_storage import DenseStorage, TiledStorage, storage_mode_for_size
 from .text_object import TextObject
+from ..utils.geometry import union_rect
+from ..utils.bit_operations import unpack_rows
 
 
 class Canvas:
     """画布类，管理多个图层"""
 
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, layer_storage: str = "dense"):
         """
         初始化画布
 
         Args:
             width: 画布宽度
             height: 画布高度
+            layer_storage: 新建位图图层的像素存储模式 ('dense' | 'packed' | 'tiled' |
+                'auto' 按画布尺寸选择，大画布使用分块稀疏存储)
         """
         self.width = width
         self.height = height
+        self.layer_storage = layer_storage
         self.layers: List[Layer] = []
         self.active_layer_index = 0
         self.grid_visible = True
 
+        # 活动图层之下/之上的合成缓存 {(part, include_text): (key, storage)}
+        self._composite_cache = {}
+
         # 创建默认图层
         self.add_layer("Background")
 
@@ -42,11 +51,22 @@ class Canvas:
             else:
                 name = f"Layer {len(self.layers) + 1}"
 
-        layer = Layer(self.width, self.height, name, layer_type)
+        layer = Layer(self.width, self.height, name, layer_type, self.get_layer_storage())
         self.layers.append(layer)
         self.active_layer_index = len(self.layers) - 1
         return layer
 
+    def get_layer_storage(self) -> str:
+        """
+        获取新建位图图层实际使用的存储模式（解析 'auto'）
+
+        Returns:
+            存储模式
+        """
+        if self.layer_storage == "auto":
+            return storage_mode_for_size(self.width, self.height)
+        return self.layer_storage
+
     def add_text_layer(self, text_object: TextObject, name: Optional[str] = None) -> Layer:
         """
         添加文本图层
@@ -132,23 +152,348 @@ class Canvas:
             return self.layers[self.active_layer_index]
         return None
 
-    def merge_visible_layers(self) -> np.ndarray:
+    def take_dirty_rect(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        取出并清空所有图层的已修改区域
+
+        Returns:
+            所有图层已修改区域的并集 (x0, y0, x1, y1)，没有修改时返回 None
+        """
+        rect = None
+        for layer in self.layers:
+            rect = union_rect(rect, layer.take_dirty_rect())
+        return rect
+
+    def merge_visible_layers_packed(self) -> np.ndarray:
+        """
+        合并所有可见位图图层，结果按行打包（MSB 在前，每行补齐到整字节）
+
+        打包存储的图层直接按字节合并，不需要解包；文本图层被忽略
+
+        Returns:
+            打包数据 (height, (width + 7) // 8)
+        """
+        result = np.zeros((self.height, (self.width + 7) // 8), dtype=np.uint8)
+        for layer in self.layers:
+            if layer.visible and layer.layer_type == "bitmap" and layer.has_bitmap:
+                result |= layer.get_packed_rows()
+        return result
+
+    def merge_visible_layers(
+        self,
+        render_text: Optional[Callable[[Layer], Optional[np.ndarray]]] = None
+    ) -> np.ndarray:
         """
         合并所有可见图层
 
         注意：文本图层需要先渲染为位图才能合并
 
+        Args:
+            render_text: 文本图层渲染函数（返回文本位图），为 None 时忽略文本图层
+
         Returns:
             合并后的位图数据
         """
+        below, active, above = self.get_composite_parts(render_text)
+
+        # 黑色像素（True）遮挡下层，白色像素（False）透明
+        result = below | above
+        if active is not None:
+            result |= active
+        return result
+
+    def get_composite_parts(
+        self,
+        render_text: Optional[Callable[[Layer], Optional[np.ndarray]]] = None,
+        include_active: bool = True
+    ) -> Tuple[np.ndarray, Optional[np.ndarray], np.ndarray]:
+        """
+        获取分层合成结果：活动图层之下的合成、活动图层、活动图层之上的合成
+
+        之下/之上的合成会被缓存，只有在这些图层的修订号、可见性、
+        文本属性或图层顺序变化时才重新合成，绘制时只需要合并三个数组。
+        包含分块图层时合成结果按块缓存，这里每次展开为完整数组，
+        按区域绘制时应使用 get_composite_region
+
+        Args:
+            render_text: 文本图层渲染函数（返回文本位图），为 None 时忽略文本图层
+            include_active: 是否返回活动图层的数据（按区域读取时用 get_active_region 代替）
+
+        Returns:
+            (below, active, above)，active 为活动图层的位图数据，不可见或不需要时为 None
+        """
+        index = self.active_layer_index
+        include_text = render_text is not None
+
+        below = self._get_cached_composite("below", self.layers[:max(0, index)], render_text).to_array()
+        above = self._get_cached_composite("above", self.layers[index + 1:], render_text).to_array()
+
+        active = None
+        layer = self.get_active_layer()
+        if include_active and layer is not None and layer.visible:
+            if layer.layer_type == "bitmap":
+                active = self._get_layer_array(layer)
+            elif include_text:
+                active = self._render_layer(layer, render_text)
+
+        return below, active, above
+
+    def get_composite_region(
+        self,
+        x0: int, y0: int, x1: int, y1: int,
+        render_text: Optional[Callable[[Layer], Optional[np.ndarray]]] = None
+    ) -> np.ndarray:
+        """
+        获取活动图层之下和之上的合成在指定区域内的数据（不含活动图层）
+
+        合成结果按块缓存时只读取与区域相交的块，不展开整个画布
+
+        Args:
+            x0, y0: 左上角坐标
+            x1, y1: 右下角坐标（不包含，需在画布范围内）
+            render_text: 文本图层渲染函数，为 None 时忽略文本图层
+
+        Returns:
+            区域数据 (y1 - y0, x1 - x0)
+        """
+        index = self.active_layer_index
+        below = self._get_cached_composite("below", self.layers[:max(0, index)], render_text)
+        above = self._get_cached_composite("above", self.layers[index + 1:], render_text)
+        return below.get_region(x0, y0, x1, y1) | above.get_region(x0, y0, x1, y1)
+
+    def get_active_region(
+        self,
+        x0: int, y0: int, x1: int, y1: int,
+        render_text: Optional[Callable[[Layer], Optional[np.ndarray]]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        获取活动图层在指定区域内的位图（只读取区域内的数据，不展开整个图层）
+
+        Args:
+            x0, y0: 左上角坐标
+            x1, y1: 右下角坐标（不包含，需在画布范围内）
+            render_text: 文本图层渲染函数，为 None 时忽略文本图层
+
+        Returns:
+            区域数据 (y1 - y0, x1 - x0)，活动图层不可见或没有内容时返回 None
+        """
+        layer = self.get_active_layer()
+        if layer is None or not layer.visible:
+            return None
+        if layer.layer_type == "bitmap":
+            return layer.get_region(x0, y0, x1, y1) if layer.has_bitmap else None
+
+        if layer.layer_type != "text" or not layer.text_object or render_text is None:
+            return None
+        text_bitmap = render_text(layer)
+        if text_bitmap is None:
+            return None
+
+        # 文本位图与区域的交集
+        result = np.zeros((y1 - y0, x1 - x0), dtype=bool)
+        px, py = layer.text_object.position
+        text_h, text_w = text_bitmap.shape
+        ix0, iy0 = max(x0, px), max(y0, py)
+        ix1, iy1 = min(x1, px + text_w), min(y1, py + text_h)
+        if ix1 > ix0 and iy1 > iy0:
+            result[iy0 - y0:iy1 - y0, ix0 - x0:ix1 - x0] = text_bitmap[iy0 - py:iy1 - py, ix0 - px:ix1 - px]
+        return result
+
+    def _get_layer_array(self, layer: Layer) -> Optional[np.ndarray]:
+        """
+        获取位图图层的展开数据
+
+        稠密存储直接返回内部数组；打包/分块存储的展开结果按修订号缓存，
+        图层未修改时重复绘制不会重新展开
+
+        Args:
+            layer: 位图图层
+
+        Returns:
+            位图数据 (height, width)
+        """
+        if layer.storage_mode == "dense" or not layer.has_bitmap:
+            return layer.data
+        key = (id(layer), layer.revision, layer.width, layer.height)
+        cached = self._composite_cache.get("active")
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        data = layer.data
+        self._composite_cache["active"] = (key, data)
+        return data
+
+    def _get_cached_composite(
+        self,
+        part: str,
+        layers: List[Layer],
+        render_text: Optional[Callable[[Layer], Optional[np.ndarray]]]
+    ):
+        """
+        获取一组图层的合成结果（带缓存）
+
+        画布使用分块存储或包含分块图层时合成到分块存储，只为有内容的块分配内存；
+        否则合成到稠密存储
+
+        Args:
+            part: 缓存名称（below/above）
+            layers: 要合成的图层
+            render_text: 文本图层渲染函数
+
+        Returns:
+            合成结果的存储（DenseStorage 或 TiledStorage）
+        """
+        include_text = render_text is not None
+        key = (self.width, self.height) + tuple(
+            (id(layer), layer.visible, layer.revision,
+             layer.text_object.cache_key() if include_text and layer.text_object else None)
+            for layer in layers
+        )
+
+        cached = self._composite_cache.get((part, include_text))
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        tiled = self.get_layer_storage() == "tiled" or any(
+            layer.visible and layer.layer_type == "bitmap" and layer.storage_mode == "tiled"
+            for layer in layers
+        )
+        if tiled:
+            result = self._composite_tiled(layers, render_text)
+        else:
+            result = DenseStorage(self.width, self.height, self._composite_dense(layers, render_text))
+
+        self._composite_cache[(part, include_text)] = (key, result)
+        return result
+
+    def _composite_dense(
+        self,
+        layers: List[Layer],
+        render_text: Optional[Callable[[Layer], Optional[np.ndarray]]]
+    ) -> np.ndarray:
+        """
+        把一组图层合成到完整的位图数组
+
+        Args:
+            layers: 要合成的图层（不含分块图层）
+            render_text: 文本图层渲染函数
+
+        Returns:
+            合成后的位图数据 (height, width)
+        """
         result = np.zeros((self.height, self.width), dtype=bool)
+        packed = None
+        for layer in layers:
+            if not layer.visible:
+                continue
+            if layer.layer_type == "bitmap" and layer.storage_mode == "packed" and layer.has_bitmap:
+                # 打包图层直接按字节合并，最后统一解包一次
+                if packed is None:
+                    packed = layer.get_packed_rows().copy()
+                else:
+                    packed |= layer.get_packed_rows()
+                continue
+            layer_data = self._render_layer(layer, render_text)
+            if layer_data is not None:
+                result |= layer_data
+
+        if packed is not None:
+            result |= unpack_rows(packed, self.width, msb_first=True)
+        return result
 
-        # 从下到上依次叠加
-        for layer in self.layers:
-            if layer.visible and layer.layer_type == "bitmap" and layer.data is not None:
-                # 黑色像素（True）遮挡下层，白色像素（False）透明
-                result = np.logical_or(result, layer.data)
+    def _composite_tiled(
+        self,
+        layers: List[Layer],
+        render_text: Optional[Callable[[Layer], Optional[np.ndarray]]]
+    ) -> TiledStorage:
+        """
+        把一组图层按块合成（只合并非空块和文本所在区域，不分配完整画布）
+
+        Args:
+            layers: 要合成的图层
+            render_text: 文本图层渲染函数
+
+        Returns:
+            合成结果的分块存储
+        """
+        result = TiledStorage(self.width, self.height)
+
+        def merge(x: int, y: int, values: np.ndarray) -> None:
+            h, w = values.shape
+            result.set_region(x, y, result.get_region(x, y, x + w, y + h) | values)
+
+        for layer in layers:
+            if not layer.visible:
+                continue
+            if layer.layer_type == "bitmap":
+                for x, y, tile in layer.iter_tiles():
+                    merge(x, y, tile)
+                continue
+            placed = self._place_text(layer, render_text)
+            if placed is not None:
+                merge(*placed)
+        return result
+
+    def _place_text(
+        self,
+        layer: Layer,
+        render_text: Optional[Callable[[Layer], Optional[np.ndarray]]]
+    ) -> Optional[Tuple[int, int, np.ndarray]]:
+        """
+        渲染文本图层并裁剪到画布范围内
+
+        Args:
+            layer: 图层
+            render_text: 文本图层渲染函数，为 None 时忽略文本图层
 
+        Returns:
+            (x, y, bitmap) 裁剪后的文本位图及其左上角坐标，没有内容时返回 None
+        """
+        if layer.layer_type != "text" or not layer.text_object or render_text is None:
+            return None
+
+        text_bitmap = render_text(layer)
+        if text_bitmap is None:
+            return None
+
+        px, py = layer.text_object.position
+        text_h, text_w = text_bitmap.shape
+
+        x1 = max(0, px)
+        y1 = max(0, py)
+        x2 = min(self.width, px + text_w)
+        y2 = min(self.height, py + text_h)
+
+        if x2 <= x1 or y2 <= y1:
+            return None
+        return x1, y1, text_bitmap[y1 - py:y2 - py, x1 - px:x2 - px]
+
+    def _render_layer(
+        self,
+        layer: Layer,
+        render_text: Optional[Callable[[Layer], Optional[np.ndarray]]]
+    ) -> Optional[np.ndarray]:
+        """
+        获取图层在画布坐标下的位图
+
+        Args:
+            layer: 图层
+            render_text: 文本图层渲染函数，为 None 时忽略文本图层
+
+        Returns:
+            位图数据 (height, width)，没有内容时返回 None
+        """
+        if layer.layer_type == "bitmap":
+            return layer.data
+
+        placed = self._place_text(layer, render_text)
+        if placed is None:
+            return None
+
+        # 将文本位图放置到画布上（已裁剪超出部分）
+        result = np.zeros((self.height, self.width), dtype=bool)
+        x, y, bitmap = placed
+        h, w = bitmap.shape
+        result[y:y + h, x:x + w] = bitmap
         return result
 
     def resize(self, new_width: int, new_height: int) -> None:
@@ -164,16 +509,21 @@ class Canvas:
 
         # 调整所有图层大小
         for layer in self.layers:
+            # 延迟加载的图层按原尺寸解码，必须在修改尺寸之前读取
+            old_data = layer.data if layer.layer_type == "bitmap" and layer.has_bitmap else None
             layer.width = new_width
             layer.height = new_height
 
             # 只调整位图图层的数据
-            if layer.layer_type == "bitmap" and layer.data is not None:
-                old_data = layer.data
-                layer.data = np.zeros((new_height, new_width), dtype=bool)
+            if old_data is not None:
+                new_data = np.zeros((new_height, new_width), dtype=bool)
 
                 # 复制旧数据（左上角对齐）
                 copy_height = min(old_data.shape[0], new_height)
                 copy_width = min(old_data.shape[1], new_width)
-                layer.data[:copy_height, :copy_width] = old_data[:copy_height, :copy_width]
+                new_data[:copy_height, :copy_width] = old_data[:copy_height, :copy_width]
+                if self.layer_storage == "auto":
+                    # 自动模式下按新尺寸重新选择存储模式
+                    layer.storage_mode = self.get_layer_storage()
+                layer.data = new_data
             # 文本图层不需要调整数据，文本对象保持不变
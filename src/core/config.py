@@ -83,3 +83,51 @@ class Config:
     def set_last_line_spacing(self, spacing: int) -> None:
         """保存行间距"""
         self.settings.setValue("text/line_spacing", spacing)
+
+    def get_history_memory_budget(self) -> int:
+        """获取撤销历史的内存预算（MB）"""
+        try:
+            value = self.settings.value("history/memory_budget_mb", 64)
+            result = int(value)
+            # 验证范围（1-4096）
+            if not (1 <= result <= 4096):
+                return 64
+            return result
+        except (ValueError, TypeError):
+            return 64
+
+    def set_history_memory_budget(self, budget_mb: int) -> None:
+        """保存撤销历史的内存预算（MB）"""
+        self.settings.setValue("history/memory_budget_mb", budget_mb)
+
+    def get_target_fps(self) -> int:
+        """获取拖拽绘制时的目标重绘帧率"""
+        try:
+            value = self.settings.value("canvas/target_fps", 60)
+            result = int(value)
+            # 验证范围（10-240）
+            if not (10 <= result <= 240):
+                return 60
+            return result
+        except (ValueError, TypeError):
+            return 60
+
+    def set_target_fps(self, fps: int) -> None:
+        """保存拖拽绘制时的目标重绘帧率"""
+        self.settings.setValue("canvas/target_fps", fps)
+
+    def get_autosave_interval(self) -> int:
+        """获取自动保存间隔（秒），0 表示关闭自动保存"""
+        try:
+            value = self.settings.value("autosave/interval_sec", 60)
+            result = int(value)
+            # 验证范围（0-3600）
+            if not (0 <= result <= 3600):
+                return 60
+            return result
+        except (ValueError, TypeError):
+            return 60
+
+    def set_autosave_interval(self, seconds: int) -> None:
+        """保存自动保存间隔（秒）"""
+        self.settings.setValue("autosave/interval_sec", seconds)
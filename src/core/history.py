@@ -1,8 +1,15 @@
 """撤销/重做历史管理"""
+import os
+import shutil
+import tempfile
+import zlib
 from typing import List, Optional
 from abc import ABC, abstractmethod
 import numpy as np
 
+from ..utils.bit_operations import pack_rows, unpack_rows
+from ..utils.geometry import mask_bounds
+
 
 class Command(ABC):
     """命令抽象基类"""
@@ -17,30 +24,146 @@ class Command(ABC):
         """撤销命令"""
         pass
 
+    @property
+    def nbytes(self) -> int:
+        """命令占用的内存（近似字节数）"""
+        return 0
+
 
 class DrawCommand(Command):
-    """绘图命令"""
+    """
+    绘图命令
 
-    def __init__(self, layer, old_data: np.ndarray, new_data: np.ndarray):
+    只保存新旧数据的异或差异和变化像素的新值（裁剪到变化区域的边界框，默认按位打包），
+    撤销和重做都是在图层上原地改写变化的像素，内存占用与笔画大小成正比
+    """
+
+    def __init__(self, layer, old_data: np.ndarray, new_data: np.ndarray, pack: bool = True,
+                 x: int = 0, y: int = 0):
         """
         初始化绘图命令
 
         Args:
             layer: 图层对象
-            old_data: 旧的图层数据
-            new_data: 新的图层数据
+            old_data: 旧的图层数据（只在构造时读取，不会被保存）
+            new_data: 新的图层数据（只在构造时读取，不会被保存）
+            pack: 是否按位打包差异数据
+            x, y: 数据左上角在图层上的坐标（old_data/new_data 只是图层的一部分时）
         """
         self.layer = layer
-        self.old_data = old_data.copy()
-        self.new_data = new_data.copy()
+        self.packed = pack
+
+        diff = np.logical_xor(old_data, new_data)
+        # 变化区域 (x0, y0, x1, y1)，图层坐标，没有变化时为 None
+        self.rect = None
+        # 变化区域内的异或差异和变化像素的新值（未变化的像素为 False）
+        self.diff: Optional[np.ndarray] = None
+        self.new_bits: Optional[np.ndarray] = None
+
+        bounds = mask_bounds(diff)
+        if bounds is not None:
+            x0, y0, x1, y1 = bounds
+            self.rect = (x0 + x, y0 + y, x1 + x, y1 + y)
+            diff = diff[y0:y1, x0:x1]
+            new_bits = new_data[y0:y1, x0:x1] & diff
+            if pack:
+                self.diff = pack_rows(diff)
+                self.new_bits = pack_rows(new_bits)
+            else:
+                self.diff = diff.copy()
+                self.new_bits = new_bits
+
+        # 溢出到磁盘后的文件路径（数据不在内存中时有效）
+        self.spill_path: Optional[str] = None
+
+    @property
+    def nbytes(self) -> int:
+        """命令占用的内存（近似字节数，溢出到磁盘后为 0）"""
+        if self.diff is None:
+            return 0
+        return self.diff.nbytes + self.new_bits.nbytes
+
+    def spill(self, directory: str) -> int:
+        """
+        将差异数据压缩写入磁盘并释放内存
+
+        Args:
+            directory: 存放溢出文件的目录
+
+        Returns:
+            写入的字节数，没有可溢出的数据时返回 0
+        """
+        if self.diff is None:
+            return 0
+
+        payload = zlib.compress(self.diff.tobytes() + self.new_bits.tobytes(), 1)
+        fd, path = tempfile.mkstemp(suffix=".bin", dir=directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+
+        self._shape = self.diff.shape
+        self._dtype = self.diff.dtype
+        self.spill_path = path
+        self.diff = None
+        self.new_bits = None
+        return len(payload)
+
+    def discard_spill(self) -> None:
+        """删除溢出文件（命令被丢弃时调用）"""
+        if self.spill_path is not None:
+            try:
+                os.remove(self.spill_path)
+            except OSError:
+                pass
+            self.spill_path = None
+
+    def _restore(self) -> None:
+        """从溢出文件读回差异数据"""
+        with open(self.spill_path, "rb") as f:
+            raw = zlib.decompress(f.read())
+        self.discard_spill()
+
+        size = len(raw) // 2
+        self.diff = np.frombuffer(raw[:size], dtype=self._dtype).reshape(self._shape).copy()
+        self.new_bits = np.frombuffer(raw[size:], dtype=self._dtype).reshape(self._shape).copy()
 
     def execute(self) -> None:
         """执行命令"""
-        self.layer.data = self.new_data.copy()
+        self._apply(redo=True)
 
     def undo(self) -> None:
         """撤销命令"""
-        self.layer.data = self.old_data.copy()
+        self._apply(redo=False)
+
+    def _apply(self, redo: bool) -> None:
+        """
+        在图层上原地改写变化的像素
+
+        Args:
+            redo: True 写入新值，False 写入旧值（旧值 = 新值 ^ 差异）
+        """
+        if self.rect is None:
+            return
+
+        if self.diff is None:
+            self._restore()
+
+        x0, y0, x1, y1 = self.rect
+        if self.packed:
+            diff = unpack_rows(self.diff, x1 - x0)
+            new_bits = unpack_rows(self.new_bits, x1 - x0)
+        else:
+            diff = self.diff
+            new_bits = self.new_bits
+        values = new_bits if redo else new_bits ^ diff
+
+        # 图层尺寸变化后只处理仍在图层内的部分
+        region = self.layer.get_region(x0, y0, x1, y1)
+        h, w = region.shape
+        if h == 0 or w == 0:
+            return
+        diff = diff[:h, :w]
+        self.layer.set_region(x0, y0, (region & ~diff) | values[:h, :w])
 
 
 class AddLayerCommand(Command):
@@ -94,6 +217,11 @@ class RemoveLayerCommand(Command):
             self.old_active_index = self.canvas.active_layer_index
             self.canvas.remove_layer(self.layer_index)
 
+    @property
+    def nbytes(self) -> int:
+        """命令占用的内存（被删除图层的像素数据）"""
+        return self.layer.nbytes if self.layer is not None else 0
+
     def undo(self) -> None:
         """撤销命令"""
         if self.layer is not None:
@@ -127,18 +255,30 @@ class MoveLayerCommand(Command):
 
 
 class History:
-    """历史记录管理器"""
+    """
+    历史记录管理器
+
+    同时限制命令数量和内存占用：超出内存预算时从最旧的命令开始丢弃，
+    启用磁盘溢出时先把最旧的绘图命令压缩写入临时目录，仍然超出时再丢弃
+    """
 
-    def __init__(self, max_size: int = 50):
+    def __init__(self, max_size: int = 50, memory_budget: Optional[int] = None,
+                 spill_to_disk: bool = False):
         """
         初始化历史记录
 
         Args:
             max_size: 最大历史记录数
+            memory_budget: 内存预算（字节），为 None 时不限制
+            spill_to_disk: 超出内存预算时是否将旧命令压缩写入临时目录
         """
         self.max_size = max_size
+        self.memory_budget = memory_budget
+        self.spill_to_disk = spill_to_disk
         self.commands: List[Command] = []
         self.current_index = -1
+        # 溢出文件所在的临时目录（首次溢出时创建）
+        self._spill_dir: Optional[str] = None
 
     def add(self, command: Command) -> None:
         """
@@ -148,6 +288,8 @@ class History:
             command: 命令对象
         """
         # 清除当前位置之后的所有命令
+        for discarded in self.commands[self.current_index + 1:]:
+            self._discard(discarded)
         self.commands = self.commands[:self.current_index + 1]
 
         # 添加新命令
@@ -156,9 +298,72 @@ class History:
 
         # 限制历史记录大小
         if len(self.commands) > self.max_size:
-            self.commands.pop(0)
+            self._discard(self.commands.pop(0))
             self.current_index -= 1
 
+        self._enforce_memory_budget()
+
+    def get_memory_usage(self) -> int:
+        """
+        获取所有命令占用的内存
+
+        Returns:
+            近似字节数
+        """
+        return sum(command.nbytes for command in self.commands)
+
+    def get_disk_usage(self) -> int:
+        """
+        获取溢出文件占用的磁盘空间
+
+        Returns:
+            字节数
+        """
+        total = 0
+        for command in self.commands:
+            path = getattr(command, "spill_path", None)
+            if path is not None and os.path.exists(path):
+                total += os.path.getsize(path)
+        return total
+
+    def _enforce_memory_budget(self) -> None:
+        """超出内存预算时溢出或丢弃最旧的命令（始终保留最新的命令）"""
+        if self.memory_budget is None:
+            return
+
+        usage = self.get_memory_usage()
+        if usage <= self.memory_budget:
+            return
+
+        # 先把最旧的绘图命令溢出到磁盘
+        if self.spill_to_disk:
+            for command in self.commands[:-1]:
+                if usage <= self.memory_budget:
+                    return
+                if isinstance(command, DrawCommand) and command.nbytes > 0:
+                    size = command.nbytes
+                    command.spill(self._get_spill_dir())
+                    usage -= size
+
+        # 仍然超出时丢弃最旧的命令
+        while usage > self.memory_budget and len(self.commands) > 1:
+            command = self.commands.pop(0)
+            usage -= command.nbytes
+            self._discard(command)
+            self.current_index -= 1
+
+    def _get_spill_dir(self) -> str:
+        """获取（必要时创建）溢出文件目录"""
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="monopixel_history_")
+        return self._spill_dir
+
+    @staticmethod
+    def _discard(command: Command) -> None:
+        """丢弃命令时删除其溢出文件"""
+        if isinstance(command, DrawCommand):
+            command.discard_spill()
+
     def execute(self, command: Command) -> None:
         """
         执行命令并添加到历史记录（用于图层操作等需要立即执行的命令）
@@ -217,6 +422,12 @@ class History:
         return self.current_index < len(self.commands) - 1
 
     def clear(self) -> None:
-        """清空历史记录"""
+        """清空历史记录（同时删除溢出文件目录）"""
+        for command in self.commands:
+            self._discard(command)
         self.commands.clear()
         self.current_index = -1
+
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
@@ -1,13 +1,19 @@
 """图层数据模型"""
 import numpy as np
-from typing import Tuple, Optional
+from typing import Callable, Dict, Iterator, Tuple, Optional
 from .text_object import TextObject
+from .layer_storage import create_storage
+from ..utils.geometry import union_rect, clip_rect
 
 
 class Layer:
     """单个图层类"""
 
-    def __init__(self, width: int, height: int, name: str = "Layer", layer_type: str = "bitmap"):
+    # 修改前像素快照的分块大小（见 begin_snapshot）
+    SNAPSHOT_TILE_SIZE = 64
+
+    def __init__(self, width: int, height: int, name: str = "Layer", layer_type: str = "bitmap",
+                 storage: str = "dense"):
         """
         初始化图层
 
@@ -16,16 +22,123 @@ class Layer:
             height: 图层高度
             name: 图层名称
             layer_type: 图层类型 ('bitmap' | 'text')
+            storage: 像素存储模式 ('dense' 每像素 1 字节 | 'packed' 每像素 1 位 |
+                'tiled' 分块稀疏，只为非空块分配内存)
         """
         self.name = name
         self.width = width
         self.height = height
         self.layer_type = layer_type
-        self.data = np.zeros((height, width), dtype=bool) if layer_type == "bitmap" else None
+        # 修订号，每次修改像素数据时递增，用于判断缓存是否失效
+        self.revision = 0
+        # 自上次取出以来发生变化的区域 (x0, y0, x1, y1)，用于增量重绘
+        self.dirty_rect: Optional[Tuple[int, int, int, int]] = None
+        self.storage_mode = storage
+        self._store = create_storage(storage, width, height) if layer_type == "bitmap" else None
+        # 延迟加载函数，第一次访问像素数据时调用（见 set_loader）
+        self._loader: Optional[Callable[['Layer'], None]] = None
+        # 修改前像素的分块快照 {(tx, ty): tile} 和快照期间修改过的区域，不记录时为 None
+        self._snapshot: Optional[Dict[Tuple[int, int], np.ndarray]] = None
+        self._snapshot_rect: Optional[Tuple[int, int, int, int]] = None
         self.text_object: Optional[TextObject] = None
         self.visible = True
         self.locked = False
 
+    @property
+    def _storage(self):
+        """像素存储，延迟加载的图层在第一次访问时解码"""
+        if self._loader is not None:
+            self.load()
+        return self._store
+
+    @_storage.setter
+    def _storage(self, storage) -> None:
+        self._store = storage
+        self._loader = None
+
+    def set_loader(self, loader: Callable[['Layer'], None]) -> None:
+        """
+        设置延迟加载函数，丢弃当前像素数据
+
+        第一次访问像素数据（合成、导出、编辑等）时调用 loader(layer)，
+        loader 通过 set_packed_rows()/set_region() 等方法把位图写入空白图层
+
+        Args:
+            loader: 加载函数
+        """
+        self._store = None
+        self._loader = loader
+
+    @property
+    def is_loaded(self) -> bool:
+        """像素数据是否已加载（延迟加载的图层在第一次访问前为 False）"""
+        return self._loader is None
+
+    def load(self) -> None:
+        """立即加载延迟加载的像素数据（已加载时不做任何事）"""
+        if self._loader is None:
+            return
+        loader = self._loader
+        self._loader = None
+        self._store = create_storage(self.storage_mode, self.width, self.height)
+        loader(self)
+
+    @property
+    def data(self) -> Optional[np.ndarray]:
+        """
+        位图数据 (height, width)，文本图层为 None
+
+        稠密存储返回内部数组，直接原地修改后需要调用 mark_dirty()；
+        打包/分块存储返回只读的展开副本，修改需通过 set_pixel()/set_region()/fill_region()
+        """
+        if self._storage is None:
+            return None
+        data = self._storage.to_array()
+        if self.storage_mode != "dense":
+            data.flags.writeable = False
+        return data
+
+    @data.setter
+    def data(self, value: Optional[np.ndarray]) -> None:
+        """
+        替换位图数据（整个图层标记为已修改）
+
+        Args:
+            value: 新的位图数据
+        """
+        if value is None:
+            self._storage = None
+        else:
+            self._record_original(0, 0, self.width, self.height)
+            self._storage = create_storage(self.storage_mode, self.width, self.height, value)
+        self.revision += 1
+        if value is not None:
+            self.mark_dirty(0, 0, self.width, self.height)
+
+    @property
+    def has_bitmap(self) -> bool:
+        """是否有位图数据（不需要解包或加载）"""
+        return self._store is not None or self._loader is not None
+
+    @property
+    def nbytes(self) -> int:
+        """像素数据占用的字节数（未加载的图层为 0）"""
+        return self._store.nbytes if self._store is not None else 0
+
+    def set_storage_mode(self, storage: str) -> None:
+        """
+        切换像素存储模式（像素内容不变）
+
+        Args:
+            storage: 像素存储模式 ('dense' | 'packed' | 'tiled')
+        """
+        if storage == self.storage_mode:
+            return
+        # 未加载的图层加载时直接使用新的存储模式
+        if self._store is not None and self._loader is None:
+            self._storage = create_storage(storage, self.width, self.height, self._storage.to_array())
+        self.storage_mode = storage
+
     def set_pixel(self, x: int, y: int, value: bool) -> None:
         """
         设置像素值
@@ -36,7 +149,9 @@ class Layer:
             value: 像素值（True=黑色, False=白色）
         """
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.data[y, x] = value
+            self._record_original(x, y, x + 1, y + 1)
+            self._storage.set_pixel(x, y, value)
+            self.mark_dirty(x, y, x + 1, y + 1)
 
     def get_pixel(self, x: int, y: int) -> bool:
         """
@@ -50,13 +165,233 @@ class Layer:
             像素值（True=黑色, False=白色）
         """
         if 0 <= x < self.width and 0 <= y < self.height:
-            return bool(self.data[y, x])
+            return self._storage.get_pixel(x, y)
         return False
 
+    def get_region(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """
+        获取矩形区域的位图数据（超出图层的部分被裁剪）
+
+        Args:
+            x0, y0: 左上角坐标
+            x1, y1: 右下角坐标（不包含）
+
+        Returns:
+            区域数据的副本，形状为裁剪后的区域大小
+        """
+        rect = clip_rect((x0, y0, x1, y1), self.width, self.height)
+        if rect is None:
+            return np.zeros((0, 0), dtype=bool)
+        return self._storage.get_region(*rect)
+
+    def set_region(self, x: int, y: int, values: np.ndarray) -> None:
+        """
+        将位图数据写入图层（左上角位于 (x, y)，超出图层的部分被裁剪）
+
+        Args:
+            x, y: 写入位置
+            values: 位图数据
+        """
+        h, w = values.shape
+        rect = clip_rect((x, y, x + w, y + h), self.width, self.height)
+        if rect is None:
+            return
+        x0, y0, x1, y1 = rect
+        self._record_original(x0, y0, x1, y1)
+        self._storage.set_region(x0, y0, values[y0 - y:y1 - y, x0 - x:x1 - x])
+        self.mark_dirty(x0, y0, x1, y1)
+
+    def fill_region(self, x0: int, y0: int, x1: int, y1: int, value: bool) -> None:
+        """
+        填充矩形区域（超出图层的部分被裁剪）
+
+        Args:
+            x0, y0: 左上角坐标
+            x1, y1: 右下角坐标（不包含）
+            value: 像素值（True=黑色, False=白色）
+        """
+        rect = clip_rect((x0, y0, x1, y1), self.width, self.height)
+        if rect is None:
+            return
+        self._record_original(*rect)
+        self._storage.fill_region(*rect, value)
+        self.mark_dirty(*rect)
+
+    def apply_mask(self, mask: np.ndarray, x: int = 0, y: int = 0, value: bool = True) -> None:
+        """
+        将掩码中为 True 的像素设为指定值（一次性写入，超出图层的部分被裁剪）
+
+        Args:
+            mask: 布尔掩码
+            x, y: 掩码左上角在图层上的坐标
+            value: 像素值（True=黑色, False=白色）
+        """
+        h, w = mask.shape
+        rect = clip_rect((x, y, x + w, y + h), self.width, self.height)
+        if rect is None:
+            return
+        x0, y0, x1, y1 = rect
+        sub_mask = mask[y0 - y:y1 - y, x0 - x:x1 - x]
+        if not sub_mask.any():
+            return
+
+        self._record_original(x0, y0, x1, y1)
+        region = self._storage.get_region(x0, y0, x1, y1)
+        region[sub_mask] = value
+        self._storage.set_region(x0, y0, region)
+        self.mark_dirty(x0, y0, x1, y1)
+
+    def set_pixels(self, xs: np.ndarray, ys: np.ndarray, value: bool = True) -> None:
+        """
+        批量设置像素值（超出图层的坐标被忽略）
+
+        Args:
+            xs, ys: 坐标数组
+            value: 像素值（True=黑色, False=白色）
+        """
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        xs = xs[inside]
+        ys = ys[inside]
+        if len(xs) == 0:
+            return
+
+        x0, y0 = int(xs.min()), int(ys.min())
+        x1, y1 = int(xs.max()) + 1, int(ys.max()) + 1
+        self._record_original(x0, y0, x1, y1)
+        region = self._storage.get_region(x0, y0, x1, y1)
+        region[ys - y0, xs - x0] = value
+        self._storage.set_region(x0, y0, region)
+        self.mark_dirty(x0, y0, x1, y1)
+
+    def get_packed_rows(self) -> np.ndarray:
+        """
+        获取按行打包的位图数据（MSB 在前，每行补齐到整字节）
+
+        打包存储直接返回内部数组（不要修改），稠密存储会即时打包
+
+        Returns:
+            打包数据 (height, (width + 7) // 8)
+        """
+        return self._storage.pack_rows()
+
+    def set_packed_rows(self, rows: np.ndarray) -> None:
+        """
+        用按行打包的数据替换位图（get_packed_rows 的逆操作，整个图层标记为已修改）
+
+        Args:
+            rows: 打包数据 (height, (width + 7) // 8)，MSB 在前
+        """
+        if self._storage is None:
+            self._storage = create_storage(self.storage_mode, self.width, self.height)
+        self._record_original(0, 0, self.width, self.height)
+        self._storage.set_packed_rows(rows)
+        self.mark_dirty(0, 0, self.width, self.height)
+
+    def iter_tiles(self) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """
+        遍历图层中含黑色像素的块（用于跳过空白区域的合成、边界计算和保存）
+
+        分块存储逐个返回非空块，其他存储把整个图层作为一个块返回
+
+        Yields:
+            (x, y, tile) 块左上角坐标和块数据（不要修改）
+        """
+        if self._storage is None or not self._storage.any():
+            return
+        if self.storage_mode == "tiled":
+            yield from self._storage.iter_tiles()
+        else:
+            yield 0, 0, self._storage.to_array()
+
     def clear(self) -> None:
         """清空图层"""
-        if self.data is not None:
-            self.data.fill(False)
+        if self._storage is not None:
+            self._record_original(0, 0, self.width, self.height)
+            self._storage.fill_region(0, 0, self.width, self.height, False)
+            self.mark_dirty(0, 0, self.width, self.height)
+
+    def mark_dirty(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """
+        标记区域已修改并递增修订号（直接修改 data 后需要调用）
+
+        Args:
+            x0, y0: 左上角坐标
+            x1, y1: 右下角坐标（不包含）
+        """
+        rect = clip_rect((x0, y0, x1, y1), self.width, self.height)
+        if rect is not None:
+            self.dirty_rect = union_rect(self.dirty_rect, rect)
+            self.revision += 1
+
+    def begin_snapshot(self) -> None:
+        """
+        开始记录修改前的像素（用于生成撤销数据）
+
+        之后每次修改时只复制第一次被修改的块，快照大小与修改区域成正比，
+        不需要在开始时复制整个图层。延迟加载的图层会先加载
+        """
+        self.load()
+        self._snapshot = {}
+        self._snapshot_rect = None
+
+    def end_snapshot(self) -> Optional[Tuple[Tuple[int, int, int, int], np.ndarray]]:
+        """
+        结束记录，返回修改区域在修改前的数据
+
+        Returns:
+            (rect, old_region) 快照期间修改过的区域 (x0, y0, x1, y1) 及其修改前的数据，
+            没有开始记录或没有修改时返回 None
+        """
+        tiles, rect = self._snapshot, self._snapshot_rect
+        self._snapshot = None
+        self._snapshot_rect = None
+        if not tiles or rect is None or self._storage is None:
+            return None
+
+        # 区域内未被修改的块与当前数据相同，只需覆盖记录过的块
+        x0, y0, x1, y1 = rect
+        old_region = self._storage.get_region(x0, y0, x1, y1)
+        size = self.SNAPSHOT_TILE_SIZE
+        for (tx, ty), tile in tiles.items():
+            left, top = tx * size, ty * size
+            ix0, iy0 = max(x0, left), max(y0, top)
+            ix1, iy1 = min(x1, left + tile.shape[1]), min(y1, top + tile.shape[0])
+            if ix1 > ix0 and iy1 > iy0:
+                old_region[iy0 - y0:iy1 - y0, ix0 - x0:ix1 - x0] = tile[iy0 - top:iy1 - top, ix0 - left:ix1 - left]
+        return rect, old_region
+
+    def _record_original(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """
+        修改区域之前复制其中还没有记录的块（只在 begin_snapshot 之后记录）
+
+        Args:
+            x0, y0: 左上角坐标
+            x1, y1: 右下角坐标（不包含，需已裁剪）
+        """
+        if self._snapshot is None or self._store is None:
+            return
+        self._snapshot_rect = union_rect(self._snapshot_rect, (x0, y0, x1, y1))
+        size = self.SNAPSHOT_TILE_SIZE
+        for ty in range(y0 // size, (y1 - 1) // size + 1):
+            for tx in range(x0 // size, (x1 - 1) // size + 1):
+                if (tx, ty) not in self._snapshot:
+                    left, top = tx * size, ty * size
+                    self._snapshot[(tx, ty)] = self._storage.get_region(
+                        left, top, min(left + size, self.width), min(top + size, self.height)
+                    )
+
+    def take_dirty_rect(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        取出并清空已修改区域
+
+        Returns:
+            已修改区域 (x0, y0, x1, y1)，没有修改时返回 None
+        """
+        rect = self.dirty_rect
+        self.dirty_rect = None
+        return rect
 
     def copy(self) -> 'Layer':
         """
@@ -65,10 +400,12 @@ class Layer:
         Returns:
             新的图层对象
         """
-        new_layer = Layer(self.width, self.height, f"{self.name} Copy", self.layer_type)
+        new_layer = Layer(self.width, self.height, f"{self.name} Copy", self.layer_type, self.storage_mode)
 
         if self.layer_type == "bitmap":
-            new_layer.data = self.data.copy()
+            new_layer._storage = self._storage.copy()
+            new_layer.revision += 1
+            new_layer.mark_dirty(0, 0, self.width, self.height)
         elif self.layer_type == "text" and self.text_object:
             new_layer.text_object = self.text_object.copy()
 
@@ -83,11 +420,30 @@ class Layer:
         Returns:
             (min_x, min_y, max_x, max_y) 如果图层为空则返回 (0, 0, 0, 0)
         """
-        if not self.data.any():
+        if not self._storage.any():
             return (0, 0, 0, 0)
 
-        rows = np.any(self.data, axis=1)
-        cols = np.any(self.data, axis=0)
+        if self.storage_mode == "tiled":
+            # 只在非空块上计算边界
+            min_x = min_y = None
+            max_x = max_y = 0
+            for x, y, tile in self.iter_tiles():
+                tile_rows = np.flatnonzero(tile.any(axis=1))
+                tile_cols = np.flatnonzero(tile.any(axis=0))
+                min_x = x + tile_cols[0] if min_x is None else min(min_x, x + tile_cols[0])
+                min_y = y + tile_rows[0] if min_y is None else min(min_y, y + tile_rows[0])
+                max_x = max(max_x, x + tile_cols[-1] + 1)
+                max_y = max(max_y, y + tile_rows[-1] + 1)
+            return (int(min_x), int(min_y), int(max_x), int(max_y))
+
+        if self.storage_mode == "packed":
+            # 直接在打包数据上计算：行按字节判断，列先按位或合并所有行再解包
+            packed = self.get_packed_rows()
+            rows = packed.any(axis=1)
+            cols = np.unpackbits(np.bitwise_or.reduce(packed, axis=0), count=self.width).view(bool)
+        else:
+            rows = np.any(self.data, axis=1)
+            cols = np.any(self.data, axis=0)
 
         min_y, max_y = np.where(rows)[0][[0, -1]]
         min_x, max_x = np.where(cols)[0][[0, -1]]
@@ -0,0 +1,399 @@
+"""图层像素存储后端"""
+import numpy as np
+from typing import Dict, Iterator, Optional, Tuple
+from ..utils.bit_operations import pack_rows, unpack_rows
+
+
+class DenseStorage:
+    """稠密存储：每像素 1 字节的布尔数组"""
+
+    mode = "dense"
+
+    def __init__(self, width: int, height: int, data: Optional[np.ndarray] = None):
+        """
+        初始化稠密存储
+
+        Args:
+            width: 宽度
+            height: 高度
+            data: 初始位图数据 (height, width)，为 None 时全部为白色
+        """
+        self.width = width
+        self.height = height
+        if data is None:
+            self.array = np.zeros((height, width), dtype=bool)
+        else:
+            self.array = np.asarray(data, dtype=bool)
+
+    @property
+    def nbytes(self) -> int:
+        """占用的字节数"""
+        return self.array.nbytes
+
+    def to_array(self) -> np.ndarray:
+        """
+        获取位图数据（直接返回内部数组，可原地修改）
+
+        Returns:
+            位图数据 (height, width)
+        """
+        return self.array
+
+    def get_pixel(self, x: int, y: int) -> bool:
+        """获取像素值（坐标需在范围内）"""
+        return bool(self.array[y, x])
+
+    def set_pixel(self, x: int, y: int, value: bool) -> None:
+        """设置像素值（坐标需在范围内）"""
+        self.array[y, x] = value
+
+    def get_region(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """获取区域数据的副本（坐标需已裁剪）"""
+        return self.array[y0:y1, x0:x1].copy()
+
+    def set_region(self, x0: int, y0: int, values: np.ndarray) -> None:
+        """写入区域数据（坐标需已裁剪）"""
+        h, w = values.shape
+        self.array[y0:y0 + h, x0:x0 + w] = values
+
+    def fill_region(self, x0: int, y0: int, x1: int, y1: int, value: bool) -> None:
+        """填充区域（坐标需已裁剪）"""
+        self.array[y0:y1, x0:x1] = value
+
+    def any(self) -> bool:
+        """是否有黑色像素"""
+        return bool(self.array.any())
+
+    def pack_rows(self) -> np.ndarray:
+        """
+        获取按行打包的数据（MSB 在前，每行补齐到整字节）
+
+        Returns:
+            打包数据 (height, (width + 7) // 8)
+        """
+        return pack_rows(self.array, msb_first=True)
+
+    def set_packed_rows(self, rows: np.ndarray) -> None:
+        """用按行打包的数据替换全部像素（MSB 在前）"""
+        self.array = unpack_rows(rows, self.width, msb_first=True).copy()
+
+    def copy(self) -> 'DenseStorage':
+        """复制存储"""
+        return DenseStorage(self.width, self.height, self.array.copy())
+
+
+class PackedStorage:
+    """
+    打包存储：每像素 1 位
+
+    每行打包为 (width + 7) // 8 个 uint8，高位在前（与 Project 保存格式的位序一致），
+    行尾补齐位始终为 0
+    """
+
+    mode = "packed"
+
+    def __init__(self, width: int, height: int, data: Optional[np.ndarray] = None):
+        """
+        初始化打包存储
+
+        Args:
+            width: 宽度
+            height: 高度
+            data: 初始位图数据 (height, width)，为 None 时全部为白色
+        """
+        self.width = width
+        self.height = height
+        if data is None:
+            self.rows = np.zeros((height, (width + 7) // 8), dtype=np.uint8)
+        else:
+            self.rows = pack_rows(np.asarray(data, dtype=bool), msb_first=True)
+
+    @property
+    def nbytes(self) -> int:
+        """占用的字节数"""
+        return self.rows.nbytes
+
+    def to_array(self) -> np.ndarray:
+        """
+        解包为位图数据（新数组，修改不会写回存储）
+
+        Returns:
+            位图数据 (height, width)
+        """
+        return unpack_rows(self.rows, self.width, msb_first=True)
+
+    def get_pixel(self, x: int, y: int) -> bool:
+        """获取像素值（坐标需在范围内）"""
+        return bool((self.rows[y, x >> 3] >> (7 - (x & 7))) & 1)
+
+    def set_pixel(self, x: int, y: int, value: bool) -> None:
+        """设置像素值（坐标需在范围内）"""
+        mask = 0x80 >> (x & 7)
+        if value:
+            self.rows[y, x >> 3] |= mask
+        else:
+            self.rows[y, x >> 3] &= ~mask & 0xFF
+
+    def get_region(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """获取区域数据的副本（坐标需已裁剪，只解包覆盖该区域的字节）"""
+        bx0 = x0 >> 3
+        bx1 = (x1 + 7) >> 3
+        bits = np.unpackbits(self.rows[y0:y1, bx0:bx1], axis=1).view(bool)
+        return bits[:, x0 - bx0 * 8:x1 - bx0 * 8].copy()
+
+    def set_region(self, x0: int, y0: int, values: np.ndarray) -> None:
+        """写入区域数据（坐标需已裁剪，只重新打包覆盖该区域的字节）"""
+        h, w = values.shape
+        if h == 0 or w == 0:
+            return
+        bx0 = x0 >> 3
+        bx1 = (x0 + w + 7) >> 3
+        bits = np.unpackbits(self.rows[y0:y0 + h, bx0:bx1], axis=1).view(bool)
+        bits[:, x0 - bx0 * 8:x0 - bx0 * 8 + w] = values
+        self.rows[y0:y0 + h, bx0:bx1] = np.packbits(bits, axis=1)
+
+    def fill_region(self, x0: int, y0: int, x1: int, y1: int, value: bool) -> None:
+        """填充区域（坐标需已裁剪）"""
+        if x1 > x0 and y1 > y0:
+            self.set_region(x0, y0, np.full((y1 - y0, x1 - x0), value, dtype=bool))
+
+    def any(self) -> bool:
+        """是否有黑色像素"""
+        return bool(self.rows.any())
+
+    def pack_rows(self) -> np.ndarray:
+        """
+        获取按行打包的数据（直接返回内部数组，不要修改）
+
+        Returns:
+            打包数据 (height, (width + 7) // 8)
+        """
+        return self.rows
+
+    def set_packed_rows(self, rows: np.ndarray) -> None:
+        """用按行打包的数据替换全部像素（复制数据并清除行尾补齐位）"""
+        self.rows = np.array(rows, dtype=np.uint8, copy=True)
+        if self.width % 8 and self.rows.size:
+            self.rows[:, -1] &= (0xFF << (8 - self.width % 8)) & 0xFF
+
+    def copy(self) -> 'PackedStorage':
+        """复制存储"""
+        storage = PackedStorage(self.width, self.height)
+        storage.rows[:] = self.rows
+        return storage
+
+
+class TiledStorage:
+    """
+    分块稀疏存储：按 TILE_SIZE x TILE_SIZE 分块，只为含黑色像素的块分配内存
+
+    每个块是一个布尔数组（边缘块按图层边界裁剪），变为全白的块会被释放，
+    因此 tiles 中只包含非空块
+    """
+
+    mode = "tiled"
+
+    # 块边长（8 的倍数，保证每个块按行打包时字节对齐）
+    TILE_SIZE = 64
+
+    def __init__(self, width: int, height: int, data: Optional[np.ndarray] = None):
+        """
+        初始化分块存储
+
+        Args:
+            width: 宽度
+            height: 高度
+            data: 初始位图数据 (height, width)，为 None 时全部为白色
+        """
+        self.width = width
+        self.height = height
+        # 非空块 {(tx, ty): 块数据}
+        self.tiles: Dict[Tuple[int, int], np.ndarray] = {}
+        if data is not None:
+            self.set_region(0, 0, np.asarray(data, dtype=bool))
+
+    @property
+    def nbytes(self) -> int:
+        """占用的字节数（只计算已分配的块）"""
+        return sum(tile.nbytes for tile in self.tiles.values())
+
+    def _new_tile(self, tx: int, ty: int) -> np.ndarray:
+        """创建并登记一个全白的块"""
+        size = self.TILE_SIZE
+        tile = np.zeros((min(size, self.height - ty * size), min(size, self.width - tx * size)), dtype=bool)
+        self.tiles[(tx, ty)] = tile
+        return tile
+
+    def _overlapping(self, x0: int, y0: int, x1: int, y1: int) -> Iterator[tuple]:
+        """
+        遍历与区域相交的所有块位置（坐标需已裁剪）
+
+        Yields:
+            (key, tile_slice, region_slice) 块索引、块内切片和区域内切片
+        """
+        size = self.TILE_SIZE
+        if x1 <= x0 or y1 <= y0:
+            return
+        for ty in range(y0 // size, (y1 - 1) // size + 1):
+            top = ty * size
+            ty0, ty1 = max(y0, top), min(y1, top + size)
+            for tx in range(x0 // size, (x1 - 1) // size + 1):
+                left = tx * size
+                tx0, tx1 = max(x0, left), min(x1, left + size)
+                yield ((tx, ty),
+                       (slice(ty0 - top, ty1 - top), slice(tx0 - left, tx1 - left)),
+                       (slice(ty0 - y0, ty1 - y0), slice(tx0 - x0, tx1 - x0)))
+
+    def iter_tiles(self) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """
+        按行优先顺序遍历非空块
+
+        Yields:
+            (x, y, tile) 块左上角的像素坐标和块数据（不要修改）
+        """
+        size = self.TILE_SIZE
+        for tx, ty in sorted(self.tiles, key=lambda key: (key[1], key[0])):
+            yield tx * size, ty * size, self.tiles[(tx, ty)]
+
+    def to_array(self) -> np.ndarray:
+        """
+        展开为位图数据（新数组，修改不会写回存储）
+
+        Returns:
+            位图数据 (height, width)
+        """
+        result = np.zeros((self.height, self.width), dtype=bool)
+        for x, y, tile in self.iter_tiles():
+            h, w = tile.shape
+            result[y:y + h, x:x + w] = tile
+        return result
+
+    def get_pixel(self, x: int, y: int) -> bool:
+        """获取像素值（坐标需在范围内）"""
+        size = self.TILE_SIZE
+        tile = self.tiles.get((x // size, y // size))
+        return tile is not None and bool(tile[y % size, x % size])
+
+    def set_pixel(self, x: int, y: int, value: bool) -> None:
+        """设置像素值（坐标需在范围内）"""
+        size = self.TILE_SIZE
+        key = (x // size, y // size)
+        tile = self.tiles.get(key)
+        if tile is None:
+            if not value:
+                return
+            tile = self._new_tile(*key)
+        tile[y % size, x % size] = value
+        if not value and not tile.any():
+            del self.tiles[key]
+
+    def get_region(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """获取区域数据的副本（坐标需已裁剪，空块直接为白色）"""
+        result = np.zeros((y1 - y0, x1 - x0), dtype=bool)
+        for key, tile_slice, region_slice in self._overlapping(x0, y0, x1, y1):
+            tile = self.tiles.get(key)
+            if tile is not None:
+                result[region_slice] = tile[tile_slice]
+        return result
+
+    def set_region(self, x0: int, y0: int, values: np.ndarray) -> None:
+        """写入区域数据（坐标需已裁剪，全白的部分不分配块）"""
+        h, w = values.shape
+        for key, tile_slice, region_slice in self._overlapping(x0, y0, x0 + w, y0 + h):
+            part = values[region_slice]
+            tile = self.tiles.get(key)
+            if tile is None:
+                if part.any():
+                    self._new_tile(*key)[tile_slice] = part
+                continue
+            tile[tile_slice] = part
+            if not tile.any():
+                del self.tiles[key]
+
+    def fill_region(self, x0: int, y0: int, x1: int, y1: int, value: bool) -> None:
+        """填充区域（坐标需已裁剪）"""
+        for key, tile_slice, _ in self._overlapping(x0, y0, x1, y1):
+            tile = self.tiles.get(key)
+            if value:
+                if tile is None:
+                    tile = self._new_tile(*key)
+                tile[tile_slice] = True
+            elif tile is not None:
+                tile[tile_slice] = False
+                if not tile.any():
+                    del self.tiles[key]
+
+    def any(self) -> bool:
+        """是否有黑色像素（只保留非空块，因此只需检查是否有块）"""
+        return bool(self.tiles)
+
+    def pack_rows(self) -> np.ndarray:
+        """
+        获取按行打包的数据（MSB 在前，每行补齐到整字节，空块不参与计算）
+
+        Returns:
+            打包数据 (height, (width + 7) // 8)
+        """
+        rows = np.zeros((self.height, (self.width + 7) // 8), dtype=np.uint8)
+        for x, y, tile in self.iter_tiles():
+            packed = np.packbits(tile, axis=1)
+            rows[y:y + tile.shape[0], x // 8:x // 8 + packed.shape[1]] = packed
+        return rows
+
+    def set_packed_rows(self, rows: np.ndarray) -> None:
+        """用按行打包的数据替换全部像素（每次只解包一行块，全白的块不分配）"""
+        self.tiles = {}
+        size = self.TILE_SIZE
+        for y in range(0, self.height, size):
+            self.set_region(0, y, unpack_rows(rows[y:y + size], self.width, msb_first=True))
+
+    def copy(self) -> 'TiledStorage':
+        """复制存储"""
+        storage = TiledStorage(self.width, self.height)
+        storage.tiles = {key: tile.copy() for key, tile in self.tiles.items()}
+        return storage
+
+
+# 存储模式名称到存储类的映射
+STORAGE_TYPES = {
+    DenseStorage.mode: DenseStorage,
+    PackedStorage.mode: PackedStorage,
+    TiledStorage.mode: TiledStorage,
+}
+
+# 超过此像素数的画布在自动模式下使用分块稀疏存储
+TILED_STORAGE_MIN_PIXELS = 2048 * 2048
+
+
+def create_storage(mode: str, width: int, height: int, data: Optional[np.ndarray] = None):
+    """
+    创建指定模式的存储
+
+    Args:
+        mode: 存储模式 ('dense' | 'packed' | 'tiled')
+        width: 宽度
+        height: 高度
+        data: 初始位图数据
+
+    Returns:
+        存储对象
+    """
+    if mode not in STORAGE_TYPES:
+        raise ValueError(f"不支持的存储模式: {mode}")
+    return STORAGE_TYPES[mode](width, height, data)
+
+
+def storage_mode_for_size(width: int, height: int) -> str:
+    """
+    根据画布尺寸选择存储模式（大画布使用分块稀疏存储）
+
+    Args:
+        width: 宽度
+        height: 高度
+
+    Returns:
+        存储模式
+    """
+    if width * height > TILED_STORAGE_MIN_PIXELS:
+        return TiledStorage.mode
+    return DenseStorage.mode
@@ -3,12 +3,22 @@ import json
 import base64
 import numpy as np
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, List, Optional, Tuple
 import logging
+import os
+import shutil
+import tempfile
+import weakref
 
 from .canvas import Canvas
 from .layer import Layer
+from .layer_storage import TiledStorage
+from .project_container import (
+    COMPRESSION_NAMES, ContainerError, ContainerReader, ENCODING_NONE, ENCODING_ROWS,
+    ENCODING_TILES, StoredBlob, decompress_blob, is_container, write_container
+)
 from .text_object import TextObject
+from ..utils.bit_operations import unpack_rows
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +26,11 @@ logger = logging.getLogger(__name__)
 class Project:
     """项目管理类"""
 
-    VERSION = "1.0"
+    # 1.1: JSON 项目的位图图层可以保存为分块数据（"tiles" 字段）
+    VERSION = "1.1"
+
+    # 使用二进制容器格式保存的文件扩展名（其他扩展名保存为 JSON）
+    BINARY_EXTENSION = ".mpxb"
 
     def __init__(self, canvas: Canvas, file_path: Optional[str] = None):
         """
@@ -29,13 +43,27 @@ class Project:
         self.canvas = canvas
         self.file_path = file_path
         self.modified = False
-
-    def save(self, file_path: Optional[str] = None) -> bool:
+        # 二进制格式数据块的压缩方式 ('none' | 'zlib' | 'zstd')
+        self.compression = "zlib"
+        # 是否延迟加载位图：打开项目时只加载图层属性，像素数据在第一次访问时解码
+        self.lazy_load = False
+        # 当前项目文件的读取器（二进制格式），保持打开以便延迟加载和复制数据块
+        self._reader: Optional[ContainerReader] = None
+        # 位图图层最近一次加载或保存时的数据块位置 (revision, reader, index)，
+        # 修订号未变的图层增量保存时直接复制已压缩的数据块
+        self._blob_refs: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # 延迟加载的 JSON 图层在加载前的图层数据（加载后删除）
+        self._json_refs: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # 最近一次加载中被跳过或解码失败的图层（延迟加载的图层在第一次访问时才可能失败）
+        self.load_errors: List[str] = []
+
+    def save(self, file_path: Optional[str] = None, binary: Optional[bool] = None) -> bool:
         """
         保存项目
 
         Args:
             file_path: 保存路径，如果为 None 则使用当前路径
+            binary: 是否使用二进制容器格式，为 None 时按扩展名判断（.mpxb 为二进制）
 
         Returns:
             是否成功保存
@@ -46,41 +74,36 @@ class Project:
         if not self.file_path:
             return False
 
-        try:
-            # 构建项目数据
-            project_data = {
-                "version": self.VERSION,
-                "canvas": {
-                    "width": self.canvas.width,
-                    "height": self.canvas.height,
-                    "grid_visible": self.canvas.grid_visible,
-                    "active_layer_index": self.canvas.active_layer_index
-                },
-                "layers": []
-            }
+        if binary is None:
+            binary = Path(self.file_path).suffix.lower() == self.BINARY_EXTENSION
 
-            # 保存所有图层
-            for layer in self.canvas.layers:
-                layer_data = {
-                    "name": layer.name,
-                    "visible": layer.visible,
-                    "locked": layer.locked,
-                    "width": layer.width,
-                    "height": layer.height,
-                    "layer_type": layer.layer_type
-                }
-
-                # 根据图层类型保存数据
-                if layer.layer_type == "bitmap" and layer.data is not None:
-                    layer_data["data"] = self._encode_layer_data(layer.data)
-                elif layer.layer_type == "text" and layer.text_object:
-                    layer_data["text_object"] = layer.text_object.to_dict()
-
-                project_data["layers"].append(layer_data)
-
-            # 写入文件
-            with open(self.file_path, "w", encoding="utf-8") as f:
-                json.dump(project_data, f, indent=2, ensure_ascii=False)
+        try:
+            layers = list(self.canvas.layers)
+            if binary:
+                # 元数据不含位图，位图作为原始打包数据块写入容器；
+                # 修订号未变的图层直接复制上次加载或保存的数据块，不需要加载和重新编码
+                meta = self._build_project_data(include_bitmaps=False)
+                blobs = [self._stored_blob(layer) or self._encode_layer_blob(layer) for layer in layers]
+
+                def write(path: str) -> None:
+                    write_container(path, meta, blobs, self.compression)
+            else:
+                project_data = self._build_project_data(include_bitmaps=True)
+
+                def write(path: str) -> None:
+                    with open(path, "w", encoding="utf-8") as f:
+                        json.dump(project_data, f, indent=2, ensure_ascii=False)
+                        f.flush()
+                        os.fsync(f.fileno())
+
+            self._write_atomic(write, layers if binary else [])
+
+            if binary:
+                # 之后的增量保存和延迟加载使用新文件中的数据块
+                self._reader = ContainerReader(self.file_path)
+                for index, layer in enumerate(layers):
+                    if self._reader.index[index][4] != ENCODING_NONE:
+                        self._blob_refs[layer] = (layer.revision, self._reader, index)
 
             self.modified = False
             return True
@@ -95,16 +118,211 @@ class Project:
             logger.error(f"保存项目失败 - 未知错误: {e}")
             return False
 
-    def load(self, file_path: str) -> bool:
+    def _stored_blob(self, layer: Layer) -> Optional[StoredBlob]:
+        """
+        获取可以原样复制的数据块
+
+        Args:
+            layer: 图层
+
+        Returns:
+            图层自上次加载或保存后没有修改且压缩方式相同时返回已有数据块，否则返回 None
+        """
+        ref = self._blob_refs.get(layer)
+        if ref is None:
+            return None
+        revision, reader, index = ref
+        if layer.revision != revision or reader.index[index][3] != COMPRESSION_NAMES.get(self.compression):
+            return None
+        return StoredBlob(reader, index)
+
+    def copy_unloaded_layer(self, layer: Layer) -> Optional[Layer]:
+        """
+        复制还未加载的位图图层而不解码（用于在界面线程上快照）
+
+        二进制项目只复制数据块的压缩字节，JSON 项目复用加载前的图层数据；
+        副本在第一次访问像素数据时才解码，不依赖当前文件的读取器，可以在其他线程加载
+
+        Args:
+            layer: 图层
+
+        Returns:
+            副本（名称、可见性和锁定状态与原图层相同），图层已加载或没有可复制的数据时返回 None
+        """
+        if layer.layer_type != "bitmap" or layer.is_loaded:
+            return None
+
+        layer_data = self._json_refs.get(layer)
+        ref = self._blob_refs.get(layer)
+        if layer_data is not None:
+            def load(target: Layer) -> None:
+                self._load_json_bitmap(target, layer_data)
+        elif ref is not None and ref[0] == layer.revision:
+            _, reader, index = ref
+            _, _, raw_size, compression, encoding = reader.index[index]
+            stored = reader.read_stored(index)
+
+            def load(target: Layer) -> None:
+                self._decode_layer_blob(target, encoding, decompress_blob(stored, compression, raw_size))
+        else:
+            return None
+
+        copy = Layer(layer.width, layer.height, layer.name, layer.layer_type, layer.storage_mode)
+        copy.set_loader(load)
+        copy.visible = layer.visible
+        copy.locked = layer.locked
+        return copy
+
+    def _write_atomic(self, write: Callable[[str], None], kept_layers: list) -> None:
+        """
+        写入临时文件后替换项目文件，写入失败时原文件保持不变
+
+        替换前关闭当前读取器（Windows 上不能替换已映射的文件）
+
+        Args:
+            write: 写入函数，参数为临时文件路径
+            kept_layers: 数据块写入新文件的图层，保存后由调用方指向新文件
+        """
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        fd, temp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(self.file_path)}.", suffix=".tmp", dir=directory
+        )
+        os.close(fd)
+
+        try:
+            # mkstemp 创建的文件只有所有者可读写，沿用原文件的权限
+            if os.path.exists(self.file_path):
+                shutil.copymode(self.file_path, temp_path)
+            else:
+                os.chmod(temp_path, 0o644)
+
+            write(temp_path)
+
+            reader = self._reader
+            self._close_reader(kept_layers)
+
+            try:
+                os.replace(temp_path, self.file_path)
+            except OSError:
+                if reader is not None:
+                    self._reopen_reader(reader)
+                raise
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def close_file(self, load_pending: bool = True) -> None:
+        """
+        关闭当前项目文件的读取器（之后可以安全地删除或替换该文件）
+
+        还未加载的图层会先加载，之后保存会重新编码所有图层
+
+        Args:
+            load_pending: 是否加载还未加载的图层；丢弃整个项目时传入 False，
+                这些图层之后无法再加载
+        """
+        self._close_reader(load_pending=load_pending)
+
+    def _close_reader(self, kept_layers: Iterable[Layer] = (), load_pending: bool = True) -> None:
+        """
+        关闭当前读取器
+
+        仍依赖该读取器的延迟加载图层（例如撤销记录中已删除的图层）会先加载，
+        kept_layers 中的图层除外（它们的数据块已写入新文件，由调用方重新指向）
+
+        Args:
+            kept_layers: 不需要加载的图层
+            load_pending: 是否加载仍依赖该读取器的图层
+        """
+        reader = self._reader
+        if reader is None:
+            return
+        kept = set(kept_layers)
+        for layer, (_, ref_reader, _) in list(self._blob_refs.items()):
+            if ref_reader is reader and layer not in kept:
+                if load_pending:
+                    layer.load()
+                del self._blob_refs[layer]
+        reader.close()
+        self._reader = None
+
+    def _reopen_reader(self, reader: ContainerReader) -> None:
+        """
+        重新打开已关闭的读取器，并把引用它的数据块指向新的读取器
+
+        Args:
+            reader: 已关闭的读取器
+        """
+        self._reader = ContainerReader(reader.file_path)
+        for layer, (revision, ref_reader, index) in list(self._blob_refs.items()):
+            if ref_reader is reader:
+                self._blob_refs[layer] = (revision, self._reader, index)
+
+    def _build_project_data(self, include_bitmaps: bool) -> dict:
+        """
+        构建项目数据（JSON 格式的完整内容，或二进制格式的元数据）
+
+        Args:
+            include_bitmaps: 是否包含 Base64 编码的位图数据
+
+        Returns:
+            项目数据字典
+        """
+        project_data = {
+            "version": self.VERSION,
+            "canvas": {
+                "width": self.canvas.width,
+                "height": self.canvas.height,
+                "grid_visible": self.canvas.grid_visible,
+                "active_layer_index": self.canvas.active_layer_index
+            },
+            "layers": []
+        }
+
+        # 保存所有图层
+        for layer in self.canvas.layers:
+            layer_data = {
+                "name": layer.name,
+                "visible": layer.visible,
+                "locked": layer.locked,
+                "width": layer.width,
+                "height": layer.height,
+                "layer_type": layer.layer_type
+            }
+
+            # 根据图层类型保存数据
+            if layer.layer_type == "bitmap" and layer.has_bitmap and include_bitmaps:
+                if layer.storage_mode == "tiled":
+                    # 分块图层只保存非空块
+                    layer_data["tiles"] = self._encode_tiles(layer)
+                else:
+                    layer_data["data"] = self._encode_layer(layer)
+            elif layer.layer_type == "text" and layer.text_object:
+                layer_data["text_object"] = layer.text_object.to_dict()
+
+            project_data["layers"].append(layer_data)
+
+        return project_data
+
+    def load(self, file_path: str, lazy: Optional[bool] = None) -> bool:
         """
         加载项目
 
         Args:
             file_path: 项目文件路径
+            lazy: 是否延迟加载位图，为 None 时使用 lazy_load 属性
 
         Returns:
             是否成功加载
         """
+        if lazy is None:
+            lazy = self.lazy_load
+
+        # 按文件头识别二进制容器，其他文件按 JSON 格式加载
+        if is_container(file_path):
+            return self._load_binary(file_path, lazy)
+
         try:
             # 读取文件
             with open(file_path, "r", encoding="utf-8") as f:
@@ -123,6 +341,176 @@ class Project:
             logger.error(f"加载项目失败 - IO错误: {e}")
             return False
 
+        def load_bitmap(index: int, layer: Layer, layer_data: dict) -> None:
+            if lazy:
+                self._json_refs[layer] = layer_data
+                layer.set_loader(self._make_loader(
+                    lambda target: self._load_json_bitmap(target, self._json_refs.pop(target)), index
+                ))
+            else:
+                self._load_json_bitmap(layer, layer_data)
+
+        if not self._load_project_data(project_data, file_path, load_bitmap):
+            return False
+        # 不再需要上一个文件的读取器
+        self.close_file()
+        return True
+
+    def _load_binary(self, file_path: str, lazy: bool) -> bool:
+        """
+        加载二进制容器格式的项目
+
+        读取器保持打开，用于延迟加载和增量保存时复制未修改图层的数据块
+
+        Args:
+            file_path: 项目文件路径
+            lazy: 是否延迟加载位图
+
+        Returns:
+            是否成功加载
+        """
+        try:
+            reader = ContainerReader(file_path)
+        except PermissionError:
+            logger.error(f"加载项目失败 - 权限不足: {file_path}")
+            return False
+        except ContainerError as e:
+            logger.error(f"加载项目失败 - 二进制格式错误: {e}")
+            return False
+        except (ValueError, IOError) as e:
+            logger.error(f"加载项目失败 - 读取错误: {e}")
+            return False
+
+        def load_bitmap(index: int, layer: Layer, layer_data: dict) -> None:
+            # 延迟加载时也先检查数据块结构，明显损坏的图层和立即加载一样被跳过
+            self._check_blob(layer, reader, index)
+            self._blob_refs[layer] = (layer.revision, reader, index)
+            if lazy:
+                layer.set_loader(self._make_loader(self._load_blob, index))
+            else:
+                self._load_blob(layer)
+
+        if not self._load_project_data(reader.meta, file_path, load_bitmap):
+            reader.close()
+            return False
+        # 关闭上一个文件的读取器（仍被撤销记录引用的旧图层会先加载）
+        self.close_file()
+        self._reader = reader
+        return True
+
+    @staticmethod
+    def _check_blob(layer: Layer, reader: ContainerReader, index: int) -> None:
+        """
+        检查数据块的编码和大小是否与图层一致（不解压）
+
+        Args:
+            layer: 位图图层
+            reader: 读取器
+            index: 图层在索引表中的位置
+
+        Raises:
+            ContainerError: 数据块与图层不一致
+        """
+        if index >= len(reader.index):
+            raise ContainerError(f"缺少图层 {index} 的数据块")
+        raw_size, encoding = reader.index[index][2], reader.index[index][4]
+        if encoding == ENCODING_ROWS:
+            expected = layer.height * ((layer.width + 7) // 8)
+            if raw_size != expected:
+                raise ContainerError(f"数据块大小 {raw_size} 与图层尺寸不符（应为 {expected}）")
+        elif encoding == ENCODING_TILES:
+            if raw_size < 8:
+                raise ContainerError("分块数据块不完整")
+        elif encoding != ENCODING_NONE:
+            raise ContainerError(f"不支持的图层编码: {encoding}")
+
+    def _load_blob(self, layer: Layer) -> None:
+        """
+        从图层记录的数据块解码位图
+
+        Args:
+            layer: 位图图层
+        """
+        _, reader, index = self._blob_refs[layer]
+        self._decode_layer_blob(layer, *reader.read_blob(index))
+        # 解码本身不算修改，之后保存仍可复制原数据块
+        self._blob_refs[layer] = (layer.revision, reader, index)
+
+    def _make_loader(self, load: Callable[[Layer], None], index: int) -> Callable[[Layer], None]:
+        """
+        创建图层的延迟加载函数
+
+        Args:
+            load: 位图加载函数
+            index: 图层在文件中的位置（用于错误信息）
+
+        Returns:
+            加载函数，解码失败时把错误记入 load_errors 并保留空白图层
+        """
+        def loader(layer: Layer) -> None:
+            try:
+                load(layer)
+            except Exception as e:
+                message = f"图层 {index} ({layer.name}) 解码失败: {e}"
+                logger.error(f"延迟加载失败 - {message}")
+                self.load_errors.append(message)
+
+        return loader
+
+    def _load_json_bitmap(self, layer: Layer, layer_data: dict) -> None:
+        """
+        从 JSON 图层数据解码位图
+
+        Args:
+            layer: 位图图层
+            layer_data: 图层数据字典
+        """
+        if "tiles" in layer_data:
+            self._decode_tiles(layer, layer_data["tiles"])
+        elif "data" in layer_data:
+            layer.data = self._decode_layer_data(
+                layer_data["data"],
+                layer_data["width"],
+                layer_data["height"]
+            )
+
+    @staticmethod
+    def _parse_version(version) -> Optional[Tuple[int, ...]]:
+        """
+        解析版本号
+
+        Args:
+            version: 版本号字符串（如 "1.1"）
+
+        Returns:
+            版本号元组，格式无效时返回 None
+        """
+        if not isinstance(version, str):
+            return None
+        try:
+            return tuple(int(part) for part in version.split("."))
+        except ValueError:
+            return None
+
+    def _load_project_data(
+        self,
+        project_data: dict,
+        file_path: str,
+        load_bitmap: Callable[[int, Layer, dict], None]
+    ) -> bool:
+        """
+        验证项目数据并重建画布和图层
+
+        Args:
+            project_data: 项目数据（JSON 内容或二进制格式的元数据）
+            file_path: 项目文件路径
+            load_bitmap: 位图加载函数 (图层在文件中的位置, 图层, 图层数据字典)，
+                可以立即解码，也可以为延迟加载设置加载函数
+
+        Returns:
+            是否成功加载
+        """
+        self.load_errors = []
         try:
             # 验证数据结构
             if not isinstance(project_data, dict):
@@ -137,10 +525,15 @@ class Project:
                 logger.error("加载项目失败 - 缺少 layers 字段")
                 return False
 
-            # 检查版本
+            # 检查版本：旧版本的文件可以直接加载，新版本可能包含无法识别的数据
             version = project_data.get("version", "1.0")
-            if version != self.VERSION:
-                logger.warning(f"项目版本不匹配 (文件: {version}, 当前: {self.VERSION})")
+            file_version = self._parse_version(version)
+            if file_version is None:
+                logger.error(f"加载项目失败 - 版本号无效: {version!r}")
+                return False
+            if file_version > self._parse_version(self.VERSION):
+                logger.error(f"加载项目失败 - 文件版本 {version} 高于当前支持的版本 {self.VERSION}")
+                return False
 
             # 加载画布设置
             canvas_data = project_data["canvas"]
@@ -174,11 +567,13 @@ class Project:
             for i, layer_data in enumerate(layers_data):
                 if not isinstance(layer_data, dict):
                     logger.warning(f"跳过图层 {i} - 不是字典")
+                    self.load_errors.append(f"图层 {i} 不是字典")
                     continue
 
                 # 验证必需字段
                 if "width" not in layer_data or "height" not in layer_data or "name" not in layer_data:
                     logger.warning(f"跳过图层 {i} - 缺少必需字段")
+                    self.load_errors.append(f"图层 {i} 缺少必需字段")
                     continue
 
                 # 获取图层类型（向后兼容：默认为 bitmap）
@@ -189,20 +584,16 @@ class Project:
                         layer_data["width"],
                         layer_data["height"],
                         layer_data["name"],
-                        layer_type
+                        layer_type,
+                        self.canvas.get_layer_storage()
                     )
                     layer.visible = layer_data.get("visible", True)
                     layer.locked = layer_data.get("locked", False)
 
                     # 根据图层类型加载数据
                     if layer_type == "bitmap":
-                        # 位图图层：解码位图数据
-                        if "data" in layer_data:
-                            layer.data = self._decode_layer_data(
-                                layer_data["data"],
-                                layer_data["width"],
-                                layer_data["height"]
-                            )
+                        # 位图图层：解码位图数据（延迟加载时只设置加载函数）
+                        load_bitmap(i, layer, layer_data)
                     elif layer_type == "text":
                         # 文本图层：加载文本对象
                         if "text_object" in layer_data:
@@ -211,6 +602,7 @@ class Project:
                     self.canvas.layers.append(layer)
                 except Exception as e:
                     logger.warning(f"跳过图层 {i} - 加载失败: {e}")
+                    self.load_errors.append(f"图层 {i} 加载失败: {e}")
                     continue
 
             # 确保至少有一个图层
@@ -234,6 +626,120 @@ class Project:
             logger.error(f"加载项目失败 - 未知错误: {e}")
             return False
 
+    @staticmethod
+    def _encode_layer(layer: Layer) -> str:
+        """
+        编码位图图层数据为 Base64
+
+        宽度为 8 的倍数时按行打包的数据与整体打包的数据完全相同，
+        直接使用图层的打包数据（打包存储的图层无需解包）
+
+        Args:
+            layer: 位图图层
+
+        Returns:
+            Base64 编码的字符串
+        """
+        if layer.width % 8 == 0:
+            packed = layer.get_packed_rows()
+            return base64.b64encode(packed.tobytes()).decode('ascii')
+        return Project._encode_layer_data(layer.data)
+
+    @staticmethod
+    def _encode_layer_blob(layer: Layer) -> Tuple[int, bytes]:
+        """
+        编码二进制容器中的图层数据块
+
+        Args:
+            layer: 图层
+
+        Returns:
+            (encoding, 原始数据)：分块图层为非空块列表，其他位图图层为按行打包数据
+        """
+        if layer.layer_type != "bitmap" or not layer.has_bitmap:
+            return ENCODING_NONE, b""
+
+        if layer.storage_mode == "tiled":
+            tiles = list(layer.iter_tiles())
+            header = np.array([TiledStorage.TILE_SIZE, len(tiles)], dtype="<u4")
+            coords = np.array([(x, y) for x, y, _ in tiles], dtype="<u4").reshape(-1, 2)
+            parts = [header.tobytes(), coords.tobytes()]
+            parts.extend(np.packbits(tile, axis=1).tobytes() for _, _, tile in tiles)
+            return ENCODING_TILES, b"".join(parts)
+
+        return ENCODING_ROWS, layer.get_packed_rows().tobytes()
+
+    @staticmethod
+    def _decode_layer_blob(layer: Layer, encoding: int, data: Optional[np.ndarray]) -> None:
+        """
+        解码二进制容器中的图层数据块并写入图层
+
+        Args:
+            layer: 位图图层
+            encoding: 数据块编码方式
+            data: 数据块（uint8 数组，可能是 mmap 上的只读视图）
+        """
+        if encoding == ENCODING_NONE or data is None:
+            return
+
+        if encoding == ENCODING_ROWS:
+            row_bytes = (layer.width + 7) // 8
+            layer.set_packed_rows(data.reshape(layer.height, row_bytes))
+            return
+
+        if encoding != ENCODING_TILES:
+            raise ContainerError(f"不支持的图层编码: {encoding}")
+
+        tile_size, count = (int(v) for v in data[:8].view("<u4"))
+        coords = data[8:8 + count * 8].view("<u4").reshape(-1, 2)
+        pos = 8 + count * 8
+        for x, y in coords.tolist():
+            tile_w = min(tile_size, layer.width - x)
+            tile_h = min(tile_size, layer.height - y)
+            if tile_w <= 0 or tile_h <= 0:
+                raise ContainerError(f"块 ({x}, {y}) 超出图层范围")
+            nbytes = tile_h * ((tile_w + 7) // 8)
+            packed = data[pos:pos + nbytes].reshape(tile_h, -1)
+            layer.set_region(x, y, unpack_rows(packed, tile_w, msb_first=True))
+            pos += nbytes
+        if pos != len(data):
+            raise ContainerError("分块数据块大小不匹配")
+
+    @staticmethod
+    def _encode_tiles(layer: Layer) -> dict:
+        """
+        编码图层的非空块（空白区域不写入文件）
+
+        Args:
+            layer: 位图图层
+
+        Returns:
+            {"size": 块边长, "items": [[x, y, Base64 数据], ...]}，块形状由位置和图层尺寸决定
+        """
+        return {
+            "size": TiledStorage.TILE_SIZE,
+            "items": [
+                [x, y, Project._encode_layer_data(tile)]
+                for x, y, tile in layer.iter_tiles()
+            ]
+        }
+
+    @staticmethod
+    def _decode_tiles(layer: Layer, tiles_data: dict) -> None:
+        """
+        解码非空块并写入图层
+
+        Args:
+            layer: 位图图层
+            tiles_data: _encode_tiles 的结果
+        """
+        size = int(tiles_data["size"])
+        for x, y, encoded in tiles_data["items"]:
+            tile_w = min(size, layer.width - x)
+            tile_h = min(size, layer.height - y)
+            if tile_w > 0 and tile_h > 0:
+                layer.set_region(x, y, Project._decode_layer_data(encoded, tile_w, tile_h))
+
     @staticmethod
     def _encode_layer_data(data: np.ndarray) -> str:
         """
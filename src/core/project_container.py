@@ -0,0 +1,264 @@
+"""二进制项目容器格式
+
+文件布局（小端序）：
+
+    文件头     magic(4s) version(H) reserved(H) layer_count(I) meta_size(I)
+    元数据     UTF-8 JSON（画布设置、图层属性、文本对象，不含位图）
+    索引表     每个图层一项：offset(Q) stored_size(Q) raw_size(Q) compression(B) encoding(B) 保留(6x)
+    数据块     各图层的原始打包数据，可选 zlib/zstd 压缩
+
+未压缩的数据块可以用 np.frombuffer 直接从 mmap 读取，不需要 JSON 解析和 Base64 解码
+"""
+import json
+import mmap
+import os
+import struct
+import zlib
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:  # zstandard 为可选依赖，未安装时不能使用 zstd 压缩
+    zstandard = None
+
+MAGIC = b"MPXB"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sHHII")
+INDEX_ENTRY = struct.Struct("<QQQBB6x")
+
+# 数据块压缩方式
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSION_NAMES = {
+    "none": COMPRESSION_NONE,
+    "zlib": COMPRESSION_ZLIB,
+    "zstd": COMPRESSION_ZSTD,
+}
+
+# 数据块编码方式
+ENCODING_NONE = 0   # 没有位图数据（文本图层等）
+ENCODING_ROWS = 1   # 按行打包 (height, (width + 7) // 8)，MSB 在前
+ENCODING_TILES = 2  # 非空块：tile_size(I)、count(I)、count 对 (x, y)(I)、依次排列的按行打包块数据
+
+
+class ContainerError(ValueError):
+    """二进制项目文件格式错误"""
+
+
+class StoredBlob(NamedTuple):
+    """已有容器中的数据块，写入新容器时原样复制（不解压、不重新编码）"""
+    reader: 'ContainerReader'
+    index: int
+
+
+def is_container(file_path: str) -> bool:
+    """
+    判断文件是否为二进制项目容器
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        文件以容器魔数开头时返回 True
+    """
+    try:
+        with open(file_path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _compress(data: bytes, compression: int) -> bytes:
+    """按指定方式压缩数据块"""
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(data, 1)
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ContainerError("未安装 zstandard，无法使用 zstd 压缩")
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+
+def decompress_blob(stored: bytes, compression: int, raw_size: int) -> np.ndarray:
+    """
+    解压数据块（不检查解压后的大小）
+
+    Args:
+        stored: 数据块在文件中保存的字节（见 ContainerReader.read_stored）
+        compression: 数据块的压缩方式
+        raw_size: 解压后的大小
+
+    Returns:
+        uint8 数组
+
+    Raises:
+        ContainerError: 不支持的压缩方式
+    """
+    if compression == COMPRESSION_NONE:
+        raw = stored
+    elif compression == COMPRESSION_ZLIB:
+        raw = zlib.decompress(stored)
+    elif compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ContainerError("未安装 zstandard，无法读取 zstd 压缩的数据块")
+        raw = zstandard.ZstdDecompressor().decompress(stored, max_output_size=raw_size)
+    else:
+        raise ContainerError(f"不支持的压缩方式: {compression}")
+    return np.frombuffer(raw, dtype=np.uint8)
+
+
+def write_container(file_path: str, meta: dict, blobs: List[Union[Tuple[int, bytes], StoredBlob]],
+                    compression: str = "zlib") -> None:
+    """
+    写入二进制项目容器
+
+    Args:
+        file_path: 文件路径
+        meta: 元数据（可 JSON 序列化），meta["layers"] 与 blobs 一一对应
+        blobs: 每个图层的 (encoding, 原始数据)，没有位图时为 (ENCODING_NONE, b"")；
+            StoredBlob 按原有的压缩方式原样复制
+        compression: 新数据块的压缩方式 ('none' | 'zlib' | 'zstd')
+    """
+    if compression not in COMPRESSION_NAMES:
+        raise ContainerError(f"不支持的压缩方式: {compression}")
+    compression_id = COMPRESSION_NAMES[compression]
+
+    meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    offset = HEADER.size + len(meta_bytes) + INDEX_ENTRY.size * len(blobs)
+
+    entries = []
+    stored_blobs = []
+    for blob in blobs:
+        if isinstance(blob, StoredBlob):
+            _, stored_size, raw_size, block_compression, encoding = blob.reader.index[blob.index]
+            stored = blob
+        else:
+            encoding, raw = blob
+            block_compression = compression_id if raw else COMPRESSION_NONE
+            stored = _compress(raw, block_compression)
+            stored_size, raw_size = len(stored), len(raw)
+        entries.append(INDEX_ENTRY.pack(offset, stored_size, raw_size, block_compression, encoding))
+        stored_blobs.append(stored)
+        offset += stored_size
+
+    with open(file_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(blobs), len(meta_bytes)))
+        f.write(meta_bytes)
+        for entry in entries:
+            f.write(entry)
+        for stored in stored_blobs:
+            if isinstance(stored, StoredBlob):
+                # 逐个从 mmap 复制，不同时持有所有数据块
+                f.write(stored.reader.read_stored(stored.index))
+            else:
+                f.write(stored)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class ContainerReader:
+    """二进制项目容器读取器（通过 mmap 按需读取数据块）"""
+
+    def __init__(self, file_path: str):
+        """
+        打开容器并解析文件头、元数据和索引表
+
+        Args:
+            file_path: 文件路径
+
+        Raises:
+            ContainerError: 文件格式错误
+            OSError: 文件无法读取
+        """
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法映射
+            self._file.close()
+            raise ContainerError("文件为空")
+
+        try:
+            self.meta, self.index = self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self) -> Tuple[dict, List[tuple]]:
+        """解析文件头、元数据和索引表"""
+        size = len(self._mmap)
+        if size < HEADER.size:
+            raise ContainerError("文件头不完整")
+        magic, version, _, layer_count, meta_size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ContainerError("不是二进制项目文件")
+        if version > FORMAT_VERSION:
+            raise ContainerError(f"不支持的容器版本: {version}")
+
+        index_offset = HEADER.size + meta_size
+        if index_offset + INDEX_ENTRY.size * layer_count > size:
+            raise ContainerError("索引表不完整")
+        meta = json.loads(bytes(self._mmap[HEADER.size:index_offset]).decode("utf-8"))
+
+        index = []
+        for i in range(layer_count):
+            entry = INDEX_ENTRY.unpack_from(self._mmap, index_offset + INDEX_ENTRY.size * i)
+            offset, stored_size = entry[0], entry[1]
+            if offset + stored_size > size:
+                raise ContainerError(f"图层 {i} 的数据块超出文件范围")
+            index.append(entry)
+        return meta, index
+
+    def read_blob(self, index: int) -> Tuple[int, Optional[np.ndarray]]:
+        """
+        读取图层数据块
+
+        未压缩的数据块直接返回 mmap 上的只读视图（关闭读取器前需要复制）
+
+        Args:
+            index: 图层在索引表中的位置
+
+        Returns:
+            (encoding, data)，data 为 uint8 数组，没有位图时为 None
+        """
+        offset, stored_size, raw_size, compression, encoding = self.index[index]
+        if encoding == ENCODING_NONE:
+            return encoding, None
+
+        if compression == COMPRESSION_NONE:
+            data = np.frombuffer(self._mmap, dtype=np.uint8, count=stored_size, offset=offset)
+        else:
+            data = decompress_blob(self._mmap[offset:offset + stored_size], compression, raw_size)
+
+        if len(data) != raw_size:
+            raise ContainerError(f"图层 {index} 的数据块大小不匹配")
+        return encoding, data
+
+    def read_stored(self, index: int) -> bytes:
+        """
+        读取数据块在文件中保存的原始字节（不解压）
+
+        Args:
+            index: 图层在索引表中的位置
+
+        Returns:
+            数据块字节
+        """
+        offset, stored_size = self.index[index][:2]
+        return self._mmap[offset:offset + stored_size]
+
+    def close(self) -> None:
+        """关闭 mmap 和文件"""
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'ContainerReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
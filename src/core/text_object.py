@@ -59,6 +59,24 @@ class TextObject:
             custom_font_path=self.custom_font_path
         )
 
+    def cache_key(self) -> tuple:
+        """
+        获取表示当前所有属性的键（用于判断文本对象是否发生变化）
+
+        Returns:
+            属性元组
+        """
+        return (
+            self.text,
+            self.font_name,
+            self.font_size,
+            tuple(self.position),
+            self.max_width,
+            self.letter_spacing,
+            self.line_spacing,
+            self.custom_font_path
+        )
+
     def to_dict(self) -> dict:
         """
         转换为字典（用于序列化）
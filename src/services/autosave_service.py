@@ -0,0 +1,251 @@
+"""自动保存服务"""
+import json
+import logging
+import os
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from ..core.canvas import Canvas
+from ..core.project import Project
+
+logger = logging.getLogger(__name__)
+
+
+class AutosaveService:
+    """
+    自动保存服务
+
+    在界面线程上快照画布（只复制修订号变化的位图图层，未变化的图层沿用上次快照的副本，
+    未加载的图层只复制编码数据，不在界面线程上解码），在后台线程用 Project 的二进制格式
+    写入恢复文件，并写入记录原项目路径的恢复日志。
+    正常保存或退出后删除恢复文件；程序崩溃时恢复文件保留，下次启动时可以恢复
+    """
+
+    RECOVERY_FILE = "autosave.mpxb"
+    JOURNAL_FILE = "autosave.json"
+
+    def __init__(self, recovery_dir: str, compression: str = "zlib"):
+        """
+        初始化自动保存服务
+
+        Args:
+            recovery_dir: 存放恢复文件的目录（首次写入时创建）
+            compression: 恢复文件数据块的压缩方式 ('none' | 'zlib' | 'zstd')
+        """
+        self.recovery_dir = recovery_dir
+        self.recovery_path = os.path.join(recovery_dir, self.RECOVERY_FILE)
+        self.journal_path = os.path.join(recovery_dir, self.JOURNAL_FILE)
+        self.compression = compression
+        # 快照占用的内存，以及最近一次快照新复制的字节数
+        self.snapshot_nbytes = 0
+        self.last_copied_nbytes = 0
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self._future: Optional[Future] = None
+        # 源图层 -> (修订号, 快照图层)，修订号未变时复用快照图层
+        self._layer_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._last_signature = None
+        # 后台线程写入恢复文件使用的项目，保留以便增量保存
+        self._project: Optional[Project] = None
+
+    def save_async(self, project: Project) -> bool:
+        """
+        快照项目并在后台线程写入恢复文件
+
+        Args:
+            project: 当前项目
+
+        Returns:
+            是否已提交；上一次写入未完成，或项目自上次快照后没有变化时返回 False
+        """
+        if self._future is not None:
+            if not self._future.done():
+                return False
+            if not self._future.result():
+                # 上次写入失败，下次即使没有变化也重新写入
+                self._last_signature = None
+
+        signature = self._get_signature(project)
+        if signature == self._last_signature:
+            return False
+
+        snapshot = self._snapshot(project)
+        self._last_signature = signature
+        self._future = self._executor.submit(self._write, snapshot, project.file_path)
+        return True
+
+    def is_busy(self) -> bool:
+        """后台线程是否正在写入恢复文件"""
+        return self._future is not None and not self._future.done()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待后台写入完成
+
+        Args:
+            timeout: 超时时间（秒），为 None 时一直等待
+
+        Returns:
+            最近一次写入是否成功（没有写入时返回 True）
+        """
+        if self._future is None:
+            return True
+        return self._future.result(timeout)
+
+    def get_memory_usage(self) -> int:
+        """
+        获取快照占用的内存
+
+        Returns:
+            字节数
+        """
+        return self.snapshot_nbytes
+
+    def _get_signature(self, project: Project) -> tuple:
+        """获取项目状态的签名（用于跳过没有变化的快照）"""
+        canvas = project.canvas
+        return (
+            project.file_path, canvas.width, canvas.height,
+            canvas.active_layer_index, canvas.grid_visible,
+            [
+                (id(layer), layer.revision, layer.name, layer.visible, layer.locked,
+                 layer.text_object.to_dict() if layer.text_object else None)
+                for layer in canvas.layers
+            ]
+        )
+
+    def _snapshot(self, project: Project) -> Canvas:
+        """
+        复制画布（只在后台线程空闲时调用，快照图层不会被并发读取）
+
+        Args:
+            project: 当前项目
+
+        Returns:
+            与当前画布不共享可变数据的快照画布
+        """
+        canvas = project.canvas
+        snapshot = Canvas(canvas.width, canvas.height, layer_storage="tiled")
+        snapshot.grid_visible = canvas.grid_visible
+        snapshot.active_layer_index = canvas.active_layer_index
+        snapshot.layers = []
+
+        cache = weakref.WeakKeyDictionary()
+        copied = 0
+        for layer in canvas.layers:
+            cached = self._layer_cache.get(layer)
+            if (layer.layer_type == "bitmap" and cached is not None and cached[0] == layer.revision
+                    and (cached[1].width, cached[1].height) == (layer.width, layer.height)):
+                copy = cached[1]
+            else:
+                # 未加载的图层只复制编码数据，在后台线程保存时才解码
+                copy = project.copy_unloaded_layer(layer) or layer.copy()
+                copied += copy.nbytes
+            copy.name = layer.name
+            copy.visible = layer.visible
+            copy.locked = layer.locked
+            cache[layer] = (layer.revision, copy)
+            snapshot.layers.append(copy)
+
+        self._layer_cache = cache
+        self.snapshot_nbytes = sum(layer.nbytes for layer in snapshot.layers)
+        self.last_copied_nbytes = copied
+        return snapshot
+
+    def _write(self, snapshot: Canvas, file_path: Optional[str]) -> bool:
+        """
+        写入恢复文件和恢复日志（在后台线程运行）
+
+        Args:
+            snapshot: 快照画布
+            file_path: 原项目文件路径
+
+        Returns:
+            是否成功写入
+        """
+        try:
+            os.makedirs(self.recovery_dir, exist_ok=True)
+            if self._project is None:
+                self._project = Project(snapshot)
+                self._project.compression = self.compression
+            self._project.canvas = snapshot
+            if not self._project.save(self.recovery_path, binary=True):
+                return False
+
+            journal = {
+                "file_path": file_path,
+                "saved_at": time.time(),
+            }
+            temp_path = self.journal_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(journal, f, ensure_ascii=False)
+            os.replace(temp_path, self.journal_path)
+            return True
+        except Exception as e:
+            logger.error(f"自动保存失败: {e}")
+            return False
+
+    def get_recovery_info(self) -> Optional[dict]:
+        """
+        获取上次未正常退出时留下的恢复日志
+
+        Returns:
+            {'file_path': 原项目路径或 None, 'saved_at': 保存时间戳}，没有可恢复的文件时返回 None
+        """
+        if not os.path.exists(self.recovery_path):
+            return None
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(journal, dict):
+            return None
+        return journal
+
+    def restore(self, project: Project) -> bool:
+        """
+        从恢复文件加载项目（恢复后项目指向原文件路径并标记为已修改）
+
+        Args:
+            project: 要加载到的项目
+
+        Returns:
+            是否成功恢复
+        """
+        info = self.get_recovery_info()
+        if info is None or not project.load(self.recovery_path, lazy=False):
+            return False
+        # 不再引用恢复文件，之后的自动保存可以替换它
+        project.close_file()
+        project.file_path = info.get("file_path")
+        project.mark_modified()
+        return True
+
+    def clear(self) -> None:
+        """等待后台写入完成并删除恢复文件（项目已保存或放弃修改时调用）"""
+        if self._future is not None:
+            self._future.result()
+            self._future = None
+        if self._project is not None:
+            self._project.close_file()
+            self._project = None
+        self._layer_cache = weakref.WeakKeyDictionary()
+        self._last_signature = None
+        self.snapshot_nbytes = 0
+        self.last_copied_nbytes = 0
+
+        for path in (self.journal_path, self.recovery_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"删除恢复文件失败: {e}")
+
+    def shutdown(self) -> None:
+        """删除恢复文件并停止后台线程（程序正常退出时调用）"""
+        self.clear()
+        self._executor.shutdown()
@@ -1,7 +1,7 @@
 """导出服务"""
 import numpy as np
 from typing import Tuple
-from ..utils.bit_operations import pack_bits_msb, pack_bits_lsb, bytes_per_row
+from ..utils.bit_operations import pack_rows, pack_pages, reverse_bits
 
 
 class ExportService:
@@ -20,37 +20,42 @@ class ExportService:
         Returns:
             字节流
         """
-        height, width = data.shape
-        bytes_per_line = bytes_per_row(width)
-        result = []
+        bits = np.asarray(data, dtype=bool)
+        if invert:
+            # 先反色再打包，补齐位保持为 0
+            bits = np.logical_xor(bits, True)
+
+        return pack_rows(bits, msb_first).tobytes()
 
-        for y in range(height):
-            bits = []
-            for x in range(width):
-                pixel = bool(data[y, x])
-                if invert:
-                    pixel = not pixel
-                bits.append(pixel)
+    @staticmethod
+    def horizontal_scan_packed(packed: np.ndarray, width: int, msb_first: bool = True,
+                               invert: bool = False) -> bytes:
+        """
+        水平扫描（输入为已按行打包的数据，MSB first 且每行补齐到整字节）
 
-            # 按字节打包
-            for byte_idx in range(bytes_per_line):
-                start = byte_idx * 8
-                end = min(start + 8, width)
-                byte_bits = bits[start:end]
+        与 horizontal_scan 输出相同，但不需要解包：MSB first 时直接复制，
+        LSB first 时查表反转每个字节的位序
 
-                # 不足 8 位补 0
-                while len(byte_bits) < 8:
-                    byte_bits.append(False)
+        Args:
+            packed: 打包数据 (height, (width + 7) // 8)
+            width: 位图宽度（像素）
+            msb_first: 是否 MSB first
+            invert: 是否反色
 
-                # 打包为字节
-                if msb_first:
-                    byte_val = pack_bits_msb(byte_bits)
-                else:
-                    byte_val = pack_bits_lsb(byte_bits)
+        Returns:
+            字节流
+        """
+        rows = np.asarray(packed, dtype=np.uint8)
+        if invert:
+            rows = ~rows
+            # 补齐位保持为 0
+            if width % 8 and rows.shape[1] > 0:
+                rows[:, -1] &= (0xFF << (8 - width % 8)) & 0xFF
 
-                result.append(byte_val)
+        if not msb_first:
+            rows = reverse_bits(rows)
 
-        return bytes(result)
+        return rows.tobytes()
 
     @staticmethod
     def vertical_scan(data: np.ndarray, msb_first: bool = True, invert: bool = False) -> bytes:
@@ -68,32 +73,12 @@ class ExportService:
         Returns:
             字节流
         """
-        height, width = data.shape
-        pages = (height + 7) // 8
-        result = []
-
-        for page in range(pages):
-            for x in range(width):
-                bits = []
-                for bit in range(8):
-                    y = page * 8 + bit
-                    if y < height:
-                        pixel = bool(data[y, x])
-                        if invert:
-                            pixel = not pixel
-                        bits.append(pixel)
-                    else:
-                        bits.append(False)  # 超出部分补 0
-
-                # 打包为字节
-                if msb_first:
-                    byte_val = pack_bits_msb(bits)
-                else:
-                    byte_val = pack_bits_lsb(bits)
-
-                result.append(byte_val)
-
-        return bytes(result)
+        bits = np.asarray(data, dtype=bool)
+        if invert:
+            # 先反色再打包，补齐位保持为 0
+            bits = np.logical_xor(bits, True)
+
+        return pack_pages(bits, msb_first).tobytes()
 
     @staticmethod
     def export_to_c_array(data: np.ndarray, name: str, scan_mode: str,
@@ -163,3 +148,31 @@ class ExportService:
             return ExportService.horizontal_scan(data, msb_first, invert)
         else:
             return ExportService.vertical_scan(data, msb_first, invert)
+
+    @staticmethod
+    def export_to_png(data: np.ndarray, file_path: str, invert: bool) -> bool:
+        """
+        导出为 PNG 图像（True=黑色, False=白色）
+
+        Args:
+            data: 位图数据
+            file_path: 保存路径
+            invert: 是否反色
+
+        Returns:
+            是否成功保存
+        """
+        from PyQt6.QtGui import QImage
+
+        height, width = data.shape
+
+        # 处理反转
+        export_data = ~data if invert else data
+
+        # 转换为 RGB 数组（使用向量化操作提升性能）
+        rgb_data = np.where(export_data, 0, 255).astype(np.uint8)
+        image_data = np.ascontiguousarray(np.repeat(rgb_data[:, :, None], 3, axis=2))
+
+        # image_data 在保存完成前保持引用，QImage 不复制数据
+        image = QImage(image_data.data, width, height, width * 3, QImage.Format.Format_RGB888)
+        return image.save(file_path)
@@ -57,6 +57,11 @@ class FontManager:
             logger.error(f"路径规范化失败: {e}")
             return None
 
+        # 已加载过的字体直接返回，避免重复注册
+        for custom_font in self.custom_fonts:
+            if custom_font['path'] == normalized_path:
+                return custom_font['name']
+
         # 验证文件存在
         if not os.path.exists(normalized_path):
             logger.warning(f"字体文件不存在: {normalized_path}")
@@ -1,11 +1,34 @@
 """预览服务"""
 import numpy as np
-from ..utils.bit_operations import unpack_byte_msb, unpack_byte_lsb, bytes_per_row
+from ..utils.bit_operations import unpack_rows, unpack_pages, bytes_per_row
 
 
 class PreviewService:
     """预览服务类（反向解析）"""
 
+    @staticmethod
+    def _load_bytes(byte_data: bytes, total: int) -> np.ndarray:
+        """
+        将字节流读取为长度为 total 的 uint8 数组
+
+        数据完整时直接引用原缓冲区（不复制），数据不足时末尾补 0
+
+        Args:
+            byte_data: 字节流
+            total: 期望的字节数
+
+        Returns:
+            uint8 数组
+        """
+        count = min(len(byte_data), total)
+        buffer = np.frombuffer(byte_data, dtype=np.uint8, count=count)
+        if count == total:
+            return buffer
+
+        padded = np.zeros(total, dtype=np.uint8)
+        padded[:count] = buffer
+        return padded
+
     @staticmethod
     def parse_horizontal(byte_data: bytes, width: int, height: int,
                         msb_first: bool, invert: bool) -> np.ndarray:
@@ -22,31 +45,17 @@ class PreviewService:
         Returns:
             位图数据
         """
-        result = np.zeros((height, width), dtype=bool)
         bytes_per_line = bytes_per_row(width)
+        total = height * bytes_per_line
+        packed = PreviewService._load_bytes(byte_data, total).reshape((height, bytes_per_line))
+        result = unpack_rows(packed, width, msb_first)
 
-        byte_idx = 0
-        for y in range(height):
-            for byte_col in range(bytes_per_line):
-                if byte_idx >= len(byte_data):
-                    break
-
-                # 解包字节
-                if msb_first:
-                    bits = unpack_byte_msb(byte_data[byte_idx])
-                else:
-                    bits = unpack_byte_lsb(byte_data[byte_idx])
-
-                # 填充像素
-                for bit_idx, bit in enumerate(bits):
-                    x = byte_col * 8 + bit_idx
-                    if x < width:
-                        pixel = bit
-                        if invert:
-                            pixel = not pixel
-                        result[y, x] = pixel
-
-                byte_idx += 1
+        if invert:
+            result = ~result
+            # 数据不足时，缺失字节对应的像素保持为白色（不参与反色）
+            if len(byte_data) < total:
+                valid = (np.arange(total) < len(byte_data)).reshape((height, bytes_per_line))
+                result &= np.repeat(valid, 8, axis=1)[:, :width]
 
         return result
 
@@ -66,31 +75,17 @@ class PreviewService:
         Returns:
             位图数据
         """
-        result = np.zeros((height, width), dtype=bool)
         pages = (height + 7) // 8
-
-        byte_idx = 0
-        for page in range(pages):
-            for x in range(width):
-                if byte_idx >= len(byte_data):
-                    break
-
-                # 解包字节
-                if msb_first:
-                    bits = unpack_byte_msb(byte_data[byte_idx])
-                else:
-                    bits = unpack_byte_lsb(byte_data[byte_idx])
-
-                # 填充像素
-                for bit_idx, bit in enumerate(bits):
-                    y = page * 8 + bit_idx
-                    if y < height:
-                        pixel = bit
-                        if invert:
-                            pixel = not pixel
-                        result[y, x] = pixel
-
-                byte_idx += 1
+        total = pages * width
+        packed = PreviewService._load_bytes(byte_data, total).reshape((pages, width))
+        result = unpack_pages(packed, height, msb_first)
+
+        if invert:
+            result = ~result
+            # 数据不足时，缺失字节对应的像素保持为白色（不参与反色）
+            if len(byte_data) < total:
+                valid = (np.arange(total) < len(byte_data)).reshape((pages, width))
+                result &= np.repeat(valid, 8, axis=0)[:height, :]
 
         return result
 
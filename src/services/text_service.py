@@ -2,23 +2,141 @@
 from PyQt6.QtGui import QFont, QImage, QPainter, QColor
 from PyQt6.QtCore import Qt, QRect
 import numpy as np
+from collections import OrderedDict
 from typing import Tuple
 
 from .font_manager import FontManager
+from ..core.text_object import TextObject
+
+
+def image_to_bitmap(image: QImage) -> np.ndarray:
+    """
+    将 ARGB32 QImage 转换为位图（使用向量化操作）
+
+    Args:
+        image: QImage 对象
+
+    Returns:
+        位图数据
+    """
+    width = image.width()
+    height = image.height()
+
+    # 转换为 numpy 数组（使用向量化操作）
+    # 获取图像数据指针
+    ptr = image.constBits()
+    ptr.setsize(height * width * 4)  # ARGB32 格式，每像素 4 字节
+
+    # 转换为 numpy 数组
+    arr = np.frombuffer(ptr, dtype=np.uint8).reshape((height, width, 4))
+
+    # 提取 RGB 通道（跳过 Alpha）
+    # ARGB32 格式：B, G, R, A
+    b = arr[:, :, 0].astype(np.int32)
+    g = arr[:, :, 1].astype(np.int32)
+    r = arr[:, :, 2].astype(np.int32)
+
+    # 计算灰度值（简单平均）
+    gray = (r + g + b) // 3
+
+    # 阈值二值化（128）
+    bitmap = gray < 128
+
+    return bitmap
+
+
+class GlyphAtlas:
+    """字形图集，缓存单个字体（字体名称 + 字号 + 样式）的字符宽度和二值化字形"""
+
+    def __init__(self, font: QFont):
+        """
+        初始化字形图集
+
+        Args:
+            font: 字体对象
+        """
+        self.font = QFont(font)
+
+        # 使用与渲染相同的绘图设备测量，保证度量一致
+        temp_image = QImage(1, 1, QImage.Format.Format_ARGB32)
+        temp_painter = QPainter(temp_image)
+        temp_painter.setFont(self.font)
+        self.metrics = temp_painter.fontMetrics()
+        self.height = self.metrics.height()
+        temp_painter.end()
+
+        # 字符宽度 {char: width}
+        self._advances: dict = {}
+        # 字形位图 {(char, width): bitmap}
+        self._glyphs: dict = {}
+
+    def advance(self, char: str) -> int:
+        """
+        获取字符的实际宽度
+
+        Args:
+            char: 字符
+
+        Returns:
+            字符宽度（像素）
+        """
+        width = self._advances.get(char)
+        if width is None:
+            width = self.metrics.horizontalAdvance(char)
+            self._advances[char] = width
+        return width
+
+    def glyph(self, char: str, width: int) -> np.ndarray:
+        """
+        获取字符在给定宽度单元格内的二值化字形（超出单元格的部分被裁剪）
+
+        Args:
+            char: 字符
+            width: 单元格宽度（大于 0）
+
+        Returns:
+            位图数据 (height, width)
+        """
+        key = (char, width)
+        bitmap = self._glyphs.get(key)
+        if bitmap is None:
+            image = QImage(width, self.height, QImage.Format.Format_ARGB32)
+            image.fill(Qt.GlobalColor.white)
+
+            painter = QPainter(image)
+            painter.setFont(self.font)
+            painter.setPen(QColor(0, 0, 0))
+            rect = QRect(0, 0, width, self.height)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, char)
+            painter.end()
+
+            bitmap = image_to_bitmap(image)
+            self._glyphs[key] = bitmap
+        return bitmap
 
 
 class TextService:
     """文本渲染服务类"""
 
-    def __init__(self, font_manager: FontManager):
+    def __init__(self, font_manager: FontManager, cache_size: int = 128):
         """
         初始化文本渲染服务
 
         Args:
             font_manager: 字体管理器
+            cache_size: 渲染结果缓存的最大条目数（0 = 不缓存）
         """
         self.font_manager = font_manager
 
+        # 字形图集 {font.key(): GlyphAtlas}
+        self._atlases: dict = {}
+
+        # 渲染结果 LRU 缓存 {key: bitmap}
+        self.cache_size = cache_size
+        self._render_cache: OrderedDict = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     def render_text(
         self,
         text: str,
@@ -26,11 +144,14 @@ class TextService:
         squeeze_halfwidth: bool = True,
         max_width: int = 0,
         letter_spacing: int = 0,
-        line_spacing: int = 0
+        line_spacing: int = 0,
+        custom_font_path: str = ""
     ) -> np.ndarray:
         """
         渲染文本为位图
 
+        相同参数的渲染结果会被缓存，返回的数组为只读，需要修改时请先复制
+
         Args:
             text: 要渲染的文本
             font: 字体对象
@@ -38,6 +159,7 @@ class TextService:
             max_width: 最大宽度（0 = 不限制）
             letter_spacing: 字间距（像素）
             line_spacing: 行间距（像素）
+            custom_font_path: 自定义字体路径（用于区分同名字体的缓存）
 
         Returns:
             位图数据 (height, width)
@@ -45,6 +167,18 @@ class TextService:
         if not text:
             return np.zeros((1, 1), dtype=bool)
 
+        # font.key() 包含字体名称、字号和样式
+        key = (text, font.key(), custom_font_path, max_width,
+               letter_spacing, line_spacing, squeeze_halfwidth)
+
+        bitmap = self._render_cache.get(key)
+        if bitmap is not None:
+            self.cache_hits += 1
+            self._render_cache.move_to_end(key)
+            return bitmap
+
+        self.cache_misses += 1
+
         # 如果设置了最大宽度，进行自动换行
         if max_width > 0:
             lines = self._wrap_text(text, font, squeeze_halfwidth, letter_spacing, max_width)
@@ -53,9 +187,70 @@ class TextService:
 
         # 渲染多行文本
         if len(lines) == 1:
-            return self._render_single_line(lines[0], font, squeeze_halfwidth, letter_spacing)
+            bitmap = self._render_single_line(lines[0], font, squeeze_halfwidth, letter_spacing)
         else:
-            return self._render_multiline(lines, font, squeeze_halfwidth, letter_spacing, line_spacing)
+            bitmap = self._render_multiline(lines, font, squeeze_halfwidth, letter_spacing, line_spacing)
+
+        # 缓存的位图被多处共享，设为只读
+        bitmap.setflags(write=False)
+
+        if self.cache_size > 0:
+            self._render_cache[key] = bitmap
+            # 超出容量时淘汰最久未使用的条目
+            while len(self._render_cache) > self.cache_size:
+                self._render_cache.popitem(last=False)
+
+        return bitmap
+
+    def render_text_object(self, text_object: TextObject, squeeze_halfwidth: bool = True) -> np.ndarray:
+        """
+        按文本对象的属性渲染文本（会加载文本对象使用的自定义字体）
+
+        Args:
+            text_object: 文本对象
+            squeeze_halfwidth: 是否挤压半角字符
+
+        Returns:
+            位图数据 (height, width)，只读
+        """
+        # 创建字体
+        font = QFont(text_object.font_name)
+        font.setPixelSize(text_object.font_size)
+
+        # 如果有自定义字体路径，加载它
+        if text_object.custom_font_path:
+            self.font_manager.load_custom_font(text_object.custom_font_path)
+
+        return self.render_text(
+            text_object.text,
+            font,
+            squeeze_halfwidth=squeeze_halfwidth,
+            max_width=text_object.max_width,
+            letter_spacing=text_object.letter_spacing,
+            line_spacing=text_object.line_spacing,
+            custom_font_path=text_object.custom_font_path
+        )
+
+    def get_cache_info(self) -> dict:
+        """
+        获取渲染缓存统计信息
+
+        Returns:
+            {'hits', 'misses', 'size', 'max_size'}
+        """
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self._render_cache),
+            'max_size': self.cache_size
+        }
+
+    def clear_cache(self) -> None:
+        """清空渲染缓存、字形图集和统计信息"""
+        self._render_cache.clear()
+        self._atlases.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def _calculate_squeeze_ratio(self, char: str, char_width: int, font_size: int) -> float:
         """
@@ -143,13 +338,25 @@ class TextService:
             font_size = font.pixelSize() if font.pixelSize() > 0 else font.pointSize()
             return int(font_size * 0.5)
         else:
-            # 全角字符：使用实际宽度
-            temp_image = QImage(1, 1, QImage.Format.Format_ARGB32)
-            temp_painter = QPainter(temp_image)
-            temp_painter.setFont(font)
-            char_width = temp_painter.fontMetrics().horizontalAdvance(char)
-            temp_painter.end()
-            return char_width
+            # 全角字符：使用实际宽度（由字形图集缓存）
+            return self._get_atlas(font).advance(char)
+
+    def _get_atlas(self, font: QFont) -> GlyphAtlas:
+        """
+        获取字体对应的字形图集
+
+        Args:
+            font: 字体对象
+
+        Returns:
+            字形图集
+        """
+        key = font.key()
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(font)
+            self._atlases[key] = atlas
+        return atlas
 
     def _render_single_line(
         self,
@@ -173,10 +380,7 @@ class TextService:
         if not text:
             return np.zeros((1, 1), dtype=bool)
 
-        # 创建临时图像以测量文本尺寸
-        temp_image = QImage(1, 1, QImage.Format.Format_ARGB32)
-        temp_painter = QPainter(temp_image)
-        temp_painter.setFont(font)
+        atlas = self._get_atlas(font)
 
         # 计算每个字符的宽度
         char_widths = []
@@ -190,37 +394,25 @@ class TextService:
             if i < len(text) - 1:
                 total_width += letter_spacing
 
-        # 计算总高度
-        height = temp_painter.fontMetrics().height()
-        temp_painter.end()
-
-        # 创建实际渲染图像
-        image = QImage(total_width, height, QImage.Format.Format_ARGB32)
-        image.fill(Qt.GlobalColor.white)
-
-        painter = QPainter(image)
-        painter.setFont(font)
-        painter.setPen(QColor(0, 0, 0))
+        height = atlas.height
+        bitmap = np.zeros((height, max(0, total_width)), dtype=bool)
 
-        # 逐字符渲染
+        # 逐字符拷贝缓存的字形（每个字形裁剪在自己的单元格和图像范围内）
         x_offset = 0
         for i, char in enumerate(text):
             char_width = char_widths[i]
 
-            # 绘制字符
-            rect = QRect(x_offset, 0, char_width, height)
-            painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, char)
+            x1 = max(0, x_offset)
+            x2 = min(total_width, x_offset + char_width)
+            if x2 > x1:
+                glyph = atlas.glyph(char, char_width)
+                bitmap[:, x1:x2] |= glyph[:, x1 - x_offset:x2 - x_offset]
 
             x_offset += char_width
             # 添加字间距（最后一个字符不添加）
             if i < len(text) - 1:
                 x_offset += letter_spacing
 
-        painter.end()
-
-        # 转换为位图
-        bitmap = self._image_to_bitmap(image)
-
         return bitmap
 
     def _render_multiline(
@@ -282,30 +474,7 @@ class TextService:
         Returns:
             位图数据
         """
-        width = image.width()
-        height = image.height()
-
-        # 转换为 numpy 数组（使用向量化操作）
-        # 获取图像数据指针
-        ptr = image.constBits()
-        ptr.setsize(height * width * 4)  # ARGB32 格式，每像素 4 字节
-
-        # 转换为 numpy 数组
-        arr = np.frombuffer(ptr, dtype=np.uint8).reshape((height, width, 4))
-
-        # 提取 RGB 通道（跳过 Alpha）
-        # ARGB32 格式：B, G, R, A
-        b = arr[:, :, 0].astype(np.int32)
-        g = arr[:, :, 1].astype(np.int32)
-        r = arr[:, :, 2].astype(np.int32)
-
-        # 计算灰度值（简单平均）
-        gray = (r + g + b) // 3
-
-        # 阈值二值化（128）
-        bitmap = gray < 128
-
-        return bitmap
+        return image_to_bitmap(image)
 
     def get_text_bounds(
         self,
@@ -339,11 +508,6 @@ class TextService:
         else:
             lines = [text]
 
-        # 创建临时图像以测量
-        temp_image = QImage(1, 1, QImage.Format.Format_ARGB32)
-        temp_painter = QPainter(temp_image)
-        temp_painter.setFont(font)
-
         # 计算每行的宽度，取最大值
         max_line_width = 0
         for line in lines:
@@ -357,9 +521,7 @@ class TextService:
             max_line_width = max(max_line_width, line_width)
 
         # 计算总高度
-        line_height = temp_painter.fontMetrics().height()
+        line_height = self._get_atlas(font).height
         total_height = line_height * len(lines) + line_spacing * (len(lines) - 1)
 
-        temp_painter.end()
-
         return (max_line_width, total_height)
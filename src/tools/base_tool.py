@@ -6,6 +6,7 @@ from PyQt6.QtGui import QCursor
 import numpy as np
 
 from ..core.canvas import Canvas
+from ..core.layer import Layer
 
 
 class BaseTool(ABC):
@@ -22,28 +23,35 @@ class BaseTool(ABC):
         self.is_drawing = False
         self.start_pos: Optional[tuple[int, int]] = None
         self.last_pos: Optional[tuple[int, int]] = None
-        self.old_layer_data: Optional[np.ndarray] = None
+        # 正在记录修改前像素的图层（见 Layer.begin_snapshot）
+        self.snapshot_layer: Optional[Layer] = None
 
     def begin_draw(self) -> None:
-        """开始绘制（保存当前图层状态）"""
+        """开始绘制（记录之后修改的像素在修改前的状态）"""
         layer = self.canvas.get_active_layer()
-        if layer and layer.layer_type == "bitmap" and layer.data is not None:
-            self.old_layer_data = layer.data.copy()
+        if layer and layer.layer_type == "bitmap" and layer.has_bitmap:
+            layer.begin_snapshot()
+            self.snapshot_layer = layer
 
-    def end_draw(self) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    def end_draw(self) -> Optional[tuple[np.ndarray, np.ndarray, int, int]]:
         """
-        结束绘制（返回旧数据和新数据用于撤销/重做）
+        结束绘制（返回修改区域的旧数据和新数据用于撤销/重做）
+
+        只包含本次绘制修改过的区域，不复制整个图层
 
         Returns:
-            (old_data, new_data) 或 None
-        """
-        layer = self.canvas.get_active_layer()
-        if layer and layer.layer_type == "bitmap" and layer.data is not None and self.old_layer_data is not None:
-            new_data = layer.data.copy()
-            old_data = self.old_layer_data
-            self.old_layer_data = None
-            return (old_data, new_data)
-        return None
+            (old_data, new_data, x, y) 区域的旧数据、新数据和区域左上角坐标，
+            没有修改时返回 None
+        """
+        layer = self.snapshot_layer
+        self.snapshot_layer = None
+        if layer is None:
+            return None
+        snapshot = layer.end_snapshot()
+        if snapshot is None:
+            return None
+        (x0, y0, x1, y1), old_data = snapshot
+        return (old_data, layer.get_region(x0, y0, x1, y1), x0, y0)
 
     @abstractmethod
     def on_press(self, x: int, y: int, modifiers: Qt.KeyboardModifier) -> None:
@@ -107,16 +115,42 @@ class BaseTool(ABC):
 
     def get_preview_points(self) -> list[tuple[int, int]]:
         """
-        获取预览点（用于实时预览）
+        获取预览点（由 get_preview_mask 转换而来）
 
         Returns:
             预览点坐标列表
         """
-        return []
+        preview = self.get_preview_mask()
+        if preview is None:
+            return []
+        mask, x, y = preview
+        ys, xs = np.nonzero(mask)
+        return list(zip((xs + x).tolist(), (ys + y).tolist()))
+
+    def get_preview_mask(self) -> Optional[tuple[np.ndarray, int, int]]:
+        """
+        获取预览掩码（由视图绘制在画布之上的覆盖层中，不参与图层合成）
+
+        Returns:
+            (mask, x, y) 预览掩码及其左上角在画布上的坐标；没有预览时返回 None
+        """
+        return None
+
+    def get_floating_selection(self) -> Optional[tuple[np.ndarray, int, int, tuple[int, int, int, int]]]:
+        """
+        获取浮动选区（拖动过程中由视图叠加显示，释放时才写入图层）
+
+        Returns:
+            (bitmap, x, y, cleared_rect) 浮动位图、其左上角坐标和需要显示为已清除的
+            原始区域 (x0, y0, x1, y1)；没有浮动选区时返回 None
+        """
+        return None
 
     def reset(self) -> None:
         """重置工具状态"""
         self.is_drawing = False
         self.start_pos = None
         self.last_pos = None
-        self.old_layer_data = None
+        if self.snapshot_layer is not None:
+            self.snapshot_layer.end_snapshot()
+            self.snapshot_layer = None
@@ -1,7 +1,7 @@
 """油漆桶填充工具"""
 from PyQt6.QtCore import Qt
 from .base_tool import BaseTool
-from ..utils.geometry import flood_fill
+from ..utils.geometry import flood_fill_mask, mask_bounds
 
 
 class BucketFillTool(BaseTool):
@@ -15,6 +15,8 @@ class BucketFillTool(BaseTool):
             canvas: 画布对象
         """
         super().__init__(canvas)
+        # 连通性（4 或 8）
+        self.connectivity = 4
 
     def on_press(self, x: int, y: int, modifiers: Qt.KeyboardModifier) -> None:
         """鼠标按下"""
@@ -33,11 +35,14 @@ class BucketFillTool(BaseTool):
             fill_value = False
 
         # 执行泛洪填充
-        points = flood_fill(layer.data, x, y, target_value, fill_value)
+        mask = flood_fill_mask(layer.data, x, y, target_value, fill_value, self.connectivity)
+        rect = mask_bounds(mask)
+        if rect is None:
+            return
 
-        # 应用填充
-        for px, py in points:
-            layer.set_pixel(px, py, fill_value)
+        # 只在填充区域的边界框内一次性写入
+        x0, y0, x1, y1 = rect
+        layer.apply_mask(mask[y0:y1, x0:x1], x0, y0, fill_value)
 
     def on_drag(self, x: int, y: int, modifiers: Qt.KeyboardModifier) -> None:
         """鼠标拖拽（填充工具不需要拖拽）"""
@@ -1,7 +1,8 @@
 """圆形工具"""
 from PyQt6.QtCore import Qt
+import numpy as np
 from .base_tool import BaseTool
-from ..utils.geometry import bresenham_circle, filled_circle
+from ..utils.geometry import circle_outline_indices, filled_circle_mask
 from ..utils.constants import FILL_MODE_OUTLINE, FILL_MODE_FILLED, FILL_MODE_BOTH
 
 
@@ -18,7 +19,7 @@ class CircleTool(BaseTool):
         """
         super().__init__(canvas)
         self.fill_mode = fill_mode
-        self.preview_points = []
+        self.preview_mask = None
 
     def on_press(self, x: int, y: int, modifiers: Qt.KeyboardModifier) -> None:
         """鼠标按下"""
@@ -27,7 +28,7 @@ class CircleTool(BaseTool):
         self.is_drawing = True
         self.start_pos = (x, y)
         self.last_pos = (x, y)
-        self.preview_points = [(x, y)]
+        self.preview_mask = (np.ones((1, 1), dtype=bool), x, y)
 
     def on_drag(self, x: int, y: int, modifiers: Qt.KeyboardModifier) -> None:
         """鼠标拖拽"""
@@ -40,7 +41,7 @@ class CircleTool(BaseTool):
         radius = self._calculate_radius(start_x, start_y, x, y, modifiers)
 
         # 更新预览
-        self.preview_points = self._get_circle_points(start_x, start_y, radius)
+        self.preview_mask = self._get_circle_mask(start_x, start_y, radius)
         self.last_pos = (x, y)
 
     def on_release(self, x: int, y: int, modifiers: Qt.KeyboardModifier) -> None:
@@ -58,14 +59,13 @@ class CircleTool(BaseTool):
         # 计算半径
         radius = self._calculate_radius(start_x, start_y, x, y, modifiers)
 
-        # 绘制圆形
-        points = self._get_circle_points(start_x, start_y, radius)
-        for px, py in points:
-            layer.set_pixel(px, py, True)
+        # 绘制圆形（一次性写入掩码）
+        mask, mask_x, mask_y = self._get_circle_mask(start_x, start_y, radius)
+        layer.apply_mask(mask, mask_x, mask_y, True)
 
         # 重置状态（但不调用 reset()，让 canvas_view 调用 end_draw()）
         self.is_drawing = False
-        self.preview_points = []
+        self.preview_mask = None
 
     def _calculate_radius(self, cx: int, cy: int, x: int, y: int,
                          modifiers: Qt.KeyboardModifier) -> int:
@@ -92,28 +92,27 @@ class CircleTool(BaseTool):
 
         return max(1, radius)
 
-    def _get_circle_points(self, cx: int, cy: int, radius: int) -> list[tuple[int, int]]:
+    def _get_circle_mask(self, cx: int, cy: int, radius: int) -> tuple:
         """
-        获取圆形的所有点
+        获取圆形的掩码
 
         Args:
             cx, cy: 圆心坐标
             radius: 半径
 
         Returns:
-            圆形的所有像素坐标列表
+            (mask, x, y) 边长 2 * radius + 1 的掩码及其左上角坐标
         """
-        if self.fill_mode == FILL_MODE_OUTLINE:
-            return bresenham_circle(cx, cy, radius)
-        elif self.fill_mode == FILL_MODE_FILLED:
-            return filled_circle(cx, cy, radius)
-        elif self.fill_mode == FILL_MODE_BOTH:
-            # 先填充，再绘制轮廓
-            points = filled_circle(cx, cy, radius)
-            points.extend(bresenham_circle(cx, cy, radius))
-            return points
+        if self.fill_mode in (FILL_MODE_FILLED, FILL_MODE_BOTH):
+            mask, mask_x, mask_y = filled_circle_mask(cx, cy, radius)
         else:
-            return bresenham_circle(cx, cy, radius)
+            size = 2 * radius + 1
+            mask, mask_x, mask_y = np.zeros((size, size), dtype=bool), cx - radius, cy - radius
+        if self.fill_mode != FILL_MODE_FILLED:
+            # 轮廓与填充圆的包围盒相同
+            xs, ys = circle_outline_indices(cx, cy, radius)
+            mask[ys - mask_y, xs - mask_x] = True
+        return mask, mask_x, mask_y
 
     def set_fill_mode(self, mode: str) -> None:
         """
@@ -124,11 +123,11 @@ class CircleTool(BaseTool):
         """
         self.fill_mode = mode
 
-    def get_preview_points(self) -> list[tuple[int, int]]:
-        """获取预览点"""
-        return self.preview_points
+    def get_preview_mask(self):
+        """获取预览掩码"""
+        return self.preview_mask
 
     def reset(self) -> None:
         """重置工具状态"""
         super().reset()
-        self.preview_points = []
+        self.preview_mask = None
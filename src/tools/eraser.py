@@ -2,7 +2,7 @@
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QCursor
 from .base_tool import BaseTool
-from ..utils.geometry import bresenham_line
+from ..utils.brush import stroke_mask
 
 
 class EraserTool(BaseTool):
@@ -37,10 +37,7 @@ class EraserTool(BaseTool):
 
         # 从上一个点到当前点擦除
         last_x, last_y = self.last_pos
-        points = bresenham_line(last_x, last_y, x, y)
-
-        for px, py in points:
-            self._erase_point(px, py)
+        self._erase_segment(last_x, last_y, x, y)
 
         self.last_pos = (x, y)
 
@@ -56,18 +53,22 @@ class EraserTool(BaseTool):
         Args:
             x, y: 中心坐标
         """
+        self._erase_segment(x, y, x, y)
+
+    def _erase_segment(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """
+        沿线段盖章擦除（圆形橡皮擦，一次性清除覆盖区域）
+
+        Args:
+            x0, y0: 起点坐标
+            x1, y1: 终点坐标
+        """
         layer = self.canvas.get_active_layer()
         if layer is None or layer.locked:
             return
 
-        # 根据橡皮擦大小擦除
-        radius = self.eraser_size // 2
-
-        for dy in range(-radius, radius + 1):
-            for dx in range(-radius, radius + 1):
-                # 圆形橡皮擦
-                if dx * dx + dy * dy <= radius * radius:
-                    layer.set_pixel(x + dx, y + dy, False)
+        mask, mask_x, mask_y = stroke_mask(x0, y0, x1, y1, self.eraser_size)
+        layer.apply_mask(mask, mask_x, mask_y, False)
 
     def set_eraser_size(self, size: int) -> None:
         """
@@ -1,7 +1,8 @@
 """直线工具"""
 from PyQt6.QtCore import Qt
+import numpy as np
 from .base_tool import BaseTool
-from ..utils.geometry import bresenham_line, snap_to_angle
+from ..utils.geometry import line_indices, indices_to_mask, snap_to_angle
 
 
 class LineTool(BaseTool):
@@ -15,7 +16,7 @@ class LineTool(BaseTool):
             canvas: 画布对象
         """
         super().__init__(canvas)
-        self.preview_points = []
+        self.preview_mask = None
 
     def on_press(self, x: int, y: int, modifiers: Qt.KeyboardModifier) -> None:
         """鼠标按下"""
@@ -24,7 +25,7 @@ class LineTool(BaseTool):
         self.is_drawing = True
         self.start_pos = (x, y)
         self.last_pos = (x, y)
-        self.preview_points = [(x, y)]
+        self.preview_mask = (np.ones((1, 1), dtype=bool), x, y)
 
     def on_drag(self, x: int, y: int, modifiers: Qt.KeyboardModifier) -> None:
         """鼠标拖拽"""
@@ -38,7 +39,7 @@ class LineTool(BaseTool):
             x, y = snap_to_angle(start_x, start_y, x, y)
 
         # 更新预览
-        self.preview_points = bresenham_line(start_x, start_y, x, y)
+        self.preview_mask = indices_to_mask(*line_indices(start_x, start_y, x, y))
         self.last_pos = (x, y)
 
     def on_release(self, x: int, y: int, modifiers: Qt.KeyboardModifier) -> None:
@@ -49,7 +50,7 @@ class LineTool(BaseTool):
         layer = self.canvas.get_active_layer()
         if layer is None or layer.locked:
             self.is_drawing = False
-            self.preview_points = []
+            self.preview_mask = None
             return
 
         start_x, start_y = self.start_pos
@@ -58,20 +59,19 @@ class LineTool(BaseTool):
         if modifiers & Qt.KeyboardModifier.ShiftModifier:
             x, y = snap_to_angle(start_x, start_y, x, y)
 
-        # 绘制直线
-        points = bresenham_line(start_x, start_y, x, y)
-        for px, py in points:
-            layer.set_pixel(px, py, True)
+        # 绘制直线（一次性批量写入）
+        xs, ys = line_indices(start_x, start_y, x, y)
+        layer.set_pixels(xs, ys, True)
 
         # 重置状态（但不调用 reset()，让 canvas_view 调用 end_draw()）
         self.is_drawing = False
-        self.preview_points = []
+        self.preview_mask = None
 
-    def get_preview_points(self) -> list[tuple[int, int]]:
-        """获取预览点"""
-        return self.preview_points
+    def get_preview_mask(self):
+        """获取预览掩码"""
+        return self.preview_mask
 
     def reset(self) -> None:
         """重置工具状态"""
         super().reset()
-        self.preview_points = []
+        self.preview_mask = None
@@ -1,7 +1,7 @@
 """画笔工具"""
 from PyQt6.QtCore import Qt
 from .base_tool import BaseTool
-from ..utils.geometry import bresenham_line
+from ..utils.brush import stroke_mask
 
 
 class PencilTool(BaseTool):
@@ -36,10 +36,7 @@ class PencilTool(BaseTool):
 
         # 从上一个点到当前点绘制直线（实现连续绘制）
         last_x, last_y = self.last_pos
-        points = bresenham_line(last_x, last_y, x, y)
-
-        for px, py in points:
-            self._draw_point(px, py)
+        self._draw_segment(last_x, last_y, x, y)
 
         self.last_pos = (x, y)
 
@@ -55,18 +52,22 @@ class PencilTool(BaseTool):
         Args:
             x, y: 中心坐标
         """
+        self._draw_segment(x, y, x, y)
+
+    def _draw_segment(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """
+        沿线段盖章绘制（圆形笔触，一次性写入覆盖区域）
+
+        Args:
+            x0, y0: 起点坐标
+            x1, y1: 终点坐标
+        """
         layer = self.canvas.get_active_layer()
         if layer is None or layer.locked:
             return
 
-        # 根据笔触大小绘制
-        radius = self.brush_size // 2
-
-        for dy in range(-radius, radius + 1):
-            for dx in range(-radius, radius + 1):
-                # 圆形笔触
-                if dx * dx + dy * dy <= radius * radius:
-                    layer.set_pixel(x + dx, y + dy, True)
+        mask, mask_x, mask_y = stroke_mask(x0, y0, x1, y1, self.brush_size)
+        layer.apply_mask(mask, mask_x, mask_y, True)
 
     def set_brush_size(self, size: int) -> None:
         """
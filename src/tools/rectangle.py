@@ -1,7 +1,8 @@
 """矩形工具"""
 from PyQt6.QtCore import Qt
+import numpy as np
 from .base_tool import BaseTool
-from ..utils.geometry import rectangle_outline, filled_rectangle, make_square
+from ..utils.geometry import make_square, rectangle_outline_mask, filled_rectangle_mask
 from ..utils.constants import FILL_MODE_OUTLINE, FILL_MODE_FILLED, FILL_MODE_BOTH
 
 
@@ -18,7 +19,7 @@ class RectangleTool(BaseTool):
         """
         super().__init__(canvas)
         self.fill_mode = fill_mode
-        self.preview_points = []
+        self.preview_mask = None
 
     def on_press(self, x: int, y: int, modifiers: Qt.KeyboardModifier) -> None:
         """鼠标按下"""
@@ -27,7 +28,7 @@ class RectangleTool(BaseTool):
         self.is_drawing = True
         self.start_pos = (x, y)
         self.last_pos = (x, y)
-        self.preview_points = [(x, y)]
+        self.preview_mask = (np.ones((1, 1), dtype=bool), x, y)
 
     def on_drag(self, x: int, y: int, modifiers: Qt.KeyboardModifier) -> None:
         """鼠标拖拽"""
@@ -41,7 +42,7 @@ class RectangleTool(BaseTool):
             x, y = make_square(start_x, start_y, x, y)
 
         # 更新预览
-        self.preview_points = self._get_rectangle_points(start_x, start_y, x, y)
+        self.preview_mask = self._get_rectangle_mask(start_x, start_y, x, y)
         self.last_pos = (x, y)
 
     def on_release(self, x: int, y: int, modifiers: Qt.KeyboardModifier) -> None:
@@ -60,37 +61,29 @@ class RectangleTool(BaseTool):
         if modifiers & Qt.KeyboardModifier.ShiftModifier:
             x, y = make_square(start_x, start_y, x, y)
 
-        # 绘制矩形
-        points = self._get_rectangle_points(start_x, start_y, x, y)
-        for px, py in points:
-            layer.set_pixel(px, py, True)
+        # 绘制矩形（一次性写入掩码）
+        mask, mask_x, mask_y = self._get_rectangle_mask(start_x, start_y, x, y)
+        layer.apply_mask(mask, mask_x, mask_y, True)
 
         # 重置状态（但不调用 reset()，让 canvas_view 调用 end_draw()）
         self.is_drawing = False
-        self.preview_points = []
+        self.preview_mask = None
 
-    def _get_rectangle_points(self, x0: int, y0: int, x1: int, y1: int) -> list[tuple[int, int]]:
+    def _get_rectangle_mask(self, x0: int, y0: int, x1: int, y1: int) -> tuple:
         """
-        获取矩形的所有点
+        获取矩形的掩码
 
         Args:
             x0, y0: 起点坐标
             x1, y1: 终点坐标
 
         Returns:
-            矩形的所有像素坐标列表
+            (mask, x, y) 掩码及其左上角坐标
         """
-        if self.fill_mode == FILL_MODE_OUTLINE:
-            return rectangle_outline(x0, y0, x1, y1)
-        elif self.fill_mode == FILL_MODE_FILLED:
-            return filled_rectangle(x0, y0, x1, y1)
-        elif self.fill_mode == FILL_MODE_BOTH:
-            # 先填充，再绘制轮廓（确保轮廓可见）
-            points = filled_rectangle(x0, y0, x1, y1)
-            points.extend(rectangle_outline(x0, y0, x1, y1))
-            return points
-        else:
-            return rectangle_outline(x0, y0, x1, y1)
+        if self.fill_mode in (FILL_MODE_FILLED, FILL_MODE_BOTH):
+            # 填充矩形已包含轮廓
+            return filled_rectangle_mask(x0, y0, x1, y1)
+        return rectangle_outline_mask(x0, y0, x1, y1)
 
     def set_fill_mode(self, mode: str) -> None:
         """
@@ -101,11 +94,11 @@ class RectangleTool(BaseTool):
         """
         self.fill_mode = mode
 
-    def get_preview_points(self) -> list[tuple[int, int]]:
-        """获取预览点"""
-        return self.preview_points
+    def get_preview_mask(self):
+        """获取预览掩码"""
+        return self.preview_mask
 
     def reset(self) -> None:
         """重置工具状态"""
         super().reset()
-        self.preview_points = []
+        self.preview_mask = None
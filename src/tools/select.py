@@ -32,6 +32,8 @@ class SelectTool(BaseTool):
         self.move_start_pos: Optional[Tuple[int, int]] = None
         self.original_rect: Optional[Tuple[int, int, int, int]] = None
         self.drag_start_pos: Optional[Tuple[int, int]] = None
+        # 缩放过程中浮动位图的缓存 ((width, height), bitmap)
+        self._floating_cache: Optional[Tuple[Tuple[int, int], np.ndarray]] = None
 
     def on_press(self, x: int, y: int, modifiers: Qt.KeyboardModifier) -> None:
         """
@@ -103,6 +105,7 @@ class SelectTool(BaseTool):
             modifiers: 键盘修饰键
         """
         layer = self.canvas.get_active_layer()
+        self._floating_cache = None
         if not layer:
             self.is_drawing = False
             return
@@ -111,9 +114,9 @@ class SelectTool(BaseTool):
             # 完成移动
             if self.selected_data is not None and self.selection_rect and self.original_rect:
                 # 清除原始位置
-                self._clear_rect(layer.data, self.original_rect)
+                self._clear_rect(layer, self.original_rect)
                 # 应用到新位置
-                self._apply_selection_to_layer(layer.data)
+                self._apply_selection_to_layer(layer)
             self.is_moving = False
             self.move_start_pos = None
             self.original_rect = None
@@ -123,9 +126,9 @@ class SelectTool(BaseTool):
                 # 缩放选区数据
                 scaled_data = self._scale_selection(self.selected_data, self.selection_rect)
                 # 清除原始位置
-                self._clear_rect(layer.data, self.original_rect)
+                self._clear_rect(layer, self.original_rect)
                 # 应用缩放后的数据
-                self._apply_scaled_data(layer.data, scaled_data)
+                self._apply_scaled_data(layer, scaled_data)
                 # 更新选区数据
                 self.selected_data = scaled_data
             self.is_resizing = False
@@ -237,6 +240,33 @@ class SelectTool(BaseTool):
 
             painter.restore()
 
+    def get_floating_selection(self) -> Optional[Tuple[np.ndarray, int, int, Tuple[int, int, int, int]]]:
+        """
+        获取移动/缩放过程中的浮动选区（与释放时写入图层的结果一致）
+
+        Returns:
+            (bitmap, x, y, cleared_rect)，不在移动/缩放时返回 None
+        """
+        if not (self.is_moving or self.is_resizing):
+            return None
+        if self.selected_data is None or not self.selection_rect or not self.original_rect:
+            return None
+
+        x, y, width, height = self.selection_rect
+        if self.is_resizing:
+            # 缩放结果按目标尺寸缓存，只移动时不重新缩放
+            if self._floating_cache is None or self._floating_cache[0] != (width, height):
+                self._floating_cache = ((width, height), self._scale_selection(self.selected_data, self.selection_rect))
+            bitmap = self._floating_cache[1]
+        else:
+            bitmap = self.selected_data
+
+        orig_x, orig_y, orig_width, orig_height = self.original_rect
+        cleared_rect = (orig_x, orig_y, orig_x + orig_width, orig_y + orig_height)
+
+        # 左上角超出图层时从图层边界开始放置（与 _apply_scaled_data 一致）
+        return bitmap, max(0, x), max(0, y), cleared_rect
+
     def clear_selection(self) -> None:
         """清除选区"""
         self.selection_rect = None
@@ -270,7 +300,7 @@ class SelectTool(BaseTool):
             return False
 
         # 清除选区内的像素
-        self._clear_rect(layer.data, self.selection_rect)
+        self._clear_rect(layer, self.selection_rect)
 
         # 清除选区状态
         self.clear_selection()
@@ -301,78 +331,43 @@ class SelectTool(BaseTool):
 
         return layer_data[y1:y2, x1:x2].copy()
 
-    def _clear_rect(self, layer_data: np.ndarray, rect: Tuple[int, int, int, int]) -> None:
+    def _clear_rect(self, layer, rect: Tuple[int, int, int, int]) -> None:
         """
-        清除矩形区域
+        清除矩形区域（同时标记为已修改）
 
         Args:
-            layer_data: 图层数据
+            layer: 图层对象
             rect: 矩形 (x, y, width, height)
         """
         x, y, width, height = rect
-        height_max, width_max = layer_data.shape
-
-        x1 = max(0, x)
-        y1 = max(0, y)
-        x2 = min(width_max, x + width)
-        y2 = min(height_max, y + height)
-
-        layer_data[y1:y2, x1:x2] = False
+        layer.fill_region(x, y, x + width, y + height, False)
 
-    def _apply_selection_to_layer(self, layer_data: np.ndarray) -> None:
+    def _apply_selection_to_layer(self, layer) -> None:
         """
         将选区数据应用到图层
 
         Args:
-            layer_data: 图层数据
+            layer: 图层对象
         """
         if not self.selection_rect or self.selected_data is None:
             return
 
-        x, y, width, height = self.selection_rect
-        sel_height, sel_width = self.selected_data.shape
-        height_max, width_max = layer_data.shape
-
-        # 应用选区数据到新位置
-        x1 = max(0, x)
-        y1 = max(0, y)
-        x2 = min(width_max, x + sel_width)
-        y2 = min(height_max, y + sel_height)
-
-        # 计算实际可以复制的区域
-        copy_width = x2 - x1
-        copy_height = y2 - y1
-
-        if copy_width > 0 and copy_height > 0:
-            layer_data[y1:y2, x1:x2] = self.selected_data[:copy_height, :copy_width]
+        self._apply_scaled_data(layer, self.selected_data)
 
-    def _apply_scaled_data(self, layer_data: np.ndarray, scaled_data: np.ndarray) -> None:
+    def _apply_scaled_data(self, layer, scaled_data: np.ndarray) -> None:
         """
-        将缩放后的数据应用到图层
+        将缩放后的数据应用到图层（超出图层的部分被裁剪，同时标记为已修改）
 
         Args:
-            layer_data: 图层数据
+            layer: 图层对象
             scaled_data: 缩放后的数据
         """
         if not self.selection_rect:
             return
 
-        x, y, width, height = self.selection_rect
-        sel_height, sel_width = scaled_data.shape
-        height_max, width_max = layer_data.shape
-
-        # 应用数据到新位置
-        x1 = max(0, x)
-        y1 = max(0, y)
-        x2 = min(width_max, x + sel_width)
-        y2 = min(height_max, y + sel_height)
-
-        # 计算实际可以复制的区域
-        copy_width = x2 - x1
-        copy_height = y2 - y1
-
-        if copy_width > 0 and copy_height > 0:
-            layer_data[y1:y2, x1:x2] = scaled_data[:copy_height, :copy_width]
+        # 左上角超出图层时从图层边界开始放置
+        x, y, _, _ = self.selection_rect
+        layer.set_region(max(0, x), max(0, y), scaled_data)
 
     def _scale_selection(self, data: np.ndarray, target_rect: Tuple[int, int, int, int]) -> np.ndarray:
         """
@@ -399,22 +394,47 @@ class SelectTool(BaseTool):
             target_width = int(target_width * scale)
             target_height = int(target_height * scale)
 
-        # 最近邻插值
-        result = np.zeros((target_height, target_width), dtype=bool)
-
+        # 最近邻插值：预先计算每行/每列对应的源索引（与逐像素 int(x * scale) 相同）
         scale_x = src_width / target_width
         scale_y = src_height / target_height
 
-        for y in range(target_height):
-            for x in range(target_width):
-                src_x = int(x * scale_x)
-                src_y = int(y * scale_y)
-                # 确保不越界
-                src_x = min(src_x, src_width - 1)
-                src_y = min(src_y, src_height - 1)
-                result[y, x] = data[src_y, src_x]
+        # 确保不越界
+        src_xs = np.minimum((np.arange(target_width) * scale_x).astype(np.int64), src_width - 1)
+        src_ys = np.minimum((np.arange(target_height) * scale_y).astype(np.int64), src_height - 1)
+
+        result = self._resample_axis(data, src_ys, axis=0)
+        result = self._resample_axis(result, src_xs, axis=1)
+        return np.ascontiguousarray(result)
+
+    @staticmethod
+    def _resample_axis(data: np.ndarray, indices: np.ndarray, axis: int) -> np.ndarray:
+        """
+        按源索引数组沿一个轴重采样（整数倍缩小/放大时使用切片/重复）
 
-        return result
+        Args:
+            data: 原始数据
+            indices: 每个目标位置对应的源索引
+            axis: 轴（0=行，1=列）
+
+        Returns:
+            重采样后的数据
+        """
+        src_size = data.shape[axis]
+        target_size = len(indices)
+        positions = np.arange(target_size)
+
+        if src_size % target_size == 0:
+            # 整数倍缩小：索引为等间隔时直接切片
+            factor = src_size // target_size
+            if np.array_equal(indices, positions * factor):
+                return data[::factor] if axis == 0 else data[:, ::factor]
+        elif target_size % src_size == 0:
+            # 整数倍放大：索引为重复序列时直接重复
+            factor = target_size // src_size
+            if np.array_equal(indices, positions // factor):
+                return np.repeat(data, factor, axis=axis)
+
+        return np.take(data, indices, axis=axis)
 
     def _is_point_in_selection(self, x: int, y: int) -> bool:
         """
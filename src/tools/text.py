@@ -408,21 +408,12 @@ class TextTool(BaseTool):
                 if self.text_preview[dy, dx]:
                     layer.set_pixel(px + dx, py + dy, True)
 
-    def get_preview_points(self) -> list[tuple[int, int]]:
-        """获取预览点"""
+    def get_preview_mask(self):
+        """获取预览掩码（文本位图本身）"""
         if self.text_preview is None or self.preview_pos is None:
-            return []
-
-        points = []
+            return None
         px, py = self.preview_pos
-        height, width = self.text_preview.shape
-
-        for dy in range(height):
-            for dx in range(width):
-                if self.text_preview[dy, dx]:
-                    points.append((px + dx, py + dy))
-
-        return points
+        return self.text_preview, px, py
 
     def draw_overlay(self, painter: QPainter, scale: float) -> None:
         """
@@ -1,23 +1,200 @@
 """画布视图组件"""
-from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsPixmapItem, QGraphicsLineItem
-from PyQt6.QtCore import Qt, QPointF, QRectF, pyqtSignal, QLineF
-from PyQt6.QtGui import QPixmap, QImage, QPainter, QPen, QColor, QWheelEvent, QMouseEvent, QBrush, QFont
+from PyQt6.QtWidgets import (
+    QGraphicsView, QGraphicsScene, QGraphicsItem, QStyleOptionGraphicsItem
+)
+from PyQt6.QtCore import Qt, QPointF, QRect, QRectF, pyqtSignal, QLineF, QTimer
+from PyQt6.QtGui import (
+    QPixmap, QImage, QPainter, QPen, QColor, QWheelEvent, QMouseEvent, QBrush, QFont, QTransform
+)
 import numpy as np
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List
 import logging
+import math
+import time
 
 from ..core.canvas import Canvas
 from ..services.text_service import TextService
 from ..services.font_manager import FontManager
-from ..utils.constants import MIN_ZOOM, MAX_ZOOM, ZOOM_STEP, GRID_COLOR
+from ..utils.constants import MIN_ZOOM, MAX_ZOOM, ZOOM_STEP, GRID_COLOR, GRID_MIN_ZOOM, DEFAULT_TARGET_FPS
+from ..utils.geometry import union_rect, clip_rect
 
 logger = logging.getLogger(__name__)
 
+# 位图像素到 RGB32 颜色的查找表：False=白色，True=黑色
+PIXEL_PALETTE = np.array([0xFFFFFFFF, 0xFF000000], dtype=np.uint32)
+
+# 预览覆盖层中预览像素的颜色（预乘 ARGB 不透明黑色）
+PREVIEW_PIXEL = np.uint32(0xFF000000)
+
+# 显示块边长：画布按块渲染和缓存，只渲染视口可见的块
+DISPLAY_TILE_SIZE = 256
+
+# 显示块缓存上限，超出时释放视口（含一圈边距）之外的块
+DISPLAY_TILE_CACHE_LIMIT = 64
+
+
+class CanvasImageItem(QGraphicsItem):
+    """画布图像项，按显示块绘制，只有与暴露区域相交的块才会被渲染"""
+
+    def __init__(self, width: int, height: int, tile_provider: Callable[[int, int], QImage]):
+        """
+        初始化画布图像项
+
+        Args:
+            width: 画布宽度
+            height: 画布高度
+            tile_provider: 显示块获取函数 (tx, ty) -> QImage，块大小为 DISPLAY_TILE_SIZE
+        """
+        super().__init__()
+        self._width = width
+        self._height = height
+        self._tile_provider = tile_provider
+        # 启用 exposedRect，只绘制需要刷新的区域
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption, True)
+
+    def set_size(self, width: int, height: int) -> None:
+        """
+        设置画布尺寸并刷新整个图像项
+
+        Args:
+            width: 画布宽度
+            height: 画布高度
+        """
+        if (width, height) != (self._width, self._height):
+            self.prepareGeometryChange()
+            self._width = width
+            self._height = height
+        self.update()
+
+    def image(self) -> QImage:
+        """
+        获取完整的画布图像（会渲染所有显示块）
+
+        Returns:
+            画布图像
+        """
+        image = QImage(self._width, self._height, QImage.Format.Format_RGB32)
+        painter = QPainter(image)
+        self._draw_tiles(painter, QRect(0, 0, self._width, self._height))
+        painter.end()
+        return image
+
+    def pixmap(self) -> QPixmap:
+        """
+        获取画布图像的 QPixmap 副本
+
+        Returns:
+            QPixmap 对象
+        """
+        return QPixmap.fromImage(self.image())
+
+    def boundingRect(self) -> QRectF:
+        """边界矩形（画布坐标）"""
+        return QRectF(0, 0, self._width, self._height)
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None) -> None:
+        """
+        绘制暴露区域内的显示块
+
+        Args:
+            painter: QPainter 对象
+            option: 绘制选项
+            widget: 目标部件
+        """
+        exposed = option.exposedRect.intersected(self.boundingRect()).toAlignedRect()
+        if not exposed.isEmpty():
+            self._draw_tiles(painter, exposed)
+
+    def _draw_tiles(self, painter: QPainter, rect: QRect) -> None:
+        """
+        绘制与区域相交的显示块
+
+        Args:
+            painter: QPainter 对象
+            rect: 区域（画布坐标）
+        """
+        size = DISPLAY_TILE_SIZE
+        for ty in range(rect.top() // size, rect.bottom() // size + 1):
+            for tx in range(rect.left() // size, rect.right() // size + 1):
+                image = self._tile_provider(tx, ty)
+                tile_rect = QRect(tx * size, ty * size, image.width(), image.height())
+                part = tile_rect.intersected(rect)
+                if not part.isEmpty():
+                    painter.drawImage(QRectF(part), image,
+                                      QRectF(part.translated(-tile_rect.topLeft())))
+
+
+class PreviewOverlayItem(QGraphicsItem):
+    """工具预览覆盖层，叠加在画布图像之上，只显示预览掩码中的黑色像素"""
+
+    def __init__(self):
+        """初始化预览覆盖层"""
+        super().__init__()
+        self._image: Optional[QImage] = None
+        self._source: Optional[tuple] = None
+        self.setZValue(1)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption, True)
+
+    def set_mask(self, mask: Optional[np.ndarray], x: int = 0, y: int = 0) -> None:
+        """
+        设置预览掩码（与上次相同的掩码对象和位置不会重建图像）
+
+        Args:
+            mask: 预览掩码，None 或空掩码时隐藏覆盖层
+            x, y: 掩码左上角在画布上的坐标
+        """
+        if mask is None or mask.size == 0:
+            if self._image is not None:
+                self.prepareGeometryChange()
+                self._image = None
+                self._source = None
+            return
+
+        if self._source is not None and self._source[0] is mask and self._source[1:] == (x, y):
+            return
+
+        # 预乘 ARGB：True=不透明黑色，False=完全透明
+        height, width = mask.shape
+        buffer = np.multiply(np.ascontiguousarray(mask).view(np.uint8), PREVIEW_PIXEL, dtype=np.uint32)
+        image = QImage(buffer.data, width, height, width * 4, QImage.Format.Format_ARGB32_Premultiplied)
+        # 确保数据不被垃圾回收
+        image._array_ref = buffer
+
+        if self._image is None or image.size() != self._image.size():
+            self.prepareGeometryChange()
+        else:
+            self.update()
+        self._image = image
+        self._source = (mask, x, y)
+        self.setPos(x, y)
+
+    def boundingRect(self) -> QRectF:
+        """边界矩形（相对于掩码左上角）"""
+        if self._image is None:
+            return QRectF()
+        return QRectF(0, 0, self._image.width(), self._image.height())
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None) -> None:
+        """
+        绘制暴露区域内的预览
+
+        Args:
+            painter: QPainter 对象
+            option: 绘制选项
+            widget: 目标部件
+        """
+        if self._image is None:
+            return
+        exposed = option.exposedRect.intersected(self.boundingRect()).toAlignedRect()
+        if exposed.isEmpty():
+            return
+        painter.drawImage(QRectF(exposed), self._image, QRectF(exposed))
+
 
 class CanvasView(QGraphicsView):
     """画布视图类，负责显示和交互"""
 
-    draw_completed = pyqtSignal(object, object)  # 绘制完成信号 (old_data, new_data)
+    draw_completed = pyqtSignal(object, object, int, int)  # 绘制完成信号 (old_data, new_data, x, y)
     mouse_moved = pyqtSignal(int, int)  # 鼠标移动信号 (x, y)
     zoom_changed = pyqtSignal(float)  # 缩放变化信号 (zoom_level)
 
@@ -33,11 +210,30 @@ class CanvasView(QGraphicsView):
         self.scene = QGraphicsScene()
         self.setScene(self.scene)
 
-        # 画布图像项
-        self.canvas_item: Optional[QGraphicsPixmapItem] = None
-
-        # 网格线项
-        self.grid_lines: List[QGraphicsLineItem] = []
+        # 画布图像项和叠加在其上的工具预览覆盖层
+        self.canvas_item: Optional[CanvasImageItem] = None
+        self.preview_item = PreviewOverlayItem()
+        self.scene.addItem(self.preview_item)
+
+        # 显示块缓存 {(tx, ty): [RGB32 缓冲区, QImage, 是否有效]}，块按需渲染
+        self._display_tiles: Dict[tuple, list] = {}
+        self._display_size: Optional[tuple] = None
+
+        # 增量重绘状态
+        self._layer_signature: Optional[tuple] = None
+        # 当前浮动选区及上一帧的 (位图区域, 清除区域)
+        self._floating: Optional[tuple] = None
+        self._floating_rects: tuple = (None, None)
+        # 两色调色板：索引 0=白色(False)，1=黑色(True)
+        self._palette = PIXEL_PALETTE
+        self._palette_step = np.uint32((int(PIXEL_PALETTE[1]) - int(PIXEL_PALETTE[0])) & 0xFFFFFFFF)
+
+        # 网格线画笔（cosmetic pen，固定1px宽度）和网格覆盖层缓存
+        self._grid_pen = QPen(QColor(*GRID_COLOR))
+        self._grid_pen.setWidth(0)
+        self._grid_pen.setCosmetic(True)
+        self._grid_cache_key: Optional[tuple] = None
+        self._grid_cache_pixmap: Optional[QPixmap] = None
 
         # 文本渲染服务
         self.font_manager = FontManager()
@@ -60,146 +256,435 @@ class CanvasView(QGraphicsView):
         # 当前工具
         self.current_tool = None
 
+        # 拖拽重绘限帧：每个鼠标事件都交给工具处理，但重绘最多每帧一次
+        self.target_fps = DEFAULT_TARGET_FPS
+        self._last_redraw_time = 0.0
+        self._redraw_timer = QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.timeout.connect(self._flush_redraw)
+
         # 初始化画布
         self.update_canvas()
 
-    def update_canvas(self, show_preview: bool = False) -> None:
+    def update_canvas(self, show_preview: bool = False, incremental: bool = False) -> None:
         """
         更新画布显示
 
         Args:
             show_preview: 是否显示工具预览
+            incremental: 是否只重绘已修改区域（用于绘制过程中的鼠标事件）
         """
-        # 创建合并后的画布数据
-        merged_data = np.zeros((self.canvas.height, self.canvas.width), dtype=bool)
-
-        # 从下到上依次叠加图层
-        for layer in self.canvas.layers:
-            if not layer.visible:
-                continue
-
-            if layer.layer_type == "bitmap" and layer.data is not None:
-                # 位图图层：直接叠加
-                merged_data = np.logical_or(merged_data, layer.data)
-
-            elif layer.layer_type == "text" and layer.text_object:
-                # 文本图层：渲染文本对象
-                text_obj = layer.text_object
-                try:
-                    # 创建字体
-                    font = QFont(text_obj.font_name)
-                    font.setPixelSize(text_obj.font_size)
-
-                    # 如果有自定义字体路径，加载它
-                    if text_obj.custom_font_path:
-                        self.font_manager.load_custom_font(text_obj.custom_font_path)
-
-                    # 渲染文本
-                    text_bitmap = self.text_service.render_text(
-                        text_obj.text,
-                        font,
-                        squeeze_halfwidth=True,
-                        max_width=text_obj.max_width,
-                        letter_spacing=text_obj.letter_spacing,
-                        line_spacing=text_obj.line_spacing
-                    )
-
-                    # 将文本位图叠加到画布上
-                    px, py = text_obj.position
-                    text_h, text_w = text_bitmap.shape
-
-                    # 计算有效区域
-                    x1 = max(0, px)
-                    y1 = max(0, py)
-                    x2 = min(self.canvas.width, px + text_w)
-                    y2 = min(self.canvas.height, py + text_h)
-
-                    # 计算文本位图的有效区域
-                    text_x1 = max(0, -px)
-                    text_y1 = max(0, -py)
-                    text_x2 = text_x1 + (x2 - x1)
-                    text_y2 = text_y1 + (y2 - y1)
-
-                    if x2 > x1 and y2 > y1:
-                        merged_data[y1:y2, x1:x2] = np.logical_or(
-                            merged_data[y1:y2, x1:x2],
-                            text_bitmap[text_y1:text_y2, text_x1:text_x2]
-                        )
-
-                except Exception as e:
-                    logger.error(f"渲染文本对象失败: {e}")
-
-        # 如果有工具预览，叠加预览点
-        if show_preview and self.current_tool:
-            preview_points = self.current_tool.get_preview_points()
-            for x, y in preview_points:
-                if 0 <= x < self.canvas.width and 0 <= y < self.canvas.height:
-                    merged_data[y, x] = True
+        # 本次重绘已包含所有待合并的修改
+        self._redraw_timer.stop()
+        self._last_redraw_time = time.perf_counter()
 
-        # 转换为 QImage（使用向量化操作）
-        height, width = merged_data.shape
+        width, height = self.canvas.width, self.canvas.height
+        signature = self._get_layer_signature()
 
-        # 创建 RGB 数组（使用向量化）
-        # True=黑色(0), False=白色(255)
-        rgb_data = np.where(merged_data, 0, 255).astype(np.uint8)
+        # 画布尺寸或图层结构（顺序、可见性、文本属性）发生变化时必须全量重绘
+        if (not incremental or self._display_size != (width, height) or
+                signature != self._layer_signature):
+            self._render_full(show_preview, signature)
+        else:
+            self._render_incremental(show_preview)
 
-        # 创建 ARGB32 格式的数组
-        # 格式：B, G, R, A
-        image_data = np.zeros((height, width, 4), dtype=np.uint8)
-        image_data[:, :, 0] = rgb_data  # B
-        image_data[:, :, 1] = rgb_data  # G
-        image_data[:, :, 2] = rgb_data  # R
-        image_data[:, :, 3] = 255       # A (不透明)
+        # 形状预览单独绘制在覆盖层上，不参与图层合成
+        self._update_preview(show_preview)
 
-        # 创建 QImage
-        image = QImage(image_data.data, width, height, width * 4, QImage.Format.Format_ARGB32)
+        # 工具覆盖层在 drawForeground 中绘制，随画布一起刷新
+        if self.current_tool and hasattr(self.current_tool, 'draw_overlay'):
+            self.viewport().update()
 
-        # 确保数据不被垃圾回收
-        image._array_ref = image_data
+    def set_target_fps(self, fps: int) -> None:
+        """
+        设置拖拽绘制时的目标重绘帧率
+
+        Args:
+            fps: 每秒最多重绘次数
+        """
+        self.target_fps = max(1, int(fps))
+
+    def _schedule_redraw(self) -> None:
+        """
+        请求一次拖拽预览重绘
+
+        距上次重绘已超过一帧时立即重绘，否则推迟到下一帧，期间的多次请求合并为一次
+        （图层脏区域和预览区域会累积到那次重绘中）
+        """
+        if self._redraw_timer.isActive():
+            return
+        remaining = 1.0 / self.target_fps - (time.perf_counter() - self._last_redraw_time)
+        if remaining <= 0:
+            self._flush_redraw()
+        else:
+            self._redraw_timer.start(math.ceil(remaining * 1000))
+
+    def _flush_redraw(self) -> None:
+        """立即执行待合并的拖拽预览重绘"""
+        self.update_canvas(show_preview=True, incremental=True)
+
+    def _render_incremental(self, show_preview: bool) -> None:
+        """
+        增量重绘已修改的区域
+
+        Args:
+            show_preview: 是否显示工具预览
+        """
+        width, height = self.canvas.width, self.canvas.height
+
+        # 增量重绘：图层修改区域
+        dirty_rect = self.canvas.take_dirty_rect()
+
+        # 浮动选区：只重绘上一帧和当前帧的位图区域，清除区域只在开始/结束时重绘
+        floating = self._get_floating_selection(show_preview)
+        floating_rects = self._get_floating_rects(floating)
+        previous_rects = self._floating_rects
+        dirty_rect = union_rect(dirty_rect, previous_rects[0])
+        dirty_rect = union_rect(dirty_rect, floating_rects[0])
+        if floating_rects[1] != previous_rects[1]:
+            dirty_rect = union_rect(dirty_rect, previous_rects[1])
+            dirty_rect = union_rect(dirty_rect, floating_rects[1])
+        self._floating = floating
+        self._floating_rects = floating_rects
+
+        dirty_rect = clip_rect(dirty_rect, width, height)
+        if dirty_rect is not None:
+            self._render_region(dirty_rect)
+
+    def _render_full(self, show_preview: bool, signature: tuple) -> None:
+        """
+        全量合成并重绘整个画布
+
+        Args:
+            show_preview: 是否显示工具预览
+            signature: 当前图层结构签名
+        """
+        width, height = self.canvas.width, self.canvas.height
+
+        # 全量重绘覆盖所有已修改区域
+        self.canvas.take_dirty_rect()
+        self._layer_signature = signature
+
+        # 显示块改为按需重新渲染；尺寸不变时复用已分配的块缓冲区
+        if self._display_size != (width, height):
+            self._display_tiles.clear()
+            self._display_size = (width, height)
+        else:
+            for entry in self._display_tiles.values():
+                entry[2] = False
+
+        self._floating = self._get_floating_selection(show_preview)
+        self._floating_rects = self._get_floating_rects(self._floating)
 
-        # 更新场景
-        pixmap = QPixmap.fromImage(image)
         if self.canvas_item is None:
-            self.canvas_item = self.scene.addPixmap(pixmap)
+            self.canvas_item = CanvasImageItem(width, height, self._get_display_tile)
+            self.scene.addItem(self.canvas_item)
         else:
-            self.canvas_item.setPixmap(pixmap)
+            self.canvas_item.set_size(width, height)
 
         # 设置场景矩形（比画布大，以便平移）
         margin = max(width, height) * 2  # 留出足够的边距
         self.scene.setSceneRect(-margin, -margin, width + margin * 2, height + margin * 2)
 
-        # 更新网格线
-        self._update_grid_lines()
+    def _render_region(self, rect: tuple) -> None:
+        """
+        重新渲染区域内已缓存的显示块（未缓存的块在绘制时按需渲染）
+
+        Args:
+            rect: 区域 (x0, y0, x1, y1)
+        """
+        x0, y0, x1, y1 = rect
+        size = DISPLAY_TILE_SIZE
+        for ty in range(y0 // size, (y1 - 1) // size + 1):
+            for tx in range(x0 // size, (x1 - 1) // size + 1):
+                entry = self._display_tiles.get((tx, ty))
+                if entry is not None and entry[2]:
+                    self._write_tile_region(entry, tx, ty, (
+                        max(x0, tx * size), max(y0, ty * size),
+                        min(x1, (tx + 1) * size), min(y1, (ty + 1) * size)
+                    ))
+
+        # 只刷新修改的区域
+        self.canvas_item.update(QRectF(x0, y0, x1 - x0, y1 - y0))
+
+    def _get_display_tile(self, tx: int, ty: int) -> QImage:
+        """
+        获取显示块图像，未缓存或已失效时先渲染
+
+        Args:
+            tx, ty: 块索引
 
-    def _update_grid_lines(self) -> None:
-        """更新网格线显示"""
-        # 清除旧的网格线
-        for line in self.grid_lines:
-            self.scene.removeItem(line)
-        self.grid_lines.clear()
+        Returns:
+            显示块图像（RGB32，边缘块按画布边界裁剪）
+        """
+        entry = self._display_tiles.get((tx, ty))
+        if entry is None:
+            self._evict_display_tiles()
+            size = DISPLAY_TILE_SIZE
+            width, height = self._display_size
+            tile_w = min(size, width - tx * size)
+            tile_h = min(size, height - ty * size)
+
+            # 持久 RGB32 缓冲区（每像素一个 0xFFRRGGBB），增量重绘时原地更新
+            buffer = np.empty((tile_h, tile_w), dtype=np.uint32)
+            image = QImage(buffer.data, tile_w, tile_h, tile_w * 4, QImage.Format.Format_RGB32)
+            # 确保数据不被垃圾回收
+            image._array_ref = buffer
+            entry = [buffer, image, False]
+            self._display_tiles[(tx, ty)] = entry
+
+        if not entry[2]:
+            x0, y0 = tx * DISPLAY_TILE_SIZE, ty * DISPLAY_TILE_SIZE
+            tile_h, tile_w = entry[0].shape
+            self._write_tile_region(entry, tx, ty, (x0, y0, x0 + tile_w, y0 + tile_h))
+            entry[2] = True
+        return entry[1]
+
+    def _write_tile_region(self, entry: list, tx: int, ty: int, rect: tuple) -> None:
+        """
+        合成区域并写入显示块的缓冲区
 
-        # 如果网格不可见，直接返回
-        if not self.canvas.grid_visible:
+        Args:
+            entry: 显示块缓存项
+            tx, ty: 块索引
+            rect: 区域 (x0, y0, x1, y1)，需在块内
+        """
+        x0, y0, x1, y1 = rect
+        merged_data = self._composite_region(x0, y0, x1, y1, self._floating)
+
+        # 按调色板直接写入缓冲区：base + index * step（uint32 按模运算），避免中间数组
+        left, top = tx * DISPLAY_TILE_SIZE, ty * DISPLAY_TILE_SIZE
+        target = entry[0][y0 - top:y1 - top, x0 - left:x1 - left]
+        np.multiply(merged_data.view(np.uint8), self._palette_step, out=target, dtype=np.uint32)
+        target += self._palette[0]
+
+    def _evict_display_tiles(self) -> None:
+        """缓存超出上限时，释放视口（含一圈边距）之外的显示块"""
+        if len(self._display_tiles) < DISPLAY_TILE_CACHE_LIMIT:
             return
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        size = DISPLAY_TILE_SIZE
+        tx0 = int(visible.left()) // size - 1
+        ty0 = int(visible.top()) // size - 1
+        tx1 = int(visible.right()) // size + 1
+        ty1 = int(visible.bottom()) // size + 1
+        for key in [key for key in self._display_tiles
+                    if not (tx0 <= key[0] <= tx1 and ty0 <= key[1] <= ty1)]:
+            del self._display_tiles[key]
+
+    def _composite_region(self, x0: int, y0: int, x1: int, y1: int,
+                          floating: Optional[tuple] = None) -> np.ndarray:
+        """
+        合成所有可见图层在指定区域内的内容
+
+        Args:
+            x0, y0: 左上角坐标
+            x1, y1: 右下角坐标（不包含）
+            floating: 浮动选区 (bitmap, x, y, cleared_rect)，叠加到活动图层上
+
+        Returns:
+            区域内合并后的位图数据 (y1 - y0, x1 - x0)
+        """
+        # 活动图层之下/之上的合成由画布缓存，合成和活动图层都只读取区域内的数据
+        merged_data = self.canvas.get_composite_region(x0, y0, x1, y1, self._get_text_bitmap)
+        active_region = self.canvas.get_active_region(x0, y0, x1, y1, self._get_text_bitmap)
+        if active_region is not None:
+            if floating is not None:
+                active_region = self._apply_floating(active_region, x0, y0, floating)
+            merged_data |= active_region
+
+        return merged_data
+
+    @staticmethod
+    def _apply_floating(active_region: np.ndarray, x0: int, y0: int, floating: tuple) -> np.ndarray:
+        """
+        在活动图层的区域副本上清除原始选区并覆盖浮动位图（不修改图层）
+
+        Args:
+            active_region: 活动图层在区域内的数据
+            x0, y0: 区域左上角坐标
+            floating: 浮动选区 (bitmap, x, y, cleared_rect)
+
+        Returns:
+            叠加浮动选区后的区域数据
+        """
+        bitmap, fx, fy, cleared_rect = floating
+        region_h, region_w = active_region.shape
+        result = active_region.copy()
+
+        # 原始选区显示为已清除
+        clear = clip_rect((cleared_rect[0] - x0, cleared_rect[1] - y0,
+                           cleared_rect[2] - x0, cleared_rect[3] - y0), region_w, region_h)
+        if clear is not None:
+            cx0, cy0, cx1, cy1 = clear
+            result[cy0:cy1, cx0:cx1] = False
+
+        # 浮动位图覆盖在新位置
+        bitmap_h, bitmap_w = bitmap.shape
+        paste = clip_rect((fx - x0, fy - y0, fx - x0 + bitmap_w, fy - y0 + bitmap_h), region_w, region_h)
+        if paste is not None:
+            px0, py0, px1, py1 = paste
+            result[py0:py1, px0:px1] = bitmap[py0 + y0 - fy:py1 + y0 - fy, px0 + x0 - fx:px1 + x0 - fx]
+
+        return result
+
+    def _get_floating_selection(self, show_preview: bool) -> Optional[tuple]:
+        """
+        获取当前工具的浮动选区
+
+        Args:
+            show_preview: 是否显示工具预览
+
+        Returns:
+            (bitmap, x, y, cleared_rect)，没有时返回 None
+        """
+        if show_preview and self.current_tool:
+            return self.current_tool.get_floating_selection()
+        return None
 
-        # 创建网格线画笔（cosmetic pen，固定1px宽度）
-        pen = QPen(QColor(*GRID_COLOR))
-        pen.setWidth(0)  # 0 表示 cosmetic pen，固定1px宽度
-        pen.setCosmetic(True)  # 确保是 cosmetic pen
-
-        # 绘制垂直线
-        for x in range(self.canvas.width + 1):
-            line = QGraphicsLineItem(x, 0, x, self.canvas.height)
-            line.setPen(pen)
-            self.scene.addItem(line)
-            self.grid_lines.append(line)
-
-        # 绘制水平线
-        for y in range(self.canvas.height + 1):
-            line = QGraphicsLineItem(0, y, self.canvas.width, y)
-            line.setPen(pen)
-            self.scene.addItem(line)
-            self.grid_lines.append(line)
+    @staticmethod
+    def _get_floating_rects(floating: Optional[tuple]) -> tuple:
+        """
+        计算浮动选区的位图区域和清除区域
+
+        Args:
+            floating: 浮动选区 (bitmap, x, y, cleared_rect)
+
+        Returns:
+            (bitmap_rect, cleared_rect)，没有浮动选区时为 (None, None)
+        """
+        if floating is None:
+            return (None, None)
+        bitmap, x, y, cleared_rect = floating
+        height, width = bitmap.shape
+        return ((x, y, x + width, y + height), cleared_rect)
+
+    def _get_text_bitmap(self, layer) -> Optional[np.ndarray]:
+        """
+        获取文本图层渲染后的位图（由文本服务缓存）
+
+        Args:
+            layer: 文本图层
+
+        Returns:
+            文本位图，渲染失败时返回 None
+        """
+        try:
+            return self.text_service.render_text_object(layer.text_object)
+        except Exception as e:
+            logger.error(f"渲染文本对象失败: {e}")
+            return None
+
+    def _get_layer_signature(self) -> tuple:
+        """
+        获取图层结构签名（图层顺序、类型、可见性和文本属性）
+
+        Returns:
+            签名元组，签名变化时需要全量重绘
+        """
+        return tuple(
+            (id(layer), layer.layer_type, layer.visible,
+             layer.text_object.cache_key() if layer.text_object else None)
+            for layer in self.canvas.layers
+        )
+
+    def _update_preview(self, show_preview: bool) -> None:
+        """
+        更新工具预览覆盖层（裁剪到画布范围内）
+
+        Args:
+            show_preview: 是否显示工具预览
+        """
+        preview = None
+        if show_preview and self.current_tool:
+            preview = self.current_tool.get_preview_mask()
+        if preview is None:
+            self.preview_item.set_mask(None)
+            return
+
+        mask, x, y = preview
+        height, width = mask.shape
+        visible = clip_rect((x, y, x + width, y + height), self.canvas.width, self.canvas.height)
+        if visible is None:
+            self.preview_item.set_mask(None)
+            return
+        x0, y0, x1, y1 = visible
+        if (x0, y0, x1, y1) != (x, y, x + width, y + height):
+            mask = mask[y0 - y:y1 - y, x0 - x:x1 - x]
+        self.preview_item.set_mask(mask, x0, y0)
+
+    def _get_grid_lines(self, rect: QRectF) -> List[QLineF]:
+        """
+        获取与可见区域相交的网格线
+
+        Args:
+            rect: 可见的场景区域
+
+        Returns:
+            网格线列表（线段只延伸到可见范围边缘）
+        """
+        width, height = self.canvas.width, self.canvas.height
+        x0 = max(0, int(np.floor(rect.left())))
+        x1 = min(width, int(np.ceil(rect.right())))
+        y0 = max(0, int(np.floor(rect.top())))
+        y1 = min(height, int(np.ceil(rect.bottom())))
+        if x0 > x1 or y0 > y1:
+            return []
+
+        lines = [QLineF(x, y0, x, y1) for x in range(x0, x1 + 1)]
+        lines.extend(QLineF(x0, y, x1, y) for y in range(y0, y1 + 1))
+        return lines
+
+    def _get_grid_pixmap(self, transform: QTransform) -> QPixmap:
+        """
+        获取整个视口的网格覆盖层
+
+        覆盖层按画布尺寸、视图变换和视口尺寸缓存，绘制过程中视图不变时直接复用，
+        只有平移、缩放或画布尺寸变化时才重新生成
+
+        Args:
+            transform: 场景坐标到视口坐标的变换
+
+        Returns:
+            视口大小的透明网格图
+        """
+        viewport = self.viewport()
+        ratio = viewport.devicePixelRatioF()
+        key = (self.canvas.width, self.canvas.height, viewport.width(), viewport.height(), ratio,
+               transform.m11(), transform.m22(), transform.m31(), transform.m32())
+        if key != self._grid_cache_key:
+            pixmap = QPixmap(int(viewport.width() * ratio), int(viewport.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+
+            # 一次 drawLines 批量绘制所有可见网格线
+            visible = self.mapToScene(viewport.rect()).boundingRect()
+            lines = self._get_grid_lines(visible)
+            if lines:
+                painter = QPainter(pixmap)
+                painter.setTransform(transform)
+                painter.setPen(self._grid_pen)
+                painter.drawLines(lines)
+                painter.end()
+
+            self._grid_cache_key = key
+            self._grid_cache_pixmap = pixmap
+        return self._grid_cache_pixmap
+
+    def _draw_grid(self, painter: QPainter) -> None:
+        """
+        绘制网格线覆盖层（缩放级别低于 GRID_MIN_ZOOM 时自动隐藏）
+
+        Args:
+            painter: 场景坐标下的 QPainter 对象
+        """
+        if not self.canvas.grid_visible or self.zoom_level < GRID_MIN_ZOOM:
+            return
+        pixmap = self._get_grid_pixmap(painter.worldTransform())
+        painter.save()
+        painter.resetTransform()
+        painter.drawPixmap(0, 0, pixmap)
+        painter.restore()
 
     def wheelEvent(self, event: QWheelEvent) -> None:
         """
@@ -246,7 +731,7 @@ class CanvasView(QGraphicsView):
             scene_pos = self.mapToScene(event.pos())
             x, y = self.scene_to_canvas(scene_pos)
             self.current_tool.on_press(x, y, event.modifiers())
-            self.update_canvas(show_preview=True)
+            self.update_canvas(show_preview=True, incremental=True)
             event.accept()
         else:
             super().mousePressEvent(event)
@@ -295,9 +780,9 @@ class CanvasView(QGraphicsView):
             )
             event.accept()
         elif self.current_tool and self.current_tool.is_drawing:
-            # 工具拖拽
+            # 工具拖拽：每个事件都更新工具状态，重绘按帧率合并
             self.current_tool.on_drag(x, y, event.modifiers())
-            self.update_canvas(show_preview=True)
+            self._schedule_redraw()
             event.accept()
         else:
             super().mouseMoveEvent(event)
@@ -322,15 +807,14 @@ class CanvasView(QGraphicsView):
             # 获取绘制数据用于撤销/重做
             draw_data = self.current_tool.end_draw()
             if draw_data:
-                old_data, new_data = draw_data
-                self.draw_completed.emit(old_data, new_data)
+                self.draw_completed.emit(*draw_data)
 
             # 对于文本工具，如果还在编辑状态，保持预览显示
             from ..tools.text import TextTool
             if isinstance(self.current_tool, TextTool) and self.current_tool.is_editing:
-                self.update_canvas(show_preview=True)
+                self.update_canvas(show_preview=True, incremental=True)
             else:
-                self.update_canvas(show_preview=False)
+                self.update_canvas(show_preview=False, incremental=True)
             event.accept()
         else:
             super().mouseReleaseEvent(event)
@@ -338,7 +822,8 @@ class CanvasView(QGraphicsView):
     def toggle_grid(self) -> None:
         """切换网格线显示"""
         self.canvas.grid_visible = not self.canvas.grid_visible
-        self.update_canvas()
+        # 网格在 drawForeground 中绘制，只需重绘视口
+        self.viewport().update()
 
     def scene_to_canvas(self, scene_pos: QPointF) -> tuple[int, int]:
         """
@@ -389,12 +874,14 @@ class CanvasView(QGraphicsView):
         self.current_tool = tool
         if tool:
             self.setCursor(tool.get_cursor())
+        # 刷新上一个/当前工具的覆盖层
+        self.viewport().update()
         # 确保鼠标跟踪始终启用
         self.setMouseTracking(True)
 
     def drawForeground(self, painter: QPainter, rect: QRectF) -> None:
         """
-        绘制前景层（用于选择工具的覆盖层）
+        绘制前景层（网格线和选择工具的覆盖层）
 
         Args:
             painter: QPainter 对象
@@ -402,6 +889,9 @@ class CanvasView(QGraphicsView):
         """
         super().drawForeground(painter, rect)
 
+        # 网格线
+        self._draw_grid(painter)
+
         # 如果当前工具有 draw_overlay 方法，调用它
         if self.current_tool and hasattr(self.current_tool, 'draw_overlay'):
             # 保存画笔状态
@@ -410,6 +900,3 @@ class CanvasView(QGraphicsView):
             self.current_tool.draw_overlay(painter, self.zoom_level)
             # 恢复画笔状态
             painter.restore()
-
-        # 触发场景更新
-        self.scene.update()
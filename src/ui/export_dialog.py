@@ -12,6 +12,7 @@ from pathlib import Path
 from ..core.canvas import Canvas
 from ..services.export_service import ExportService
 from ..services.preview_service import PreviewService
+from ..utils.bit_operations import pack_rows
 
 
 class ExportDialog(QDialog):
@@ -136,11 +137,13 @@ class ExportDialog(QDialog):
         )
 
         # 转换为图像
+        # Format_Mono 为 MSB first 的 1 位图像，索引 0 为黑色，直接按行打包写入
         image = QImage(width, height, QImage.Format.Format_Mono)
-        for y in range(height):
-            for x in range(width):
-                color = 0 if preview_data[y, x] else 1
-                image.setPixel(x, y, color)
+        ptr = image.bits()
+        ptr.setsize(image.sizeInBytes())
+        image_bits = np.frombuffer(ptr, dtype=np.uint8).reshape((height, image.bytesPerLine()))
+        packed = pack_rows(~preview_data, msb_first=True)
+        image_bits[:, :packed.shape[1]] = packed
 
         # 显示预览
         pixmap = QPixmap.fromImage(image)
@@ -187,9 +190,6 @@ class ExportDialog(QDialog):
         if not file_path:
             return
 
-        # 获取合并后的图层数据
-        data = self.canvas.merge_visible_layers()
-
         # 获取导出参数
         scan_mode = self.scan_mode_combo.currentData()
         msb_first = self.bit_order_combo.currentData()
@@ -198,6 +198,7 @@ class ExportDialog(QDialog):
         try:
             if format_type == "c_array":
                 # 导出为 C Array
+                data = self.canvas.merge_visible_layers()
                 array_name = Path(file_path).stem.replace("-", "_").replace(" ", "_")
                 c_code = ExportService.export_to_c_array(
                     data, array_name, scan_mode, msb_first, invert
@@ -207,32 +208,21 @@ class ExportDialog(QDialog):
 
             elif format_type == "binary":
                 # 导出为 Binary
-                byte_data = ExportService.export_to_binary(
-                    data, scan_mode, msb_first, invert
-                )
+                if scan_mode == "horizontal":
+                    # 水平扫描直接使用按行打包的合并结果
+                    byte_data = ExportService.horizontal_scan_packed(
+                        self.canvas.merge_visible_layers_packed(), self.canvas.width, msb_first, invert
+                    )
+                else:
+                    byte_data = ExportService.export_to_binary(
+                        self.canvas.merge_visible_layers(), scan_mode, msb_first, invert
+                    )
                 with open(file_path, "wb") as f:
                     f.write(byte_data)
 
             else:  # png
-                # 导出为 PNG（使用向量化操作提升性能）
-                height, width = data.shape
-
-                # 处理反转
-                export_data = ~data if invert else data
-
-                # 转换为 RGB 数组（True=黑色, False=白色）
-                rgb_data = np.where(export_data, 0, 255).astype(np.uint8)
-
-                # 创建 RGB 图像
-                image_data = np.zeros((height, width, 3), dtype=np.uint8)
-                image_data[:, :, 0] = rgb_data  # R
-                image_data[:, :, 1] = rgb_data  # G
-                image_data[:, :, 2] = rgb_data  # B
-
-                # 创建 QImage
-                image = QImage(image_data.data, width, height, width * 3, QImage.Format.Format_RGB888)
-                image._array_ref = image_data  # 防止垃圾回收
-                image.save(file_path)
+                # 导出为 PNG
+                ExportService.export_to_png(self.canvas.merge_visible_layers(), file_path, invert)
 
             self.accept()
 
@@ -1,9 +1,11 @@
 """主窗口"""
+import os
+
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QMenuBar, QMenu, QStatusBar, QLabel
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, QStandardPaths
 from PyQt6.QtGui import QAction, QKeySequence
 
 from ..core.canvas import Canvas
@@ -20,6 +22,7 @@ from .toolbar import Toolbar
 from .property_panel import PropertyPanel
 from .layer_panel import LayerPanel
 from .export_dialog import ExportDialog
+from ..services.autosave_service import AutosaveService
 from ..tools.pencil import PencilTool
 from ..tools.eraser import EraserTool
 from ..tools.line import LineTool
@@ -49,13 +52,25 @@ class MainWindow(QMainWindow):
         self.text_service = TextService(self.font_manager)
 
         # 创建画布
-        self.canvas = Canvas(DEFAULT_CANVAS_WIDTH, DEFAULT_CANVAS_HEIGHT)
+        self.canvas = Canvas(DEFAULT_CANVAS_WIDTH, DEFAULT_CANVAS_HEIGHT, layer_storage="auto")
 
         # 创建项目管理器
         self.project = Project(self.canvas)
 
         # 创建历史记录管理器
-        self.history = History(max_size=50)
+        self.history = History(
+            max_size=50,
+            memory_budget=self.config.get_history_memory_budget() * 1024 * 1024
+        )
+
+        # 创建自动保存服务（恢复文件保存在应用数据目录，后台线程写入）
+        self.autosave = AutosaveService(os.path.join(
+            QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppLocalDataLocation),
+            "recovery"
+        ))
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.timeout.connect(self._on_autosave)
+        self.set_autosave_interval(self.config.get_autosave_interval())
 
         # 创建 UI（需要在创建工具之前创建图层面板）
         self._create_menu_bar()
@@ -241,6 +256,7 @@ class MainWindow(QMainWindow):
 
         # 画布视图
         self.canvas_view = CanvasView(self.canvas)
+        self.canvas_view.set_target_fps(self.config.get_target_fps())
         layout.addWidget(self.canvas_view, stretch=1)
 
     def _create_status_bar(self) -> None:
@@ -316,10 +332,12 @@ class MainWindow(QMainWindow):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             width, height = dialog.get_size()
 
-            # 创建新画布
-            self.canvas = Canvas(width, height)
+            # 创建新画布，丢弃旧项目并关闭它的文件（旧图层不再使用，不需要加载）
+            self.project.close_file(load_pending=False)
+            self.canvas = Canvas(width, height, layer_storage="auto")
             self.project = Project(self.canvas)
             self.history.clear()
+            self.autosave.clear()
 
             # 更新工具
             self._create_tools()
@@ -360,36 +378,94 @@ class MainWindow(QMainWindow):
         # 选择文件
         file_path, _ = QFileDialog.getOpenFileName(
             self, "打开项目", "",
-            "MonoPixel Project (*.mpx);;All Files (*)"
+            "MonoPixel Project (*.mpx *.mpxb);;All Files (*)"
         )
 
         if not file_path:
             return
 
         # 加载项目
-        if self.project.load(file_path):
-            # 清空历史记录
-            self.history.clear()
+        if self.project.load(file_path, lazy=True):
+            self.autosave.clear()
+            self._refresh_after_load()
+            self.status_message_label.setText(f"已打开项目: {self.project.get_file_name()}")
+        else:
+            QMessageBox.critical(self, "错误", "打开项目失败！")
 
-            # 更新工具
-            self._create_tools()
-            self._set_tool(TOOL_PENCIL)
+    def _refresh_after_load(self) -> None:
+        """加载或恢复项目后重置历史记录、工具和界面"""
+        # 清空历史记录
+        self.history.clear()
 
-            # 更新 UI
-            self.canvas_view.canvas = self.canvas
-            self.canvas_view.update_canvas()
-            self.layer_panel.canvas = self.canvas
-            self.layer_panel.refresh_layers()
-            self.update_status_bar()
+        # 更新工具
+        self._create_tools()
+        self._set_tool(TOOL_PENCIL)
 
-            # 自动适应窗口
-            self.canvas_view.fit_in_view()
+        # 更新 UI
+        self.canvas_view.canvas = self.canvas
+        self.canvas_view.update_canvas()
+        self.layer_panel.canvas = self.canvas
+        self.layer_panel.refresh_layers()
+        self.update_status_bar()
 
-            # 更新窗口标题
-            self.setWindowTitle(f"MonoPixel Editor - {self.project.get_file_name()}")
-            self.status_message_label.setText(f"已打开项目: {self.project.get_file_name()}")
+        # 自动适应窗口
+        self.canvas_view.fit_in_view()
+
+        # 更新窗口标题
+        self.setWindowTitle(f"MonoPixel Editor - {self.project.get_file_name()}")
+
+        self._report_load_errors()
+
+    def _report_load_errors(self) -> None:
+        """提示加载时被跳过或解码失败的图层（延迟加载的图层在第一次显示时解码）"""
+        if not self.project.load_errors:
+            return
+        from PyQt6.QtWidgets import QMessageBox
+
+        errors = "\n".join(self.project.load_errors)
+        self.project.load_errors.clear()
+        QMessageBox.warning(self, "图层加载失败", f"以下图层的数据已损坏，已显示为空白：\n{errors}")
+
+    def set_autosave_interval(self, seconds: int) -> None:
+        """
+        设置自动保存间隔
+
+        Args:
+            seconds: 间隔（秒），0 表示关闭自动保存
+        """
+        if seconds > 0:
+            self.autosave_timer.start(seconds * 1000)
         else:
-            QMessageBox.critical(self, "错误", "打开项目失败！")
+            self.autosave_timer.stop()
+
+    def _on_autosave(self) -> None:
+        """自动保存定时器触发：项目有未保存的修改时在后台写入恢复文件"""
+        if self.project.is_modified():
+            self.autosave.save_async(self.project)
+
+    def _check_recovery(self) -> None:
+        """启动时检查上次未正常退出留下的恢复文件，询问是否恢复"""
+        from PyQt6.QtWidgets import QMessageBox
+
+        info = self.autosave.get_recovery_info()
+        if info is None:
+            return
+
+        name = os.path.basename(info.get("file_path") or "") or "未命名"
+        reply = QMessageBox.question(
+            self, "恢复项目",
+            f"检测到上次未正常退出时自动保存的项目（{name}），是否恢复？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+
+        if reply == QMessageBox.StandardButton.Yes:
+            if self.autosave.restore(self.project):
+                self._refresh_after_load()
+                self.status_message_label.setText(f"已恢复项目: {self.project.get_file_name()}")
+                return
+            QMessageBox.critical(self, "错误", "恢复项目失败！")
+
+        self.autosave.clear()
 
     def _on_save(self) -> bool:
         """
@@ -403,6 +479,7 @@ class MainWindow(QMainWindow):
             if self.project.save():
                 self.setWindowTitle(f"MonoPixel Editor - {self.project.get_file_name()}")
                 self.status_message_label.setText(f"已保存: {self.project.get_file_name()}")
+                self.autosave.clear()
                 return True
             else:
                 from PyQt6.QtWidgets import QMessageBox
@@ -424,7 +501,7 @@ class MainWindow(QMainWindow):
         # 选择保存路径
         file_path, _ = QFileDialog.getSaveFileName(
             self, "另存为", "untitled.mpx",
-            "MonoPixel Project (*.mpx);;All Files (*)"
+            "MonoPixel Project (*.mpx);;MonoPixel Binary Project (*.mpxb);;All Files (*)"
         )
 
         if not file_path:
@@ -434,6 +511,7 @@ class MainWindow(QMainWindow):
         if self.project.save(file_path):
             self.setWindowTitle(f"MonoPixel Editor - {self.project.get_file_name()}")
             self.status_message_label.setText(f"已保存: {self.project.get_file_name()}")
+            self.autosave.clear()
             return True
         else:
             QMessageBox.critical(self, "错误", "保存项目失败！")
@@ -538,47 +616,15 @@ class MainWindow(QMainWindow):
 
         try:
             # 渲染文本对象为位图
-            from PyQt6.QtGui import QFont
             text_obj = layer.text_object
-
-            font = QFont(text_obj.font_name)
-            font.setPixelSize(text_obj.font_size)
-
-            # 如果有自定义字体路径，加载它
-            if text_obj.custom_font_path:
-                self.font_manager.load_custom_font(text_obj.custom_font_path)
-
-            # 渲染文本
-            text_bitmap = self.text_service.render_text(
-                text_obj.text,
-                font,
-                squeeze_halfwidth=True,
-                max_width=text_obj.max_width,
-                letter_spacing=text_obj.letter_spacing,
-                line_spacing=text_obj.line_spacing
-            )
+            text_bitmap = self.text_service.render_text_object(text_obj)
 
             # 创建新的位图图层
             new_layer = self.canvas.add_layer(f"{layer.name} (栅格化)", layer_type="bitmap")
 
-            # 将文本位图复制到新图层
+            # 将文本位图复制到新图层（超出画布的部分被裁剪）
             px, py = text_obj.position
-            text_h, text_w = text_bitmap.shape
-
-            # 计算有效区域
-            x1 = max(0, px)
-            y1 = max(0, py)
-            x2 = min(self.canvas.width, px + text_w)
-            y2 = min(self.canvas.height, py + text_h)
-
-            # 计算文本位图的有效区域
-            text_x1 = max(0, -px)
-            text_y1 = max(0, -py)
-            text_x2 = text_x1 + (x2 - x1)
-            text_y2 = text_y1 + (y2 - y1)
-
-            if x2 > x1 and y2 > y1:
-                new_layer.data[y1:y2, x1:x2] = text_bitmap[text_y1:text_y2, text_x1:text_x2]
+            new_layer.set_region(px, py, text_bitmap)
 
             # 如果用户选择删除原图层
             if reply == QMessageBox.StandardButton.Yes:
@@ -707,17 +753,18 @@ class MainWindow(QMainWindow):
         self.canvas_view.update_canvas()
         self.project.mark_modified()
 
-    def _on_draw_completed(self, old_data, new_data) -> None:
+    def _on_draw_completed(self, old_data, new_data, x: int, y: int) -> None:
         """
         绘制完成事件
 
         Args:
-            old_data: 旧的图层数据
-            new_data: 新的图层数据
+            old_data: 修改区域的旧数据
+            new_data: 修改区域的新数据
+            x, y: 修改区域左上角坐标
         """
         layer = self.canvas.get_active_layer()
         if layer and old_data is not None and new_data is not None:
-            command = DrawCommand(layer, old_data, new_data)
+            command = DrawCommand(layer, old_data, new_data, x=x, y=y)
             # 使用 add() 而不是 execute()，因为工具已经修改了图层数据
             self.history.add(command)
             self.project.mark_modified()
@@ -726,6 +773,8 @@ class MainWindow(QMainWindow):
         """图层改变事件"""
         self.canvas_view.update_canvas()
         self.project.mark_modified()
+        # 显示之前隐藏的图层时才会解码
+        self._report_load_errors()
 
     def _on_active_layer_changed(self, layer_index: int) -> None:
         """
@@ -802,6 +851,9 @@ class MainWindow(QMainWindow):
                 event.ignore()
                 return
 
+        # 正常退出，不再需要恢复文件
+        self.autosave_timer.stop()
+        self.autosave.shutdown()
         event.accept()
 
     def showEvent(self, event) -> None:
@@ -819,6 +871,7 @@ class MainWindow(QMainWindow):
             # 使用 QTimer 延迟调用，确保窗口已完全显示
             from PyQt6.QtCore import QTimer
             QTimer.singleShot(100, self.canvas_view.fit_in_view)
+            QTimer.singleShot(0, self._check_recovery)
 
     def keyPressEvent(self, event) -> None:
         """
@@ -838,16 +891,16 @@ class MainWindow(QMainWindow):
             if isinstance(self.current_tool, SelectTool) and self.current_tool.has_selection():
                 layer = self.canvas.get_active_layer()
                 if layer and not layer.locked:
-                    # 保存旧数据用于撤销
-                    old_data = layer.data.copy()
+                    # 记录修改区域的旧数据用于撤销
+                    layer.begin_snapshot()
 
                     # 删除选区
-                    if self.current_tool.delete_selection():
-                        # 保存新数据
-                        new_data = layer.data.copy()
-
-                        # 添加到历史记录
-                        command = DrawCommand(layer, old_data, new_data)
+                    deleted = self.current_tool.delete_selection()
+                    snapshot = layer.end_snapshot()
+                    if deleted and snapshot is not None:
+                        # 添加到历史记录（命令只保存差异）
+                        (x0, y0, x1, y1), old_data = snapshot
+                        command = DrawCommand(layer, old_data, layer.get_region(x0, y0, x1, y1), x=x0, y=y0)
                         self.history.add(command)
 
                         # 更新视图
@@ -93,3 +93,84 @@ def bytes_per_row(width: int) -> int:
         字节数
     """
     return (width + 7) // 8
+
+
+def pack_rows(bits: np.ndarray, msb_first: bool = True) -> np.ndarray:
+    """
+    按行打包位图（向量化，每行末尾不足 8 位补 0）
+
+    Args:
+        bits: 布尔数组 (height, width)
+        msb_first: 是否 MSB first
+
+    Returns:
+        uint8 数组 (height, bytes_per_row(width))
+    """
+    bitorder = "big" if msb_first else "little"
+    return np.packbits(np.asarray(bits, dtype=bool), axis=1, bitorder=bitorder)
+
+
+def pack_pages(bits: np.ndarray, msb_first: bool = True) -> np.ndarray:
+    """
+    按 page 打包位图（向量化，每 8 行为一个 page，每列一个字节，不足 8 行补 0）
+
+    Args:
+        bits: 布尔数组 (height, width)
+        msb_first: 是否 MSB first（page 内第一行为最高位）
+
+    Returns:
+        uint8 数组 (pages, width)
+    """
+    bitorder = "big" if msb_first else "little"
+    # 沿行方向打包，等价于先转置为 (width, height) 再逐列打包
+    return np.packbits(np.asarray(bits, dtype=bool), axis=0, bitorder=bitorder)
+
+
+def unpack_rows(packed: np.ndarray, width: int, msb_first: bool = True) -> np.ndarray:
+    """
+    按行解包位图（pack_rows 的逆操作，丢弃每行末尾的补齐位）
+
+    Args:
+        packed: uint8 数组 (height, bytes_per_row(width))
+        width: 位图宽度
+        msb_first: 是否 MSB first
+
+    Returns:
+        布尔数组 (height, width)
+    """
+    bitorder = "big" if msb_first else "little"
+    return np.unpackbits(packed, axis=1, count=width, bitorder=bitorder).view(bool)
+
+
+def unpack_pages(packed: np.ndarray, height: int, msb_first: bool = True) -> np.ndarray:
+    """
+    按 page 解包位图（pack_pages 的逆操作，丢弃最后一个 page 的补齐位）
+
+    Args:
+        packed: uint8 数组 (pages, width)
+        height: 位图高度
+        msb_first: 是否 MSB first
+
+    Returns:
+        布尔数组 (height, width)
+    """
+    bitorder = "big" if msb_first else "little"
+    return np.unpackbits(packed, axis=0, count=height, bitorder=bitorder).view(bool)
+
+
+# 字节位序反转查找表（MSB first <-> LSB first）
+_REVERSE_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1)
+_REVERSE_BITS = np.packbits(_REVERSE_BITS, axis=1, bitorder='little').ravel()
+
+
+def reverse_bits(packed: np.ndarray) -> np.ndarray:
+    """
+    反转每个字节内的位序（MSB first 与 LSB first 互相转换）
+
+    Args:
+        packed: uint8 数组
+
+    Returns:
+        位序反转后的新数组
+    """
+    return _REVERSE_BITS[packed]
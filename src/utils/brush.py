@@ -0,0 +1,63 @@
+"""笔刷引擎：缓存笔触形状并沿线段批量盖章"""
+from functools import lru_cache
+from typing import Tuple
+import numpy as np
+
+from .geometry import filled_circle_mask, line_indices
+
+
+@lru_cache(maxsize=64)
+def brush_footprint(size: int) -> np.ndarray:
+    """
+    获取圆形笔触的形状掩码（按大小缓存，只读）
+
+    Args:
+        size: 笔触大小（半径为 size // 2）
+
+    Returns:
+        边长 2 * (size // 2) + 1 的布尔掩码
+    """
+    mask, _, _ = filled_circle_mask(0, 0, size // 2)
+    mask.flags.writeable = False
+    return mask
+
+
+@lru_cache(maxsize=64)
+def _footprint_offsets(size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    获取笔触中所有像素相对于中心的偏移（按大小缓存）
+
+    Args:
+        size: 笔触大小
+
+    Returns:
+        (dxs, dys) 偏移数组
+    """
+    radius = size // 2
+    dys, dxs = np.nonzero(brush_footprint(size))
+    return dxs - radius, dys - radius
+
+
+def stroke_mask(x0: int, y0: int, x1: int, y1: int, size: int) -> Tuple[np.ndarray, int, int]:
+    """
+    计算笔刷沿线段移动覆盖的区域（在 Bresenham 直线的每个点上盖一次笔触）
+
+    Args:
+        x0, y0: 起点坐标
+        x1, y1: 终点坐标
+        size: 笔触大小
+
+    Returns:
+        (mask, x, y) 覆盖区域的掩码及其左上角坐标
+    """
+    radius = size // 2
+    xs, ys = line_indices(x0, y0, x1, y1)
+    dxs, dys = _footprint_offsets(size)
+
+    left = min(x0, x1) - radius
+    top = min(y0, y1) - radius
+    mask = np.zeros((abs(y1 - y0) + 2 * radius + 1, abs(x1 - x0) + 2 * radius + 1), dtype=bool)
+
+    # 所有盖章位置 × 笔触偏移，一次性写入
+    mask[(ys - top)[:, np.newaxis] + dys, (xs - left)[:, np.newaxis] + dxs] = True
+    return mask, left, top
@@ -12,6 +12,12 @@ ZOOM_STEP = 1.2
 # 网格线颜色（像素边界线）- 浅灰色，与黑色像素区分
 GRID_COLOR = (180, 180, 180, 255)  # RGBA - 浅灰色，完全不透明
 
+# 网格线显示的最小缩放级别（低于此值时像素过小，自动隐藏网格）
+GRID_MIN_ZOOM = 4.0
+
+# 拖拽绘制时的默认目标重绘帧率
+DEFAULT_TARGET_FPS = 60
+
 # 像素值
 PIXEL_BLACK = True
 PIXEL_WHITE = False
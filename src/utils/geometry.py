@@ -1,7 +1,12 @@
 """几何计算工具函数"""
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 import numpy as np
 
+try:
+    from scipy import ndimage
+except ImportError:  # scipy 为可选依赖，未安装时使用扫描线算法
+    ndimage = None
+
 
 def bresenham_line(x0: int, y0: int, x1: int, y1: int) -> List[Tuple[int, int]]:
     """
@@ -149,6 +154,200 @@ def filled_rectangle(x0: int, y0: int, x1: int, y1: int) -> List[Tuple[int, int]
     return points
 
 
+def line_indices(x0: int, y0: int, x1: int, y1: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bresenham 直线算法（向量化，结果与 bresenham_line 完全相同）
+
+    沿主方向每步前进 1 像素，次方向的步数为 (2 * i * d_minor + d_major - 1) // (2 * d_major)，
+    与逐步误差累积的结果一致
+
+    Args:
+        x0, y0: 起点坐标
+        x1, y1: 终点坐标
+
+    Returns:
+        (xs, ys) 直线上所有像素的坐标数组（按从起点到终点的顺序）
+    """
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+
+    steps = np.arange(max(dx, dy) + 1)
+    if dx >= dy:
+        minor = (2 * steps * dy + dx - 1) // (2 * dx) if dx else steps
+        return x0 + sx * steps, y0 + sy * minor
+    minor = (2 * steps * dx + dy - 1) // (2 * dy)
+    return x0 + sx * minor, y0 + sy * steps
+
+
+def circle_outline_indices(cx: int, cy: int, radius: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bresenham 圆形轮廓（坐标数组形式，点集与 bresenham_circle 相同）
+
+    Args:
+        cx, cy: 圆心坐标
+        radius: 半径
+
+    Returns:
+        (xs, ys) 圆形轮廓上所有像素的坐标数组
+    """
+    # 第一个八分圆：x 每步加 1 时 Bresenham 保持 y 的条件是
+    # y^2 + (y-1)^2 < 2 * (r^2 - x^2)，取满足条件的最大 y（先用浮点估计，再修正一步）
+    x = np.arange(radius + 1, dtype=np.int64)
+    limit = 2 * (radius * radius - x * x)
+    y = np.floor((1 + np.sqrt(np.maximum(2 * limit - 1, 0))) / 2).astype(np.int64)
+    y = np.where(y * y + (y - 1) ** 2 >= limit, y - 1, y)
+    y = np.where((y + 1) ** 2 + y * y < limit, y + 1, y)
+    if radius >= 0:
+        y[0] = radius
+    # y 单调不增，x <= y 的部分是连续的前缀
+    inside = x <= y
+    x, y = x[inside], y[inside]
+
+    # 镜像到 8 个八分圆并去除重复点
+    xs = np.concatenate((x, -x, x, -x, y, -y, y, -y)) + cx
+    ys = np.concatenate((y, y, -y, -y, x, x, -x, -x)) + cy
+    points = np.unique(np.stack((xs, ys), axis=1), axis=0)
+    return points[:, 0], points[:, 1]
+
+
+def filled_circle_mask(cx: int, cy: int, radius: int) -> Tuple[np.ndarray, int, int]:
+    """
+    填充圆形（掩码形式，像素集合与 filled_circle 相同）
+
+    Args:
+        cx, cy: 圆心坐标
+        radius: 半径
+
+    Returns:
+        (mask, x, y) 边长 2 * radius + 1 的掩码及其左上角在画布上的坐标
+    """
+    dy, dx = np.ogrid[-radius:radius + 1, -radius:radius + 1]
+    mask = dx * dx + dy * dy <= radius * radius
+    return mask, cx - radius, cy - radius
+
+
+def rectangle_outline_mask(x0: int, y0: int, x1: int, y1: int) -> Tuple[np.ndarray, int, int]:
+    """
+    矩形轮廓（掩码形式，像素集合与 rectangle_outline 相同）
+
+    Args:
+        x0, y0: 左上角坐标
+        x1, y1: 右下角坐标（包含）
+
+    Returns:
+        (mask, x, y) 掩码及其左上角在画布上的坐标
+    """
+    min_x, max_x = min(x0, x1), max(x0, x1)
+    min_y, max_y = min(y0, y1), max(y0, y1)
+
+    mask = np.zeros((max_y - min_y + 1, max_x - min_x + 1), dtype=bool)
+    mask[[0, -1], :] = True
+    mask[:, [0, -1]] = True
+    return mask, min_x, min_y
+
+
+def filled_rectangle_mask(x0: int, y0: int, x1: int, y1: int) -> Tuple[np.ndarray, int, int]:
+    """
+    填充矩形（掩码形式，像素集合与 filled_rectangle 相同）
+
+    Args:
+        x0, y0: 左上角坐标
+        x1, y1: 右下角坐标（包含）
+
+    Returns:
+        (mask, x, y) 掩码及其左上角在画布上的坐标
+    """
+    min_x, max_x = min(x0, x1), max(x0, x1)
+    min_y, max_y = min(y0, y1), max(y0, y1)
+    return np.ones((max_y - min_y + 1, max_x - min_x + 1), dtype=bool), min_x, min_y
+
+
+def indices_to_mask(xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, int, int]:
+    """
+    将坐标数组转换为覆盖所有点的最小掩码
+
+    Args:
+        xs, ys: 坐标数组
+
+    Returns:
+        (mask, x, y) 掩码及其左上角在画布上的坐标，没有点时返回空掩码
+    """
+    if len(xs) == 0:
+        return np.zeros((0, 0), dtype=bool), 0, 0
+
+    min_x, min_y = int(xs.min()), int(ys.min())
+    mask = np.zeros((int(ys.max()) - min_y + 1, int(xs.max()) - min_x + 1), dtype=bool)
+    mask[ys - min_y, xs - min_x] = True
+    return mask, min_x, min_y
+
+
+def union_rect(
+    a: Optional[Tuple[int, int, int, int]],
+    b: Optional[Tuple[int, int, int, int]]
+) -> Optional[Tuple[int, int, int, int]]:
+    """
+    合并两个矩形区域
+
+    Args:
+        a: 矩形 (x0, y0, x1, y1)，右下角不包含在内，None 表示空
+        b: 矩形 (x0, y0, x1, y1)，右下角不包含在内，None 表示空
+
+    Returns:
+        同时包含两个矩形的最小矩形，两者都为空时返回 None
+    """
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def clip_rect(
+    rect: Optional[Tuple[int, int, int, int]],
+    width: int,
+    height: int
+) -> Optional[Tuple[int, int, int, int]]:
+    """
+    将矩形裁剪到 (0, 0, width, height) 范围内
+
+    Args:
+        rect: 矩形 (x0, y0, x1, y1)，右下角不包含在内
+        width: 宽度
+        height: 高度
+
+    Returns:
+        裁剪后的矩形，结果为空时返回 None
+    """
+    if rect is None:
+        return None
+    x0 = max(0, rect[0])
+    y0 = max(0, rect[1])
+    x1 = min(width, rect[2])
+    y1 = min(height, rect[3])
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1, y1)
+
+
+def mask_bounds(mask: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    """
+    计算布尔数组中 True 像素的边界框
+
+    Args:
+        mask: 布尔数组 (height, width)
+
+    Returns:
+        边界框 (x0, y0, x1, y1)，右下角不包含在内，没有 True 像素时返回 None
+    """
+    rows = np.flatnonzero(mask.any(axis=1))
+    if len(rows) == 0:
+        return None
+    cols = np.flatnonzero(mask[rows[0]:rows[-1] + 1].any(axis=0))
+    return (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+
+
 def snap_to_angle(x0: int, y0: int, x1: int, y1: int) -> Tuple[int, int]:
     """
     将直线锁定到最近的 45 度角（水平、垂直、对角线）
@@ -221,41 +420,111 @@ def flood_fill(data: np.ndarray, x: int, y: int, target_value: bool, fill_value:
     Returns:
         被填充的所有像素坐标列表
     """
+    mask = flood_fill_mask(data, x, y, target_value, fill_value)
+    ys, xs = np.nonzero(mask)
+    return list(zip(xs.tolist(), ys.tolist()))
+
+
+def flood_fill_mask(
+    data: np.ndarray,
+    x: int,
+    y: int,
+    target_value: bool,
+    fill_value: bool,
+    connectivity: int = 4
+) -> np.ndarray:
+    """
+    泛洪填充算法（返回掩码）
+
+    安装了 scipy 时使用 scipy.ndimage.label 标记连通区域，
+    否则使用基于行内连续段（span）的扫描线算法
+
+    Args:
+        data: 位图数据
+        x, y: 起始坐标
+        target_value: 要替换的目标值
+        fill_value: 填充值
+        connectivity: 连通性（4 或 8）
+
+    Returns:
+        被填充像素的布尔掩码 (height, width)，不需要填充时全部为 False
+    """
+    if connectivity not in (4, 8):
+        raise ValueError(f"不支持的连通性: {connectivity}")
+
     height, width = data.shape
+    mask = np.zeros((height, width), dtype=bool)
 
     # 边界检查
     if not (0 <= x < width and 0 <= y < height):
-        return []
+        return mask
 
     # 如果起始点不是目标值，或者目标值等于填充值，则不填充
     if data[y, x] != target_value or target_value == fill_value:
-        return []
-
-    filled_points = []
-    stack = [(x, y)]
-    visited = set()
+        return mask
 
-    while stack:
-        cx, cy = stack.pop()
+    region = np.asarray(data, dtype=bool) == target_value
 
-        if (cx, cy) in visited:
-            continue
+    if ndimage is not None:
+        structure = ndimage.generate_binary_structure(2, 1 if connectivity == 4 else 2)
+        labels, _ = ndimage.label(region, structure=structure)
+        return labels == labels[y, x]
 
-        if not (0 <= cx < width and 0 <= cy < height):
-            continue
+    return _scanline_fill(region, x, y, connectivity)
 
-        if data[cy, cx] != target_value:
-            continue
 
-        visited.add((cx, cy))
-        filled_points.append((cx, cy))
+def _scanline_fill(region: np.ndarray, x: int, y: int, connectivity: int) -> np.ndarray:
+    """
+    扫描线泛洪填充：以行内连续段为单位做广度优先搜索
 
-        # 4-连通
-        stack.extend([
-            (cx + 1, cy),
-            (cx - 1, cy),
-            (cx, cy + 1),
-            (cx, cy - 1)
-        ])
+    Args:
+        region: 可填充像素的布尔数组 (height, width)
+        x, y: 起始坐标（必须位于可填充像素上）
+        connectivity: 连通性（4 或 8）
 
-    return filled_points
+    Returns:
+        与起始点连通的像素掩码
+    """
+    height, width = region.shape
+
+    # 找出每行所有连续段 [starts, ends)，按行优先顺序排列
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = region
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+
+    # 每行的连续段索引范围 row_index[r]:row_index[r + 1]
+    row_index = np.searchsorted(rows, np.arange(height + 1))
+
+    # 8-连通时斜向相邻的段也算重叠
+    reach = 1 if connectivity == 8 else 0
+
+    lo, hi = row_index[y], row_index[y + 1]
+    seed = lo + int(np.flatnonzero((starts[lo:hi] <= x) & (ends[lo:hi] > x))[0])
+
+    visited = np.zeros(len(starts), dtype=bool)
+    visited[seed] = True
+    queue = [seed]
+
+    while queue:
+        run = queue.pop()
+        row = rows[run]
+        run_start = starts[run] - reach
+        run_end = ends[run] + reach
+
+        for next_row in (row - 1, row + 1):
+            if not (0 <= next_row < height):
+                continue
+            lo, hi = row_index[next_row], row_index[next_row + 1]
+            overlap = (starts[lo:hi] < run_end) & (ends[lo:hi] > run_start) & ~visited[lo:hi]
+            for candidate in (lo + np.flatnonzero(overlap)).tolist():
+                visited[candidate] = True
+                queue.append(candidate)
+
+    # 用差分 + 累加把选中的段还原为掩码
+    selected = np.flatnonzero(visited)
+    counts = np.zeros((height, width + 1), dtype=np.int32)
+    np.add.at(counts, (rows[selected], starts[selected]), 1)
+    np.add.at(counts, (rows[selected], ends[selected]), -1)
+    return np.cumsum(counts, axis=1)[:, :width] > 0
@@ -50,6 +50,8 @@ def test_rendering_performance():
         for i in range(num_iterations):
             start_time = time.perf_counter()
             view.update_canvas()
+            # 显示块按需渲染，取完整图像以渲染所有块
+            view.canvas_item.image()
             end_time = time.perf_counter()
             total_time += (end_time - start_time)
 
@@ -60,6 +62,15 @@ def test_rendering_performance():
         print(f"  平均渲染时间: {avg_time*1000:.2f} ms")
         print(f"  渲染速度: {pixels/avg_time:,.0f} 像素/秒")
 
+        # 验证显示块缓冲区跨帧复用（尺寸不变时不重新分配）
+        buffers = {key: entry[0] for key, entry in view._display_tiles.items()}
+        view.update_canvas()
+        view.canvas_item.image()
+        if buffers and all(view._display_tiles[key][0] is buffer for key, buffer in buffers.items()):
+            print(f"  ✓ 图像缓冲区跨帧复用")
+        else:
+            print(f"  ✗ 图像缓冲区被重新分配")
+
         # 验证渲染结果
         if view.canvas_item:
             pixmap = view.canvas_item.pixmap()
@@ -73,6 +84,56 @@ def test_rendering_performance():
     print("=" * 60)
 
 
+def test_viewport_culling():
+    """测试放大查看大画布时只渲染视口内的显示块"""
+    print("\n" + "=" * 60)
+    print("视口裁剪渲染测试")
+    print("=" * 60)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    width, height = 4000, 4000
+    canvas = Canvas(width, height)
+    layer = canvas.get_active_layer()
+    layer.data = np.random.choice([True, False], size=(height, width), p=[0.3, 0.7])
+
+    view = CanvasView(canvas)
+    view.resize(800, 600)
+    view.show()
+    view.scale(32, 32)
+    view.zoom_level = 32
+    view.centerOn(100, 100)
+    app.processEvents()
+
+    # 重绘视口（放大 3200% 时视口只覆盖画布一角）
+    num_iterations = 10
+    start_time = time.perf_counter()
+    for i in range(num_iterations):
+        view.update_canvas()
+        view.viewport().repaint()
+    avg_time = (time.perf_counter() - start_time) / num_iterations
+    print(f"  画布: {width}x{height}，缩放 3200%")
+    print(f"  平均重绘时间: {avg_time*1000:.2f} ms")
+    print(f"  已渲染显示块: {len(view._display_tiles)}")
+
+    # 平移：只渲染新进入视口的块
+    start_time = time.perf_counter()
+    for i in range(num_iterations):
+        view.centerOn(100 + (i + 1) * 30, 100)
+        view.viewport().repaint()
+    avg_time = (time.perf_counter() - start_time) / num_iterations
+    print(f"  平均平移重绘时间: {avg_time*1000:.2f} ms")
+    print(f"  已渲染显示块: {len(view._display_tiles)}")
+
+    if len(view._display_tiles) < 16:
+        print("  ✓ 只渲染了视口附近的显示块")
+    else:
+        print("  ✗ 渲染了视口之外的显示块")
+
+    view.close()
+    print("=" * 60)
+
+
 def test_color_correctness():
     """测试颜色正确性"""
     print("\n" + "=" * 60)
@@ -80,7 +141,7 @@ def test_color_correctness():
     print("=" * 60)
 
     # 创建应用
-    app = QApplication(sys.argv)
+    app = QApplication.instance() or QApplication(sys.argv)
 
     # 创建小画布用于测试
     canvas = Canvas(4, 4)
@@ -153,4 +214,5 @@ def test_color_correctness():
 
 if __name__ == "__main__":
     test_rendering_performance()
+    test_viewport_culling()
     test_color_correctness()
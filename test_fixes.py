@@ -10,11 +10,11 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
-# 添加 src 到路径
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+# 添加项目根目录到路径（通过 src 包导入，包内模块使用相对导入）
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from core.text_object import TextObject
-from services.font_manager import FontManager
+from src.core.text_object import TextObject
+from src.services.font_manager import FontManager
 import tempfile
 import numpy as np
 
@@ -101,7 +101,7 @@ def test_layer_clear_null_check():
     """测试 Layer.clear() 空指针检查"""
     print("\n=== 测试 Layer.clear() 空指针检查 ===")
 
-    from core.layer import Layer
+    from src.core.layer import Layer
 
     # 测试 1: 正常位图图层
     layer = Layer(10, 10, "Test", "bitmap")
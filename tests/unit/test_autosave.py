@@ -0,0 +1,123 @@
+"""测试自动保存服务"""
+import os
+import numpy as np
+from src.core.canvas import Canvas
+from src.core.project import Project
+from src.core.text_object import TextObject
+from src.services.autosave_service import AutosaveService
+
+
+def _make_project(file_path=None):
+    """创建包含两个位图图层和一个文本图层的项目"""
+    canvas = Canvas(64, 32)
+    canvas.get_active_layer().fill_region(2, 2, 20, 10, True)
+    canvas.add_layer("第二层").set_pixel(40, 20, True)
+    canvas.add_text_layer(TextObject("Hi", "Arial", 12, (4, 5)), name="文本")
+    project = Project(canvas, file_path)
+    project.mark_modified()
+    return project
+
+
+def test_autosave_and_restore(tmp_path):
+    """测试后台写入恢复文件并恢复到新项目"""
+    service = AutosaveService(str(tmp_path / "recovery"))
+    project = _make_project("/projects/demo.mpx")
+    expected = [layer.data.copy() for layer in project.canvas.layers[:2]]
+
+    assert service.save_async(project) is True
+    assert service.wait() is True
+
+    # 快照之后的修改不影响恢复文件
+    project.canvas.layers[0].clear()
+
+    info = service.get_recovery_info()
+    assert info["file_path"] == "/projects/demo.mpx"
+
+    restored = Project(Canvas(1, 1))
+    assert service.restore(restored) is True
+    assert restored.file_path == "/projects/demo.mpx"
+    assert restored.is_modified()
+    assert [layer.name for layer in restored.canvas.layers] == ["Background", "第二层", "文本"]
+    for layer, data in zip(restored.canvas.layers, expected):
+        assert np.array_equal(layer.data, data)
+    assert restored.canvas.layers[2].text_object.text == "Hi"
+
+    service.shutdown()
+    assert service.get_recovery_info() is None
+    assert not os.path.exists(service.recovery_path)
+
+
+def test_autosave_snapshot_reuses_unchanged_layers(tmp_path):
+    """测试快照只复制修改过的位图图层，没有变化时跳过"""
+    service = AutosaveService(str(tmp_path))
+    project = _make_project()
+    first, second = project.canvas.layers[:2]
+
+    assert service.save_async(project) is True
+    service.wait()
+    assert service.last_copied_nbytes == first.nbytes + second.nbytes
+    assert service.get_memory_usage() == first.nbytes + second.nbytes
+
+    # 没有变化时不再快照
+    assert service.save_async(project) is False
+
+    # 只修改了一个图层，只复制该图层；改名只更新元数据
+    second.set_pixel(0, 0, True)
+    first.name = "改名"
+    assert service.save_async(project) is True
+    service.wait()
+    assert service.last_copied_nbytes == second.nbytes
+
+    restored = Project(Canvas(1, 1))
+    assert service.restore(restored) is True
+    assert restored.canvas.layers[0].name == "改名"
+    assert restored.canvas.layers[1].get_pixel(0, 0)
+
+    service.shutdown()
+
+
+def test_autosave_clear_removes_recovery(tmp_path):
+    """测试保存或放弃修改后删除恢复文件"""
+    service = AutosaveService(str(tmp_path))
+    project = _make_project()
+
+    assert service.get_recovery_info() is None
+    assert service.save_async(project) is True
+    service.wait()
+    assert service.get_recovery_info() is not None
+
+    service.clear()
+    assert service.get_recovery_info() is None
+    assert os.listdir(tmp_path) == []
+
+    # 清除后即使没有变化也会重新写入
+    assert service.save_async(project) is True
+    service.shutdown()
+
+
+def test_autosave_does_not_load_unloaded_layers(tmp_path):
+    """测试快照不解码延迟加载的图层，恢复后数据一致"""
+    source = _make_project()
+    expected = [layer.data.copy() for layer in source.canvas.layers[:2]]
+
+    for name in ("demo.mpxb", "demo.mpx"):
+        path = str(tmp_path / name)
+        assert source.save(path) is True
+
+        project = Project(Canvas(1, 1))
+        assert project.load(path, lazy=True) is True
+        service = AutosaveService(str(tmp_path / "recovery"))
+        assert service.save_async(project) is True
+        assert service.wait() is True
+        assert not any(layer.is_loaded for layer in project.canvas.layers[:2])
+        # 项目文件关闭后快照仍可保存
+        project.close_file()
+        project.canvas.layers[0].set_pixel(63, 31, True)
+        assert service.save_async(project) is True
+        assert service.wait() is True
+
+        restored = Project(Canvas(1, 1))
+        assert service.restore(restored) is True
+        assert restored.canvas.layers[0].get_pixel(63, 31)
+        assert np.array_equal(restored.canvas.layers[1].data, expected[1])
+        service.shutdown()
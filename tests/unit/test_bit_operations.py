@@ -1,8 +1,10 @@
 """测试位运算工具"""
 import pytest
+import numpy as np
 from src.utils.bit_operations import (
     pack_bits_msb, pack_bits_lsb, unpack_byte_msb, unpack_byte_lsb,
-    pad_to_byte_boundary, bytes_per_row
+    pad_to_byte_boundary, bytes_per_row, pack_rows, pack_pages, unpack_rows, unpack_pages,
+    reverse_bits
 )
 
 
@@ -121,3 +123,42 @@ def test_bytes_per_row():
     assert bytes_per_row(15) == 2
     assert bytes_per_row(16) == 2
     assert bytes_per_row(17) == 3
+
+
+def test_pack_rows():
+    """测试按行打包"""
+    bits = np.zeros((2, 10), dtype=bool)
+    bits[0, 0] = True
+    bits[1, 9] = True
+
+    assert pack_rows(bits, msb_first=True).tolist() == [[0x80, 0x00], [0x00, 0x40]]
+    assert pack_rows(bits, msb_first=False).tolist() == [[0x01, 0x00], [0x00, 0x02]]
+
+
+def test_pack_pages():
+    """测试按 page 打包"""
+    bits = np.zeros((10, 2), dtype=bool)
+    bits[0, 0] = True
+    bits[9, 1] = True
+
+    assert pack_pages(bits, msb_first=True).tolist() == [[0x80, 0x00], [0x00, 0x40]]
+    assert pack_pages(bits, msb_first=False).tolist() == [[0x01, 0x00], [0x00, 0x02]]
+
+
+def test_unpack_rows_and_pages_roundtrip():
+    """测试按行/按 page 解包为打包的逆操作"""
+    bits = np.random.default_rng(0).random((11, 13)) < 0.5
+
+    for msb_first in (True, False):
+        assert np.array_equal(unpack_rows(pack_rows(bits, msb_first), 13, msb_first), bits)
+        assert np.array_equal(unpack_pages(pack_pages(bits, msb_first), 11, msb_first), bits)
+
+
+def test_reverse_bits():
+    """测试字节位序反转"""
+    packed = np.array([0x80, 0x01, 0xF0, 0xA5], dtype=np.uint8)
+    assert reverse_bits(packed).tolist() == [0x01, 0x80, 0x0F, 0xA5]
+
+    # 与 LSB first 打包结果一致
+    bits = np.random.default_rng(0).random((3, 16)) > 0.5
+    assert np.array_equal(reverse_bits(pack_rows(bits, True)), pack_rows(bits, False))
@@ -0,0 +1,73 @@
+"""笔刷引擎单元测试"""
+import pytest
+import numpy as np
+from PyQt6.QtCore import Qt
+
+from src.core.canvas import Canvas
+from src.tools.pencil import PencilTool
+from src.tools.eraser import EraserTool
+from src.utils.brush import brush_footprint, stroke_mask
+from src.utils.geometry import bresenham_line
+
+NO_MODIFIER = Qt.KeyboardModifier.NoModifier
+
+
+def _stroke_reference(points, size, width, height):
+    """参考实现：在每个点上逐像素绘制圆形笔触"""
+    data = np.zeros((height, width), dtype=bool)
+    radius = size // 2
+    for x, y in points:
+        for dy in range(-radius, radius + 1):
+            for dx in range(-radius, radius + 1):
+                if dx * dx + dy * dy <= radius * radius:
+                    if 0 <= x + dx < width and 0 <= y + dy < height:
+                        data[y + dy, x + dx] = True
+    return data
+
+
+def test_brush_footprint_cached():
+    """测试笔触形状按大小缓存且只读"""
+    footprint = brush_footprint(5)
+
+    assert footprint is brush_footprint(5)
+    assert footprint.shape == (5, 5)
+    assert not footprint.flags.writeable
+    assert brush_footprint(1).shape == (1, 1)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 8, 20])
+def test_stroke_mask_matches_reference(size):
+    """测试线段盖章结果与逐点绘制一致"""
+    rng = np.random.default_rng(size)
+    for _ in range(10):
+        x0, y0, x1, y1 = rng.integers(0, 40, 4).tolist()
+        mask, left, top = stroke_mask(x0, y0, x1, y1, size)
+
+        result = np.zeros((80, 80), dtype=bool)
+        h, w = mask.shape
+        result[top + 20:top + 20 + h, left + 20:left + 20 + w] = mask
+
+        points = [(x + 20, y + 20) for x, y in bresenham_line(x0, y0, x1, y1)]
+        assert np.array_equal(result, _stroke_reference(points, size, 80, 80))
+
+
+def test_pencil_and_eraser_tools():
+    """测试画笔和橡皮擦沿拖拽路径绘制/擦除"""
+    canvas = Canvas(30, 20)
+    layer = canvas.get_active_layer()
+
+    pencil = PencilTool(canvas, brush_size=4)
+    pencil.on_press(-2, 3, NO_MODIFIER)
+    pencil.on_drag(25, 18, NO_MODIFIER)
+    pencil.on_release(25, 18, NO_MODIFIER)
+
+    expected = _stroke_reference(bresenham_line(-2, 3, 25, 18), 4, 30, 20)
+    assert np.array_equal(layer.data, expected)
+
+    eraser = EraserTool(canvas, eraser_size=6)
+    eraser.on_press(0, 0, NO_MODIFIER)
+    eraser.on_drag(29, 19, NO_MODIFIER)
+    eraser.on_release(29, 19, NO_MODIFIER)
+
+    erased = _stroke_reference(bresenham_line(0, 0, 29, 19), 6, 30, 20)
+    assert np.array_equal(layer.data, expected & ~erased)
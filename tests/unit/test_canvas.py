@@ -134,3 +134,144 @@ def test_resize():
     assert canvas.height == 80
     assert layer.get_pixel(50, 50) == True
     assert layer.get_pixel(79, 79) == False  # 超出范围
+
+
+def test_take_dirty_rect():
+    """测试取出所有图层的已修改区域"""
+    canvas = Canvas(100, 100)
+    layer1 = canvas.layers[0]
+    layer2 = canvas.add_layer("Layer 1")
+
+    assert canvas.take_dirty_rect() is None
+
+    layer1.set_pixel(10, 10, True)
+    layer2.set_pixel(50, 60, True)
+    assert canvas.take_dirty_rect() == (10, 10, 51, 61)
+
+    # 取出后清空
+    assert canvas.take_dirty_rect() is None
+    assert layer1.dirty_rect is None
+    assert layer2.dirty_rect is None
+
+
+def test_composite_parts_cache():
+    """测试活动图层之下/之上的合成缓存"""
+    canvas = Canvas(10, 10)
+    background = canvas.layers[0]
+    middle = canvas.add_layer("Middle")
+    top = canvas.add_layer("Top")
+    canvas.active_layer_index = 1
+
+    background.set_pixel(0, 0, True)
+    top.set_pixel(9, 9, True)
+
+    below, active, above = canvas.get_composite_parts()
+    assert below[0, 0] and not below[9, 9]
+    assert above[9, 9] and not above[0, 0]
+    assert active is middle.data
+
+    # 只修改活动图层时复用缓存
+    middle.set_pixel(5, 5, True)
+    below2, active2, above2 = canvas.get_composite_parts()
+    assert below2 is below
+    assert above2 is above
+    assert active2[5, 5]
+
+    # 修改非活动图层时重新合成
+    top.set_pixel(8, 8, True)
+    _, _, above3 = canvas.get_composite_parts()
+    assert above3 is not above
+    assert above3[8, 8]
+
+    # 切换可见性时重新合成
+    background.visible = False
+    below4, _, _ = canvas.get_composite_parts()
+    assert not below4[0, 0]
+
+    # 移动图层时重新合成
+    canvas.move_layer(2, 0)
+    below5, active5, above5 = canvas.get_composite_parts()
+    assert canvas.get_active_layer() is middle
+    assert below5[9, 9] and below5[8, 8]
+    assert not above5.any()
+
+
+def test_composite_parts_with_text():
+    """测试合成时通过渲染函数叠加文本图层"""
+    from src.core.text_object import TextObject
+
+    canvas = Canvas(10, 10)
+    canvas.add_text_layer(TextObject("A", "Arial", 12, (8, 8)))
+    canvas.active_layer_index = 0
+
+    def render_text(layer):
+        return np.ones((3, 3), dtype=bool)
+
+    # 不提供渲染函数时忽略文本图层
+    assert not canvas.merge_visible_layers().any()
+
+    _, _, above = canvas.get_composite_parts(render_text)
+    # 超出画布的部分被裁剪
+    assert above[8:, 8:].all()
+    assert above.sum() == 4
+
+
+def test_packed_layers_composite():
+    """测试打包存储图层的合成结果与稠密存储一致"""
+    rng = np.random.default_rng(1)
+    datas = [rng.random((9, 19)) > 0.8 for _ in range(3)]
+
+    results = []
+    for storage in ("dense", "packed", "tiled"):
+        canvas = Canvas(19, 9, layer_storage=storage)
+        canvas.layers[0].data = datas[0].copy()
+        for data in datas[1:]:
+            canvas.add_layer().data = data.copy()
+        canvas.active_layer_index = 1
+        assert canvas.layers[2].storage_mode == storage
+        results.append((canvas.merge_visible_layers(), canvas.merge_visible_layers_packed()))
+
+    expected = datas[0] | datas[1] | datas[2]
+    assert np.array_equal(results[0][0], expected)
+    assert np.array_equal(results[1][0], expected)
+    assert np.array_equal(results[2][0], expected)
+    assert np.array_equal(results[0][1], results[1][1])
+    assert np.array_equal(results[0][1], results[2][1])
+
+
+def test_auto_layer_storage():
+    """测试自动存储模式按画布尺寸选择分块存储"""
+    small = Canvas(64, 64, layer_storage="auto")
+    assert small.get_active_layer().storage_mode == "dense"
+
+    large = Canvas(4096, 4096, layer_storage="auto")
+    assert large.get_active_layer().storage_mode == "tiled"
+    assert large.add_layer().nbytes == 0
+
+
+def test_tiled_composite_region():
+    """测试分块图层按块合成，区域读取不展开整个画布"""
+    from src.core.text_object import TextObject
+
+    canvas = Canvas(4096, 4096, layer_storage="tiled")
+    canvas.layers[0].fill_region(10, 10, 20, 20, True)
+    canvas.add_layer("Active")
+    canvas.add_text_layer(TextObject("A", "Arial", 12, (4000, 4000)))
+    canvas.active_layer_index = 1
+
+    def render_text(layer):
+        return np.ones((3, 3), dtype=bool)
+
+    region = canvas.get_composite_region(0, 0, 64, 64, render_text)
+    assert region[10:20, 10:20].all()
+    assert region.sum() == 100
+    assert canvas.get_composite_region(4000, 4000, 4003, 4003, render_text).all()
+
+    # 合成只为有内容的块分配内存
+    below = canvas._composite_cache[("below", True)][1]
+    above = canvas._composite_cache[("above", True)][1]
+    assert below.nbytes + above.nbytes < 64 * 64 * 4
+
+    # 展开后的结果与区域读取一致
+    merged = canvas.merge_visible_layers(render_text)
+    assert merged.sum() == 109
@@ -0,0 +1,90 @@
+"""测试命令行批量导出"""
+import os
+import numpy as np
+from src.cli import main
+from src.core.canvas import Canvas
+from src.core.project import Project
+from src.core.text_object import TextObject
+from src.services.export_service import ExportService
+
+
+def _save_project(path, fill_rect, hidden_pixel=None):
+    """保存一个包含可见图层和隐藏图层的项目，返回可见内容"""
+    canvas = Canvas(30, 20)
+    canvas.get_active_layer().fill_region(*fill_rect, True)
+    hidden = canvas.add_layer("隐藏")
+    hidden.set_pixel(*(hidden_pixel or (0, 0)), True)
+    hidden.visible = False
+    assert Project(canvas).save(str(path)) is True
+    return canvas.merge_visible_layers().copy()
+
+
+def test_export_glob_matches_export_service(tmp_path):
+    """测试通配符批量导出，输出与导出服务相同，隐藏图层不参与合并"""
+    (tmp_path / "sub").mkdir()
+    expected = {
+        "logo": _save_project(tmp_path / "logo.mpx", (2, 2, 12, 8)),
+        "icon": _save_project(tmp_path / "sub" / "icon.mpxb", (5, 5, 25, 15), (29, 19)),
+    }
+    out_dir = tmp_path / "out"
+
+    code = main(["export", str(tmp_path / "**" / "*.mpx*"), "-o", str(out_dir), "-q",
+                 "-f", "binary", "--scan", "vertical", "--bit-order", "lsb", "--invert"])
+    assert code == 0
+    assert sorted(os.listdir(out_dir)) == ["icon.bin", "logo.bin"]
+
+    for name, data in expected.items():
+        with open(out_dir / f"{name}.bin", "rb") as f:
+            assert f.read() == ExportService.export_to_binary(data, "vertical", False, True)
+
+
+def test_export_c_array_next_to_project(tmp_path):
+    """测试默认输出到项目所在目录，数组名取自文件名"""
+    data = _save_project(tmp_path / "my-image.mpx", (0, 0, 8, 8))
+
+    assert main(["export", str(tmp_path / "my-image.mpx"), "-q"]) == 0
+    with open(tmp_path / "my-image.h", "r", encoding="utf-8") as f:
+        content = f.read()
+    assert content == ExportService.export_to_c_array(data, "my_image", "horizontal", True, False)
+
+
+def test_export_renders_text_layers(tmp_path):
+    """测试合并时渲染可见的文本图层"""
+    canvas = Canvas(40, 20)
+    canvas.add_text_layer(TextObject("A", "Arial", 14, (2, 2)), name="文本")
+    assert Project(canvas).save(str(tmp_path / "text.mpx")) is True
+
+    assert main(["export", str(tmp_path / "text.mpx"), "-f", "binary", "-q"]) == 0
+    with open(tmp_path / "text.bin", "rb") as f:
+        data = np.frombuffer(f.read(), dtype=np.uint8)
+    assert data.any()
+
+
+def test_export_reports_failures(tmp_path, capsys):
+    """测试加载失败的文件不影响其他文件，退出码为 1"""
+    _save_project(tmp_path / "good.mpx", (0, 0, 4, 4))
+    (tmp_path / "bad.mpx").write_text("not json", encoding="utf-8")
+
+    code = main(["export", str(tmp_path / "*.mpx"), "-f", "png", "-q"])
+    assert code == 1
+    assert os.path.exists(tmp_path / "good.png")
+    assert not os.path.exists(tmp_path / "bad.png")
+    assert "bad.mpx" in capsys.readouterr().err
+
+    assert main(["export", str(tmp_path / "missing" / "*.mpx")]) == 1
+
+
+def test_export_fails_on_corrupt_layer(tmp_path, capsys):
+    """测试图层数据损坏的项目导出失败，不输出空白资源"""
+    import json
+
+    _save_project(tmp_path / "corrupt.mpx", (0, 0, 4, 4))
+    with open(tmp_path / "corrupt.mpx", "r", encoding="utf-8") as f:
+        project_data = json.load(f)
+    project_data["layers"][0]["data"] = "!!不是base64!!"
+    with open(tmp_path / "corrupt.mpx", "w", encoding="utf-8") as f:
+        json.dump(project_data, f)
+
+    assert main(["export", str(tmp_path / "corrupt.mpx"), "-f", "binary", "-q"]) == 1
+    assert not os.path.exists(tmp_path / "corrupt.bin")
+    assert "图层数据损坏" in capsys.readouterr().err
@@ -3,6 +3,10 @@ import pytest
 import numpy as np
 from src.services.export_service import ExportService
 from src.services.preview_service import PreviewService
+from src.utils.bit_operations import (
+    pack_bits_msb, pack_bits_lsb, unpack_byte_msb, unpack_byte_lsb, bytes_per_row,
+    pack_rows
+)
 
 
 def test_horizontal_scan_simple():
@@ -235,3 +239,131 @@ def test_roundtrip_with_invert():
 
     # 应该相同
     assert np.array_equal(preview, original)
+
+
+def _reference_horizontal_scan(data, msb_first, invert):
+    """逐像素的参考实现（向量化之前的算法）"""
+    height, width = data.shape
+    result = []
+    for y in range(height):
+        bits = [bool(data[y, x]) != invert for x in range(width)]
+        for start in range(0, bytes_per_row(width) * 8, 8):
+            byte_bits = bits[start:start + 8]
+            byte_bits += [False] * (8 - len(byte_bits))
+            result.append(pack_bits_msb(byte_bits) if msb_first else pack_bits_lsb(byte_bits))
+    return bytes(result)
+
+
+def _reference_vertical_scan(data, msb_first, invert):
+    """逐像素的参考实现（向量化之前的算法）"""
+    height, width = data.shape
+    result = []
+    for page in range((height + 7) // 8):
+        for x in range(width):
+            bits = []
+            for bit in range(8):
+                y = page * 8 + bit
+                bits.append(bool(data[y, x]) != invert if y < height else False)
+            result.append(pack_bits_msb(bits) if msb_first else pack_bits_lsb(bits))
+    return bytes(result)
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (8, 8), (13, 21), (16, 24), (7, 9), (30, 5)])
+@pytest.mark.parametrize("msb_first", [True, False])
+@pytest.mark.parametrize("invert", [True, False])
+def test_scan_parity_with_reference(shape, msb_first, invert):
+    """测试向量化扫描与逐像素参考实现逐字节一致"""
+    rng = np.random.default_rng(shape[0] * 100 + shape[1])
+    data = rng.random(shape) < 0.4
+
+    assert ExportService.horizontal_scan(data, msb_first, invert) == \
+        _reference_horizontal_scan(data, msb_first, invert)
+    assert ExportService.vertical_scan(data, msb_first, invert) == \
+        _reference_vertical_scan(data, msb_first, invert)
+
+
+def test_scan_padding_not_inverted():
+    """测试反色时补齐位仍为 0"""
+    data = np.zeros((3, 3), dtype=bool)
+
+    # 水平：每行 3 个有效位反色为 1，其余 5 位补 0
+    assert ExportService.horizontal_scan(data, msb_first=True, invert=True) == bytes([0xE0] * 3)
+    assert ExportService.horizontal_scan(data, msb_first=False, invert=True) == bytes([0x07] * 3)
+
+    # 垂直：每列 3 个有效位反色为 1，其余 5 位补 0
+    assert ExportService.vertical_scan(data, msb_first=True, invert=True) == bytes([0xE0] * 3)
+    assert ExportService.vertical_scan(data, msb_first=False, invert=True) == bytes([0x07] * 3)
+
+
+def test_scan_accepts_non_bool_input():
+    """测试非布尔输入按真值处理"""
+    data = np.array([[0, 2, 0, 1, 0, 0, 0, 0]], dtype=np.uint8)
+    assert ExportService.horizontal_scan(data) == bytes([0x50])
+
+
+def _reference_parse(byte_data, width, height, scan_mode, msb_first, invert):
+    """逐字节的参考实现（向量化之前的算法）"""
+    result = np.zeros((height, width), dtype=bool)
+    if scan_mode == "horizontal":
+        outer, inner = height, bytes_per_row(width)
+    else:
+        outer, inner = (height + 7) // 8, width
+
+    byte_idx = 0
+    for o in range(outer):
+        for i in range(inner):
+            if byte_idx >= len(byte_data):
+                break
+            bits = unpack_byte_msb(byte_data[byte_idx]) if msb_first else unpack_byte_lsb(byte_data[byte_idx])
+            for bit_idx, bit in enumerate(bits):
+                if scan_mode == "horizontal":
+                    y, x = o, i * 8 + bit_idx
+                else:
+                    y, x = o * 8 + bit_idx, i
+                if x < width and y < height:
+                    result[y, x] = bit != invert
+            byte_idx += 1
+    return result
+
+
+@pytest.mark.parametrize("scan_mode", ["horizontal", "vertical"])
+@pytest.mark.parametrize("msb_first", [True, False])
+@pytest.mark.parametrize("invert", [True, False])
+@pytest.mark.parametrize("length_delta", [0, -1, -5, 3])
+def test_preview_parity_with_reference(scan_mode, msb_first, invert, length_delta):
+    """测试向量化解析与参考实现一致（包括数据截断和多余数据）"""
+    width, height = 13, 11
+    rng = np.random.default_rng(7)
+    original = rng.random((height, width)) < 0.5
+    byte_data = ExportService.export_to_binary(original, scan_mode, msb_first, invert)
+
+    if length_delta < 0:
+        byte_data = byte_data[:length_delta]
+    else:
+        byte_data = byte_data + bytes([0xA5] * length_delta)
+
+    preview = PreviewService.preview(byte_data, width, height, scan_mode, msb_first, invert)
+    expected = _reference_parse(byte_data, width, height, scan_mode, msb_first, invert)
+
+    assert preview.dtype == bool
+    assert preview.shape == (height, width)
+    assert np.array_equal(preview, expected)
+
+
+def test_preview_empty_data():
+    """测试空数据解析为全白"""
+    preview = PreviewService.preview(b"", 10, 10, "horizontal", True, True)
+    assert preview.shape == (10, 10)
+    assert not preview.any()
+
+
+@pytest.mark.parametrize("width", [8, 13, 1])
+@pytest.mark.parametrize("msb_first", [True, False])
+@pytest.mark.parametrize("invert", [False, True])
+def test_horizontal_scan_packed_matches(width, msb_first, invert):
+    """测试基于打包数据的水平扫描与 horizontal_scan 输出一致"""
+    data = np.random.default_rng(width).random((5, width)) > 0.5
+    packed = pack_rows(data, msb_first=True)
+
+    expected = ExportService.horizontal_scan(data, msb_first, invert)
+    assert ExportService.horizontal_scan_packed(packed, width, msb_first, invert) == expected
@@ -3,7 +3,9 @@ import pytest
 from src.utils.geometry import (
     bresenham_line, bresenham_circle, filled_circle,
     rectangle_outline, filled_rectangle, snap_to_angle,
-    make_square, flood_fill
+    make_square, flood_fill, union_rect, clip_rect, mask_bounds,
+    flood_fill_mask, _scanline_fill, line_indices, circle_outline_indices,
+    filled_circle_mask, rectangle_outline_mask, filled_rectangle_mask, indices_to_mask
 )
 import numpy as np
 
@@ -153,3 +155,118 @@ def test_flood_fill_boundary():
 
     points = flood_fill(data, 0, 10, False, True)
     assert len(points) == 0
+
+
+def test_union_rect():
+    """测试矩形合并"""
+    assert union_rect(None, None) is None
+    assert union_rect((1, 2, 3, 4), None) == (1, 2, 3, 4)
+    assert union_rect(None, (1, 2, 3, 4)) == (1, 2, 3, 4)
+    assert union_rect((1, 2, 3, 4), (0, 3, 5, 4)) == (0, 2, 5, 4)
+
+
+def test_clip_rect():
+    """测试矩形裁剪"""
+    assert clip_rect(None, 10, 10) is None
+    assert clip_rect((-5, -5, 5, 5), 10, 10) == (0, 0, 5, 5)
+    assert clip_rect((5, 5, 20, 20), 10, 10) == (5, 5, 10, 10)
+    # 完全在范围外
+    assert clip_rect((10, 0, 15, 5), 10, 10) is None
+
+
+def test_mask_bounds():
+    """测试布尔数组边界框"""
+    mask = np.zeros((10, 12), dtype=bool)
+    assert mask_bounds(mask) is None
+
+    mask[2, 3] = True
+    mask[7, 9] = True
+    assert mask_bounds(mask) == (3, 2, 10, 8)
+
+
+def _flood_fill_reference(data, x, y, connectivity):
+    """参考实现：逐像素深度优先搜索"""
+    height, width = data.shape
+    target = data[y, x]
+    offsets = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+    if connectivity == 8:
+        offsets += [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+    mask = np.zeros_like(data, dtype=bool)
+    stack = [(x, y)]
+    while stack:
+        cx, cy = stack.pop()
+        if not (0 <= cx < width and 0 <= cy < height):
+            continue
+        if mask[cy, cx] or data[cy, cx] != target:
+            continue
+        mask[cy, cx] = True
+        stack.extend((cx + dx, cy + dy) for dx, dy in offsets)
+    return mask
+
+
+@pytest.mark.parametrize("connectivity", [4, 8])
+def test_flood_fill_mask_matches_reference(connectivity):
+    """测试掩码泛洪填充与逐像素搜索结果一致"""
+    rng = np.random.default_rng(connectivity)
+    for _ in range(5):
+        data = rng.random((30, 40)) > 0.55
+        x, y = int(rng.integers(40)), int(rng.integers(30))
+        target = bool(data[y, x])
+        expected = _flood_fill_reference(data, x, y, connectivity)
+
+        mask = flood_fill_mask(data, x, y, target, not target, connectivity)
+        assert np.array_equal(mask, expected)
+        assert np.array_equal(_scanline_fill(data == target, x, y, connectivity), expected)
+
+
+def test_flood_fill_mask_no_fill():
+    """测试不需要填充时返回全 False 掩码"""
+    data = np.zeros((5, 5), dtype=bool)
+
+    assert not flood_fill_mask(data, 2, 2, False, False).any()
+    assert not flood_fill_mask(data, 2, 2, True, False).any()
+    assert not flood_fill_mask(data, 7, 2, False, True).any()
+
+    with pytest.raises(ValueError):
+        flood_fill_mask(data, 2, 2, False, True, connectivity=6)
+
+
+def test_line_indices_matches_bresenham():
+    """测试向量化直线与 Bresenham 直线完全相同"""
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        x0, y0, x1, y1 = rng.integers(-50, 50, 4).tolist()
+        xs, ys = line_indices(x0, y0, x1, y1)
+        assert list(zip(xs.tolist(), ys.tolist())) == bresenham_line(x0, y0, x1, y1)
+
+
+def _mask_points(mask, x, y):
+    """掩码转换为坐标集合"""
+    ys, xs = np.nonzero(mask)
+    return set(zip((xs + x).tolist(), (ys + y).tolist()))
+
+
+def test_shape_masks_match_point_lists():
+    """测试掩码形式的图形与坐标列表形式的像素集合相同"""
+    assert _mask_points(*filled_circle_mask(3, -2, 7)) == set(filled_circle(3, -2, 7))
+    assert _mask_points(*filled_circle_mask(5, 5, 0)) == set(filled_circle(5, 5, 0))
+    assert _mask_points(*rectangle_outline_mask(8, 9, 2, 3)) == set(rectangle_outline(8, 9, 2, 3))
+    assert _mask_points(*rectangle_outline_mask(4, 4, 4, 6)) == set(rectangle_outline(4, 4, 4, 6))
+    assert _mask_points(*filled_rectangle_mask(8, 9, 2, 3)) == set(filled_rectangle(8, 9, 2, 3))
+
+    for radius in (0, 1, 2, 6, 37, 100):
+        xs, ys = circle_outline_indices(10, 10, radius)
+        assert set(zip(xs.tolist(), ys.tolist())) == set(bresenham_circle(10, 10, radius))
+        assert len(xs) == len(set(zip(xs.tolist(), ys.tolist())))
+
+
+def test_indices_to_mask():
+    """测试坐标数组转换为掩码"""
+    mask, x, y = indices_to_mask(np.array([3, 5, 4]), np.array([-1, 2, 0]))
+    assert (x, y) == (3, -1)
+    assert mask.shape == (4, 3)
+    assert _mask_points(mask, x, y) == {(3, -1), (5, 2), (4, 0)}
+
+    mask, _, _ = indices_to_mask(np.array([], dtype=int), np.array([], dtype=int))
+    assert mask.size == 0
@@ -1,4 +1,5 @@
 """测试历史记录管理"""
+import os
 import pytest
 import numpy as np
 from src.core.history import History, DrawCommand, AddLayerCommand, RemoveLayerCommand, MoveLayerCommand
@@ -256,3 +257,142 @@ def test_move_layer_command():
     # 撤销
     history.undo()
     assert canvas.layers[0].name == "Background"
+
+
+@pytest.mark.parametrize("pack", [True, False])
+def test_draw_command_stores_changed_region_only(pack):
+    """测试绘图命令只保存变化区域的差异"""
+    layer = Layer(200, 100)
+    layer.data[:, :] = np.random.default_rng(0).random((100, 200)) > 0.5
+    old_data = layer.data.copy()
+    layer.fill_region(20, 10, 31, 14, True)
+    layer.set_pixel(40, 12, not layer.get_pixel(40, 12))
+    new_data = layer.data.copy()
+
+    command = DrawCommand(layer, old_data, new_data, pack=pack)
+    x0, y0, x1, y1 = command.rect
+    assert (x0, y0, x1) == (20, 10, 41)
+    assert y1 <= 14
+    assert command.diff.shape[0] == y1 - y0
+    if pack:
+        assert command.diff.dtype == np.uint8
+
+    command.undo()
+    assert np.array_equal(layer.data, old_data)
+    command.undo()
+    assert np.array_equal(layer.data, old_data)
+    command.execute()
+    assert np.array_equal(layer.data, new_data)
+    command.execute()
+    assert np.array_equal(layer.data, new_data)
+
+
+def test_draw_command_no_change():
+    """测试没有变化的绘图命令"""
+    layer = Layer(10, 10)
+    command = DrawCommand(layer, layer.data.copy(), layer.data)
+
+    assert command.rect is None
+    command.undo()
+    command.execute()
+    assert not layer.data.any()
+
+
+def test_draw_command_packed_layer():
+    """测试打包存储图层上的撤销/重做"""
+    layer = Layer(21, 9, storage="packed")
+    old_data = layer.data
+    layer.fill_region(3, 2, 17, 6, True)
+    new_data = layer.data
+
+    command = DrawCommand(layer, old_data, new_data)
+    command.undo()
+    assert not layer.data.any()
+    command.execute()
+    assert np.array_equal(layer.data, new_data)
+
+
+def _make_stroke(layer, x, y, size):
+    """在图层上画一个方块并返回对应的绘图命令"""
+    old_data = layer.data.copy()
+    layer.fill_region(x, y, x + size, y + size, True)
+    return DrawCommand(layer, old_data, layer.data)
+
+
+def test_history_memory_usage():
+    """测试历史记录的内存统计"""
+    layer = Layer(64, 64)
+    history = History()
+
+    command = _make_stroke(layer, 0, 0, 16)
+    history.add(command)
+
+    assert command.nbytes == 2 * 16 * 2
+    assert history.get_memory_usage() == command.nbytes
+
+
+def test_history_memory_budget_evicts_oldest():
+    """测试超出内存预算时丢弃最旧的命令"""
+    layer = Layer(64, 64)
+    history = History(max_size=50, memory_budget=200)
+
+    commands = [_make_stroke(layer, i * 4, 0, 24) for i in range(5)]
+    for command in commands:
+        history.add(command)
+
+    assert history.get_memory_usage() <= 200
+    assert history.commands[-1] is commands[-1]
+    assert commands[0] not in history.commands
+    assert history.current_index == len(history.commands) - 1
+
+    # 单个命令超出预算时仍然保留
+    history.memory_budget = 1
+    history.add(_make_stroke(layer, 0, 30, 30))
+    assert len(history.commands) == 1
+
+
+def test_history_spill_to_disk():
+    """测试超出内存预算时旧命令溢出到磁盘并能正确撤销"""
+    layer = Layer(64, 64)
+    history = History(max_size=50, memory_budget=150, spill_to_disk=True)
+
+    snapshots = [layer.data.copy()]
+    for i in range(4):
+        history.add(_make_stroke(layer, i * 8, i * 8, 20))
+        snapshots.append(layer.data.copy())
+
+    assert len(history.commands) == 4
+    assert history.get_memory_usage() <= 150
+    assert history.get_disk_usage() > 0
+    spill_dir = history._spill_dir
+
+    # 逐步撤销到初始状态
+    for expected in reversed(snapshots[:-1]):
+        assert history.undo()
+        assert np.array_equal(layer.data, expected)
+
+    # 全部重做
+    while history.redo():
+        pass
+    assert np.array_equal(layer.data, snapshots[-1])
+
+    history.clear()
+    assert not os.path.exists(spill_dir)
+
+
+def test_draw_command_with_offset():
+    """测试只包含修改区域的绘图命令"""
+    layer = Layer(64, 64)
+    layer.begin_snapshot()
+    layer.fill_region(20, 30, 25, 40, True)
+    (x0, y0, x1, y1), old_data = layer.end_snapshot()
+    new_data = layer.get_region(x0, y0, x1, y1)
+
+    command = DrawCommand(layer, old_data, new_data, x=x0, y=y0)
+    assert command.rect == (20, 30, 25, 40)
+
+    command.undo()
+    assert not layer.data.any()
+    command.execute()
+    assert layer.data[30:40, 20:25].all()
+    assert layer.data.sum() == 50
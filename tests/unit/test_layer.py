@@ -95,3 +95,214 @@ def test_get_bounds():
 
     bounds = layer.get_bounds()
     assert bounds == (10, 30, 20, 40)
+
+
+def test_dirty_rect_tracking():
+    """测试已修改区域跟踪"""
+    layer = Layer(100, 100)
+    assert layer.take_dirty_rect() is None
+
+    # set_pixel 累积修改区域
+    layer.set_pixel(10, 20, True)
+    layer.set_pixel(30, 5, True)
+    assert layer.take_dirty_rect() == (10, 5, 31, 21)
+    assert layer.take_dirty_rect() is None
+
+    # 边界外的像素不产生修改区域
+    layer.set_pixel(-1, 0, True)
+    assert layer.take_dirty_rect() is None
+
+    # 手动标记的区域会被裁剪到图层范围
+    layer.mark_dirty(-10, 90, 5, 200)
+    assert layer.take_dirty_rect() == (0, 90, 5, 100)
+
+    # 清空图层标记整个图层
+    layer.clear()
+    assert layer.take_dirty_rect() == (0, 0, 100, 100)
+
+
+def test_revision_counter():
+    """测试修订号在每次修改时递增"""
+    layer = Layer(10, 10)
+    revision = layer.revision
+
+    layer.set_pixel(1, 1, True)
+    assert layer.revision > revision
+    revision = layer.revision
+
+    # 边界外的修改不改变修订号
+    layer.set_pixel(-1, -1, True)
+    assert layer.revision == revision
+
+    layer.clear()
+    assert layer.revision > revision
+    revision = layer.revision
+
+    # 替换数据
+    layer.data = np.ones((10, 10), dtype=bool)
+    assert layer.revision > revision
+    revision = layer.revision
+
+    # 直接修改数据后手动标记
+    layer.data[0, 0] = False
+    layer.mark_dirty(0, 0, 1, 1)
+    assert layer.revision > revision
+
+
+@pytest.mark.parametrize("storage", ["dense", "packed", "tiled"])
+def test_layer_storage_pixel_access(storage):
+    """测试各存储模式的像素读写一致"""
+    layer = Layer(13, 7, storage=storage)
+
+    layer.set_pixel(0, 0, True)
+    layer.set_pixel(12, 6, True)
+    layer.set_pixel(8, 3, True)
+    layer.set_pixel(8, 3, False)
+
+    assert layer.get_pixel(0, 0) is True
+    assert layer.get_pixel(12, 6) is True
+    assert layer.get_pixel(8, 3) is False
+    assert layer.data.sum() == 2
+    assert layer.get_bounds() == (0, 0, 13, 7)
+
+
+def test_packed_layer_regions():
+    """测试打包存储的区域读写与稠密存储一致"""
+    rng = np.random.default_rng(0)
+    dense = Layer(21, 11)
+    packed = Layer(21, 11, storage="packed")
+
+    values = rng.random((6, 9)) > 0.5
+    for layer in (dense, packed):
+        layer.set_region(-2, 3, values)
+        layer.fill_region(10, 0, 17, 4, True)
+        layer.fill_region(15, 2, 30, 3, False)
+
+    assert np.array_equal(packed.data, dense.data)
+    assert np.array_equal(packed.get_region(3, 1, 19, 9), dense.get_region(3, 1, 19, 9))
+    assert np.array_equal(packed.get_packed_rows(), dense.get_packed_rows())
+    assert packed.get_bounds() == dense.get_bounds()
+    assert packed.nbytes == 11 * 3
+
+    # 行尾补齐位保持为 0
+    assert not (packed.get_packed_rows()[:, -1] & 0x07).any()
+
+
+def test_tiled_layer_matches_dense():
+    """测试分块存储的区域读写、打包和边界与稠密存储一致"""
+    rng = np.random.default_rng(1)
+    dense = Layer(150, 70)
+    tiled = Layer(150, 70, storage="tiled")
+
+    values = rng.random((40, 90)) > 0.5
+    for layer in (dense, tiled):
+        layer.set_region(50, 20, values)
+        layer.fill_region(140, 60, 200, 90, True)
+        layer.fill_region(60, 30, 100, 50, False)
+        layer.set_pixel(3, 2, True)
+
+    assert np.array_equal(tiled.data, dense.data)
+    assert np.array_equal(tiled.get_region(30, 10, 149, 69), dense.get_region(30, 10, 149, 69))
+    assert np.array_equal(tiled.get_packed_rows(), dense.get_packed_rows())
+    assert tiled.get_bounds() == dense.get_bounds()
+
+
+def test_tiled_layer_is_sparse():
+    """测试分块存储只为非空块分配内存，清空后释放"""
+    layer = Layer(4096, 4096, storage="tiled")
+    assert layer.nbytes == 0
+    assert layer.get_bounds() == (0, 0, 0, 0)
+
+    layer.set_pixel(4000, 10, True)
+    layer.fill_region(60, 60, 70, 70, True)
+    # 一个块 + 跨越四个块的方块
+    assert layer.nbytes == 5 * 64 * 64
+    assert [(x, y) for x, y, _ in layer.iter_tiles()] == [(0, 0), (64, 0), (3968, 0), (0, 64), (64, 64)]
+    assert layer.get_bounds() == (60, 10, 4001, 70)
+
+    # 写入全白区域不分配块，清除像素后释放块
+    layer.set_region(1000, 1000, np.zeros((200, 200), dtype=bool))
+    layer.set_pixel(4000, 10, False)
+    layer.fill_region(0, 0, 128, 128, False)
+    assert layer.nbytes == 0
+    assert not layer.data.any()
+
+
+def test_packed_layer_data_is_read_only():
+    """测试打包存储的 data 为只读副本，整体赋值和复制正常"""
+    layer = Layer(10, 10, storage="packed")
+
+    with pytest.raises(ValueError):
+        layer.data[0, 0] = True
+
+    layer.data = np.ones((10, 10), dtype=bool)
+    assert layer.get_pixel(9, 9) is True
+
+    copy = layer.copy()
+    assert copy.storage_mode == "packed"
+    assert np.array_equal(copy.data, layer.data)
+
+
+def test_layer_set_storage_mode():
+    """测试切换存储模式保持像素内容"""
+    layer = Layer(10, 10)
+    layer.set_pixel(3, 4, True)
+
+    layer.set_storage_mode("packed")
+    assert layer.storage_mode == "packed"
+    assert layer.get_pixel(3, 4) is True
+
+    layer.set_storage_mode("dense")
+    assert layer.data.flags.writeable
+    assert layer.data.sum() == 1
+
+
+@pytest.mark.parametrize("storage", ["dense", "packed", "tiled"])
+def test_layer_apply_mask_and_set_pixels(storage):
+    """测试批量写入掩码和坐标数组（超出图层的部分被裁剪）"""
+    layer = Layer(10, 8, storage=storage)
+
+    mask = np.zeros((4, 4), dtype=bool)
+    mask[0, 0] = mask[3, 3] = mask[1, 2] = True
+    layer.apply_mask(mask, -1, 6)
+    assert layer.data.sum() == 1
+    assert layer.get_pixel(1, 7)
+    assert layer.take_dirty_rect() == (0, 6, 3, 8)
+
+    layer.set_pixels(np.array([0, 9, 12, -1]), np.array([0, 7, 3, 2]), True)
+    assert layer.get_pixel(0, 0) and layer.get_pixel(9, 7)
+    assert layer.data.sum() == 3
+    assert layer.take_dirty_rect() == (0, 0, 10, 8)
+
+    layer.apply_mask(np.ones((2, 2), dtype=bool), 0, 0, False)
+    assert not layer.get_pixel(0, 0)
+
+    # 完全在图层外或空掩码不标记修改
+    layer.apply_mask(np.ones((2, 2), dtype=bool), 20, 20)
+    layer.set_pixels(np.array([-5]), np.array([-5]))
+    layer.take_dirty_rect()
+    layer.apply_mask(np.zeros((2, 2), dtype=bool), 0, 0)
+    assert layer.take_dirty_rect() is None
+
+
+@pytest.mark.parametrize("storage", ["dense", "packed", "tiled"])
+def test_layer_snapshot_records_modified_region(storage):
+    """测试快照只复制被修改的块，返回修改区域在修改前的数据"""
+    layer = Layer(300, 200, storage=storage)
+    layer.fill_region(0, 0, 300, 200, True)
+    layer.set_pixel(150, 100, False)
+    original = layer.data.copy()
+
+    layer.begin_snapshot()
+    assert layer.end_snapshot() is None
+
+    layer.begin_snapshot()
+    layer.set_pixel(150, 100, True)
+    layer.fill_region(140, 90, 145, 95, False)
+    # 只记录与修改区域相交的块
+    assert len(layer._snapshot) == 1
+    rect, old_region = layer.end_snapshot()
+
+    assert rect == (140, 90, 151, 101)
+    assert np.array_equal(old_region, original[90:101, 140:151])
+    assert layer._snapshot is None
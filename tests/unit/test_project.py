@@ -2,6 +2,7 @@
 import pytest
 import numpy as np
 import tempfile
+import json
 import os
 from pathlib import Path
 
@@ -272,3 +273,420 @@ def test_roundtrip_random_data():
     finally:
         if os.path.exists(temp_path):
             os.unlink(temp_path)
+
+
+@pytest.mark.parametrize("size", [(48, 20), (45, 20)])
+def test_roundtrip_packed_layers(size):
+    """测试打包存储图层的保存结果与稠密存储相同"""
+    width, height = size
+    data = np.random.default_rng(2).random((height, width)) > 0.5
+
+    encoded = []
+    for storage in ("dense", "packed"):
+        canvas = Canvas(width, height, layer_storage=storage)
+        canvas.get_active_layer().data = data
+        encoded.append(Project._encode_layer(canvas.get_active_layer()))
+
+    assert encoded[0] == encoded[1] == Project._encode_layer_data(data)
+
+    # 加载时使用画布的存储模式
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "test.mpx")
+        canvas = Canvas(width, height)
+        canvas.get_active_layer().data = data
+        assert Project(canvas).save(path) is True
+
+        new_canvas = Canvas(1, 1, layer_storage="packed")
+        assert Project(new_canvas).load(path) is True
+        layer = new_canvas.get_active_layer()
+        assert layer.storage_mode == "packed"
+        assert np.array_equal(layer.data, data)
+
+
+def test_roundtrip_tiled_layers():
+    """测试分块存储图层只保存非空块，并能加载到任意存储模式"""
+    canvas = Canvas(300, 200, layer_storage="tiled")
+    layer = canvas.get_active_layer()
+    layer.fill_region(10, 10, 20, 20, True)
+    layer.set_pixel(299, 199, True)
+    expected = layer.data.copy()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "tiled.mpx")
+        assert Project(canvas).save(path) is True
+
+        with open(path, "r", encoding="utf-8") as f:
+            layer_data = json.load(f)["layers"][0]
+        assert "data" not in layer_data
+        assert [item[:2] for item in layer_data["tiles"]["items"]] == [[0, 0], [256, 192]]
+
+        for storage in ("tiled", "dense"):
+            new_canvas = Canvas(1, 1, layer_storage=storage)
+            assert Project(new_canvas).load(path) is True
+            new_layer = new_canvas.get_active_layer()
+            assert new_layer.storage_mode == storage
+            assert np.array_equal(new_layer.data, expected)
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+@pytest.mark.parametrize("storage", ["dense", "packed", "tiled"])
+def test_roundtrip_binary_container(storage, compression):
+    """测试二进制容器格式保存和加载位图图层与文本图层"""
+    from src.core.text_object import TextObject
+
+    canvas = Canvas(150, 70, layer_storage=storage)
+    bitmap = canvas.get_active_layer()
+    bitmap.data = np.random.default_rng(3).random((70, 150)) > 0.7
+    bitmap.locked = True
+    canvas.add_text_layer(TextObject("Hi", "Arial", 12, (4, 5)), name="标题")
+    canvas.add_layer("空图层")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "test.mpxb")
+        project = Project(canvas)
+        project.compression = compression
+        assert project.save(path) is True
+        assert project.file_path == path
+
+        with open(path, "rb") as f:
+            assert f.read(4) == b"MPXB"
+
+        new_canvas = Canvas(1, 1, layer_storage=storage)
+        assert Project(new_canvas).load(path) is True
+        assert (new_canvas.width, new_canvas.height) == (150, 70)
+        assert [layer.name for layer in new_canvas.layers] == [
+            layer.name for layer in canvas.layers
+        ]
+
+        new_bitmap = new_canvas.layers[0]
+        assert new_bitmap.storage_mode == storage
+        assert new_bitmap.locked is True
+        assert np.array_equal(new_bitmap.data, bitmap.data)
+        assert new_canvas.layers[1].text_object.text == "Hi"
+        assert not new_canvas.layers[2].data.any()
+
+
+def test_binary_save_format_by_extension():
+    """测试保存格式由扩展名决定，可通过参数覆盖"""
+    canvas = Canvas(16, 16)
+    canvas.get_active_layer().set_pixel(3, 4, True)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_path = os.path.join(temp_dir, "test.mpx")
+        binary_path = os.path.join(temp_dir, "forced.mpx")
+        assert Project(canvas).save(json_path) is True
+        assert Project(canvas).save(binary_path, binary=True) is True
+
+        with open(json_path, "r", encoding="utf-8") as f:
+            assert json.load(f)["version"]
+
+        # 加载时按文件头识别格式
+        for path in (json_path, binary_path):
+            new_canvas = Canvas(1, 1)
+            assert Project(new_canvas).load(path) is True
+            assert new_canvas.get_active_layer().get_pixel(3, 4)
+
+
+def test_load_corrupt_binary_container():
+    """测试加载损坏的二进制容器返回 False"""
+    canvas = Canvas(32, 32)
+    canvas.get_active_layer().fill_region(0, 0, 10, 10, True)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "test.mpxb")
+        assert Project(canvas).save(path) is True
+
+        with open(path, "rb") as f:
+            content = f.read()
+        with open(path, "wb") as f:
+            f.write(content[:len(content) - 8])
+
+        assert Project(Canvas(1, 1)).load(path) is False
+
+        with open(path, "wb") as f:
+            f.write(b"MPXB")
+        assert Project(Canvas(1, 1)).load(path) is False
+
+
+@pytest.mark.parametrize("file_name", ["lazy.mpx", "lazy.mpxb"])
+def test_lazy_load_decodes_on_access(file_name):
+    """测试延迟加载只在访问像素数据时解码，隐藏图层合成时不解码"""
+    from src.core.text_object import TextObject
+
+    canvas = Canvas(40, 30)
+    visible = canvas.get_active_layer()
+    visible.fill_region(2, 3, 12, 9, True)
+    hidden = canvas.add_layer("隐藏")
+    hidden.set_pixel(20, 20, True)
+    hidden.visible = False
+    canvas.add_text_layer(TextObject("Hi", "Arial", 12, (4, 5)), name="文本")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, file_name)
+        assert Project(canvas).save(path) is True
+
+        new_canvas = Canvas(1, 1)
+        project = Project(new_canvas)
+        assert project.load(path, lazy=True) is True
+        new_visible, new_hidden, new_text = new_canvas.layers
+
+        # 图层属性立即可用，像素数据还未解码
+        assert [layer.name for layer in new_canvas.layers] == ["Background", "隐藏", "文本"]
+        assert new_hidden.visible is False
+        assert new_text.text_object.text == "Hi"
+        assert not new_visible.is_loaded and not new_hidden.is_loaded
+        assert new_visible.has_bitmap and new_visible.nbytes == 0
+
+        # 合成只加载可见图层
+        assert np.array_equal(new_canvas.merge_visible_layers_packed(),
+                              canvas.merge_visible_layers_packed())
+        assert new_visible.is_loaded
+        assert not new_hidden.is_loaded
+
+        # 编辑会先加载原有像素
+        new_hidden.set_pixel(0, 0, True)
+        assert new_hidden.get_pixel(20, 20)
+
+        # 保存到原文件前加载剩余图层
+        assert project.save() is True
+        reloaded = Canvas(1, 1)
+        assert Project(reloaded).load(path) is True
+        assert np.array_equal(reloaded.layers[0].data, visible.data)
+        assert reloaded.layers[1].get_pixel(0, 0) and reloaded.layers[1].get_pixel(20, 20)
+
+
+def test_lazy_load_storage_mode_switch():
+    """测试未加载的图层切换存储模式后按新模式解码"""
+    canvas = Canvas(100, 50)
+    canvas.get_active_layer().fill_region(5, 5, 60, 40, True)
+    expected = canvas.get_active_layer().data.copy()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "lazy.mpxb")
+        assert Project(canvas).save(path) is True
+
+        new_canvas = Canvas(1, 1)
+        assert Project(new_canvas).load(path, lazy=True) is True
+        layer = new_canvas.get_active_layer()
+        layer.set_storage_mode("tiled")
+        assert not layer.is_loaded
+
+        assert np.array_equal(layer.data, expected)
+        assert layer.storage_mode == "tiled"
+        assert layer.nbytes > 0
+
+
+def test_incremental_save_reuses_unchanged_blobs(monkeypatch):
+    """测试增量保存只重新编码修改过的图层，未修改的延迟加载图层保持未加载"""
+    rng = np.random.default_rng(4)
+    canvas = Canvas(64, 32)
+    canvas.get_active_layer().data = rng.random((32, 64)) > 0.5
+    for name in ("第二层", "第三层"):
+        canvas.add_layer(name).data = rng.random((32, 64)) > 0.5
+
+    encoded = []
+    encode = Project._encode_layer_blob
+    monkeypatch.setattr(Project, "_encode_layer_blob",
+                        staticmethod(lambda layer: encoded.append(layer.name) or encode(layer)))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "incremental.mpxb")
+        assert Project(canvas).save(path) is True
+        assert encoded == ["Background", "第二层", "第三层"]
+
+        new_canvas = Canvas(1, 1)
+        project = Project(new_canvas)
+        assert project.load(path, lazy=True) is True
+        first, second, third = new_canvas.layers
+
+        # 没有修改时不重新编码
+        encoded.clear()
+        assert project.save() is True
+        assert encoded == []
+        assert not any(layer.is_loaded for layer in new_canvas.layers)
+
+        # 加载本身不算修改，只有编辑过的图层重新编码
+        assert np.array_equal(first.data, canvas.layers[0].data)
+        second.set_pixel(0, 0, not second.get_pixel(0, 0))
+        assert project.save() is True
+        assert encoded == ["第二层"]
+        assert not third.is_loaded
+
+        # 切换压缩方式需要重新编码所有图层
+        encoded.clear()
+        project.compression = "none"
+        assert project.save() is True
+        assert encoded == ["Background", "第二层", "第三层"]
+
+        reloaded = Canvas(1, 1)
+        assert Project(reloaded).load(path) is True
+        expected = [layer.data for layer in canvas.layers]
+        expected[1] = second.data
+        for layer, data in zip(reloaded.layers, expected):
+            assert np.array_equal(layer.data, data)
+        assert os.listdir(temp_dir) == ["incremental.mpxb"]
+
+
+def test_save_failure_keeps_original_file(monkeypatch):
+    """测试替换文件失败时原文件不变，延迟加载的图层仍可读取"""
+    canvas = Canvas(32, 16)
+    canvas.get_active_layer().fill_region(0, 0, 8, 8, True)
+    expected = canvas.get_active_layer().data.copy()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "atomic.mpxb")
+        assert Project(canvas).save(path) is True
+        with open(path, "rb") as f:
+            original = f.read()
+
+        new_canvas = Canvas(1, 1)
+        project = Project(new_canvas)
+        assert project.load(path, lazy=True) is True
+        new_canvas.add_layer("新图层").set_pixel(1, 1, True)
+
+        def fail_replace(src, dst):
+            raise PermissionError("文件被占用")
+
+        monkeypatch.setattr("src.core.project.os.replace", fail_replace)
+        assert project.save() is False
+
+        with open(path, "rb") as f:
+            assert f.read() == original
+        assert os.listdir(temp_dir) == ["atomic.mpxb"]
+        assert np.array_equal(new_canvas.layers[0].data, expected)
+
+
+@pytest.mark.parametrize("storage", ["dense", "packed", "tiled"])
+@pytest.mark.parametrize("file_name", ["resize.mpx", "resize.mpxb"])
+def test_lazy_load_then_resize(storage, file_name):
+    """测试延迟加载的图层在调整画布大小前按原尺寸解码"""
+    canvas = Canvas(20, 10, layer_storage=storage)
+    layer = canvas.get_active_layer()
+    layer.set_pixel(3, 4, True)
+    layer.set_pixel(19, 9, True)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, file_name)
+        assert Project(canvas).save(path) is True
+
+        new_canvas = Canvas(1, 1, layer_storage=storage)
+        assert Project(new_canvas).load(path, lazy=True) is True
+        new_canvas.resize(30, 15)
+
+        resized = new_canvas.get_active_layer()
+        assert resized.data.shape == (15, 30)
+        assert list(zip(*np.nonzero(resized.data))) == [(4, 3), (9, 19)]
+
+
+@pytest.mark.parametrize("file_name", ["corrupt.mpx", "corrupt.mpxb"])
+def test_lazy_load_reports_corrupt_layers(file_name):
+    """测试延迟加载的图层解码失败时记入 load_errors，而不是静默变成空白"""
+    canvas = Canvas(16, 8)
+    canvas.get_active_layer().fill_region(0, 0, 8, 8, True)
+    canvas.add_layer("正常").set_pixel(1, 1, True)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, file_name)
+        assert Project(canvas).save(path) is True
+
+        if file_name.endswith(".mpx"):
+            with open(path, "r", encoding="utf-8") as f:
+                project_data = json.load(f)
+            project_data["layers"][0]["data"] = "!!不是base64!!"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(project_data, f)
+        else:
+            # 破坏第一个图层的 zlib 数据块（索引表不变，只有解压时才能发现）
+            from src.core.project_container import ContainerReader
+            with ContainerReader(path) as reader:
+                offset = reader.index[0][0]
+            with open(path, "r+b") as f:
+                f.seek(offset)
+                f.write(b"\xff" * 4)
+
+        new_canvas = Canvas(1, 1)
+        new_project = Project(new_canvas)
+        assert new_project.load(path, lazy=True) is True
+        assert new_project.load_errors == []
+
+        new_canvas.merge_visible_layers()
+        assert len(new_project.load_errors) == 1
+        assert "Background" in new_project.load_errors[0]
+        assert new_canvas.layers[1].get_pixel(1, 1)
+
+        # 立即加载时跳过损坏的图层并同样记录
+        eager = Project(Canvas(1, 1))
+        assert eager.load(path) is True
+        assert [layer.name for layer in eager.canvas.layers] == ["正常"]
+        assert len(eager.load_errors) == 1
+
+
+def test_lazy_load_checks_blob_sizes():
+    """测试延迟加载时数据块大小与图层尺寸不符的图层在加载时就被跳过"""
+    from src.core.project_container import write_container, ENCODING_ROWS
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "bad.mpxb")
+        canvas = Canvas(16, 8)
+        canvas.add_layer("正常")
+        meta = Project(canvas)._build_project_data(include_bitmaps=False)
+        write_container(path, meta, [(ENCODING_ROWS, b"\x00" * 3), (ENCODING_ROWS, b"\x00" * 16)])
+
+        project = Project(Canvas(1, 1))
+        assert project.load(path, lazy=True) is True
+        assert [layer.name for layer in project.canvas.layers] == ["正常"]
+        assert len(project.load_errors) == 1
+
+
+def test_load_rejects_newer_version():
+    """测试拒绝加载版本高于当前支持版本的项目，旧版本仍可加载"""
+    canvas = Canvas(16, 16)
+    canvas.get_active_layer().set_pixel(1, 2, True)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "test.mpx")
+        assert Project(canvas).save(path) is True
+        with open(path, "r", encoding="utf-8") as f:
+            project_data = json.load(f)
+        assert project_data["version"] == Project.VERSION
+
+        for version, expected in (("1.0", True), ("1.2", False), ("2.0", False), ("abc", False)):
+            project_data["version"] = version
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(project_data, f)
+            new_canvas = Canvas(1, 1)
+            assert Project(new_canvas).load(path) is expected
+            if expected:
+                assert new_canvas.get_active_layer().get_pixel(1, 2)
+
+
+def test_load_closes_previous_reader():
+    """测试加载另一个项目时关闭上一个文件的读取器"""
+    canvas = Canvas(16, 16)
+    canvas.get_active_layer().set_pixel(1, 1, True)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        binary_path = os.path.join(temp_dir, "test.mpxb")
+        json_path = os.path.join(temp_dir, "test.mpx")
+        assert Project(canvas).save(binary_path) is True
+        assert Project(canvas).save(json_path) is True
+
+        new_canvas = Canvas(1, 1)
+        project = Project(new_canvas)
+        assert project.load(binary_path, lazy=True) is True
+        first = project._reader
+        assert project.load(binary_path, lazy=True) is True
+        second = project._reader
+        assert first._file.closed and not second._file.closed
+
+        assert project.load(json_path, lazy=True) is True
+        assert project._reader is None
+        assert second._file.closed
+        assert new_canvas.get_active_layer().get_pixel(1, 1)
+
+        # 丢弃项目时可以不加载未加载的图层
+        assert project.load(binary_path, lazy=True) is True
+        layer = new_canvas.get_active_layer()
+        project.close_file(load_pending=False)
+        assert project._reader is None
+        assert not layer.is_loaded
@@ -216,3 +216,84 @@ def test_calculate_resized_rect(select_tool):
     select_tool.resize_handle = 's'
     new_rect = select_tool._calculate_resized_rect(20, 35)
     assert new_rect == (10, 10, 20, 25)
+
+
+def _scale_reference(data, target_width, target_height):
+    """参考实现：逐像素最近邻插值"""
+    src_height, src_width = data.shape
+    result = np.zeros((target_height, target_width), dtype=bool)
+    scale_x = src_width / target_width
+    scale_y = src_height / target_height
+    for y in range(target_height):
+        for x in range(target_width):
+            src_x = min(int(x * scale_x), src_width - 1)
+            src_y = min(int(y * scale_y), src_height - 1)
+            result[y, x] = data[src_y, src_x]
+    return result
+
+
+@pytest.mark.parametrize("source,target", [
+    ((12, 9), (4, 3)),     # 整数倍缩小
+    ((5, 7), (15, 21)),    # 整数倍放大（1/3 的浮点误差）
+    ((10, 10), (7, 13)),   # 非整数倍
+    ((6, 4), (6, 4)),      # 原尺寸
+    ((1, 1), (5, 3)),
+])
+def test_scale_selection_matches_reference(select_tool, source, target):
+    """测试向量化缩放与逐像素最近邻插值结果完全相同"""
+    data = np.random.default_rng(sum(source + target)).random(source) > 0.5
+    target_height, target_width = target
+
+    scaled = select_tool._scale_selection(data, (0, 0, target_width, target_height))
+
+    assert np.array_equal(scaled, _scale_reference(data, target_width, target_height))
+
+
+def test_floating_selection_during_move():
+    """测试移动选区时只提供浮动位图，释放时才写入图层"""
+    canvas = Canvas(40, 40)
+    select_tool = SelectTool(canvas)
+    layer = canvas.get_active_layer()
+    layer.data[5:25, 5:25] = True
+
+    select_tool.on_press(5, 5, Qt.KeyboardModifier.NoModifier)
+    select_tool.on_drag(25, 25, Qt.KeyboardModifier.NoModifier)
+    select_tool.on_release(25, 25, Qt.KeyboardModifier.NoModifier)
+    assert select_tool.get_floating_selection() is None
+
+    select_tool.on_press(15, 15, Qt.KeyboardModifier.NoModifier)
+    select_tool.on_drag(19, 13, Qt.KeyboardModifier.NoModifier)
+    before = layer.data.copy()
+
+    bitmap, x, y, cleared_rect = select_tool.get_floating_selection()
+    assert (x, y) == (9, 3)
+    assert cleared_rect == (5, 5, 25, 25)
+    assert bitmap.shape == (20, 20) and bitmap.all()
+    # 拖动过程中图层数据不变
+    assert np.array_equal(layer.data, before)
+
+    select_tool.on_release(19, 13, Qt.KeyboardModifier.NoModifier)
+    assert select_tool.get_floating_selection() is None
+    assert layer.data[3:23, 9:29].all()
+    assert layer.data.sum() == 400
+
+
+def test_floating_selection_during_resize():
+    """测试缩放选区时浮动位图为缩放后的数据"""
+    canvas = Canvas(40, 40)
+    select_tool = SelectTool(canvas)
+    layer = canvas.get_active_layer()
+    layer.data[5:25, 5:25] = True
+
+    select_tool.on_press(5, 5, Qt.KeyboardModifier.NoModifier)
+    select_tool.on_drag(25, 25, Qt.KeyboardModifier.NoModifier)
+    select_tool.on_release(25, 25, Qt.KeyboardModifier.NoModifier)
+
+    # 拖拽右下角手柄放大到 30x30
+    select_tool.on_press(25, 25, Qt.KeyboardModifier.NoModifier)
+    select_tool.on_drag(35, 35, Qt.KeyboardModifier.NoModifier)
+
+    bitmap, x, y, _ = select_tool.get_floating_selection()
+    assert (x, y) == (5, 5)
+    assert bitmap.shape == (30, 30)
+    assert select_tool.get_floating_selection()[0] is bitmap
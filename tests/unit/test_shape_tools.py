@@ -0,0 +1,127 @@
+"""形状工具单元测试"""
+import pytest
+import numpy as np
+from PyQt6.QtCore import Qt
+
+from src.core.canvas import Canvas
+from src.tools.line import LineTool
+from src.tools.rectangle import RectangleTool
+from src.tools.circle import CircleTool
+from src.tools.bucket_fill import BucketFillTool
+from src.utils.geometry import rectangle_outline, filled_rectangle, bresenham_circle, filled_circle
+from src.utils.constants import FILL_MODE_OUTLINE, FILL_MODE_FILLED, FILL_MODE_BOTH
+
+NO_MODIFIER = Qt.KeyboardModifier.NoModifier
+
+
+@pytest.fixture
+def canvas():
+    """创建测试画布"""
+    return Canvas(40, 30)
+
+
+def _points_to_data(points, width=40, height=30):
+    """坐标列表转换为位图（忽略超出范围的点）"""
+    data = np.zeros((height, width), dtype=bool)
+    for x, y in points:
+        if 0 <= x < width and 0 <= y < height:
+            data[y, x] = True
+    return data
+
+
+def _drag(tool, start, end):
+    """模拟一次按下-拖拽-释放"""
+    tool.on_press(*start, NO_MODIFIER)
+    tool.on_drag(*end, NO_MODIFIER)
+    tool.on_release(*end, NO_MODIFIER)
+
+
+def test_line_tool_matches_preview(canvas):
+    """测试直线工具绘制结果与预览点一致"""
+    tool = LineTool(canvas)
+    tool.on_press(-5, 3, NO_MODIFIER)
+    tool.on_drag(33, 41, NO_MODIFIER)
+    expected = _points_to_data(tool.get_preview_points())
+    tool.on_release(33, 41, NO_MODIFIER)
+
+    assert np.array_equal(canvas.get_active_layer().data, expected)
+
+
+@pytest.mark.parametrize("fill_mode", [FILL_MODE_OUTLINE, FILL_MODE_FILLED, FILL_MODE_BOTH])
+def test_rectangle_tool_matches_points(canvas, fill_mode):
+    """测试矩形工具绘制结果与坐标列表一致"""
+    tool = RectangleTool(canvas, fill_mode)
+    _drag(tool, (30, 25), (-3, 4))
+
+    points = rectangle_outline(30, 25, -3, 4)
+    if fill_mode != FILL_MODE_OUTLINE:
+        points += filled_rectangle(30, 25, -3, 4)
+    expected = _points_to_data(points)
+    assert np.array_equal(canvas.get_active_layer().data, expected)
+
+
+@pytest.mark.parametrize("fill_mode", [FILL_MODE_OUTLINE, FILL_MODE_FILLED, FILL_MODE_BOTH])
+def test_circle_tool_matches_points(canvas, fill_mode):
+    """测试圆形工具绘制结果与坐标列表一致"""
+    tool = CircleTool(canvas, fill_mode)
+    _drag(tool, (35, 10), (35, 22))
+
+    points = bresenham_circle(35, 10, 12) if fill_mode != FILL_MODE_FILLED else []
+    if fill_mode != FILL_MODE_OUTLINE:
+        points += filled_circle(35, 10, 12)
+    expected = _points_to_data(points)
+    assert np.array_equal(canvas.get_active_layer().data, expected)
+
+
+@pytest.mark.parametrize("tool_class", [LineTool, RectangleTool, CircleTool])
+def test_preview_mask_matches_result(canvas, tool_class):
+    """测试预览掩码与释放后的绘制结果一致，且拖拽过程中不修改图层"""
+    tool = tool_class(canvas)
+    tool.on_press(20, 15, NO_MODIFIER)
+    tool.on_drag(26, 10, NO_MODIFIER)
+    assert not canvas.get_active_layer().data.any()
+
+    mask, x, y = tool.get_preview_mask()
+    expected = np.zeros((30, 40), dtype=bool)
+    ys, xs = np.nonzero(mask)
+    expected[ys + y, xs + x] = True
+    assert tool.get_preview_points() == list(zip((xs + x).tolist(), (ys + y).tolist()))
+
+    tool.on_release(26, 10, NO_MODIFIER)
+    assert tool.get_preview_mask() is None
+    assert np.array_equal(canvas.get_active_layer().data, expected)
+
+
+def test_bucket_fill_tool(canvas):
+    """测试油漆桶工具填充封闭区域"""
+    layer = canvas.get_active_layer()
+    layer.fill_region(5, 5, 15, 15, True)
+    layer.fill_region(6, 6, 14, 14, False)
+
+    tool = BucketFillTool(canvas)
+    tool.on_press(10, 10, NO_MODIFIER)
+
+    assert layer.get_region(5, 5, 15, 15).all()
+    assert layer.data.sum() == 100
+
+    # 点击黑色像素填充为白色
+    tool.on_press(5, 5, NO_MODIFIER)
+    assert not layer.data.any()
+
+
+def test_end_draw_returns_modified_region(canvas):
+    """测试结束绘制时只返回本次绘制修改的区域"""
+    layer = canvas.get_active_layer()
+    layer.set_pixel(0, 0, True)
+
+    tool = RectangleTool(canvas, FILL_MODE_FILLED)
+    tool.on_press(10, 5, NO_MODIFIER)
+    tool.on_drag(14, 8, NO_MODIFIER)
+    tool.on_release(14, 8, NO_MODIFIER)
+    old_data, new_data, x, y = tool.end_draw()
+
+    assert (x, y) == (10, 5)
+    assert old_data.shape == new_data.shape == (4, 5)
+    assert not old_data.any()
+    assert new_data.all()
+    assert tool.end_draw() is None
@@ -90,3 +90,126 @@ def test_calculate_squeeze_ratio(text_service):
     # 零宽度
     ratio3 = text_service._calculate_squeeze_ratio(' ', 0, 12)
     assert ratio3 == 0.5
+
+
+def test_render_cache_hit_and_miss(text_service):
+    """测试渲染结果缓存命中与未命中"""
+    font = QFont("Arial")
+    font.setPixelSize(12)
+
+    first = text_service.render_text("Hello", font)
+    assert text_service.get_cache_info()['misses'] == 1
+    assert text_service.get_cache_info()['hits'] == 0
+
+    second = text_service.render_text("Hello", font)
+    assert second is first
+    assert text_service.get_cache_info()['hits'] == 1
+
+    # 任一参数不同都重新渲染
+    text_service.render_text("Hello", font, letter_spacing=2)
+    text_service.render_text("Hello", font, squeeze_halfwidth=False)
+    font_large = QFont("Arial")
+    font_large.setPixelSize(20)
+    text_service.render_text("Hello", font_large)
+    assert text_service.get_cache_info()['misses'] == 4
+
+
+def test_render_cache_is_read_only(text_service):
+    """测试缓存的位图为只读"""
+    font = QFont("Arial")
+    font.setPixelSize(12)
+    bitmap = text_service.render_text("A", font)
+
+    with pytest.raises(ValueError):
+        bitmap[0, 0] = True
+
+
+def test_render_cache_lru_eviction(qapp):
+    """测试缓存超出容量时淘汰最久未使用的条目"""
+    text_service = TextService(FontManager(), cache_size=2)
+    font = QFont("Arial")
+    font.setPixelSize(12)
+
+    text_service.render_text("A", font)
+    text_service.render_text("B", font)
+    text_service.render_text("A", font)  # A 变为最近使用
+    text_service.render_text("C", font)  # 淘汰 B
+
+    info = text_service.get_cache_info()
+    assert info['size'] == 2
+    assert info['max_size'] == 2
+
+    text_service.render_text("A", font)
+    assert text_service.get_cache_info()['hits'] == 2
+    text_service.render_text("B", font)
+    assert text_service.get_cache_info()['misses'] == 4
+
+    text_service.clear_cache()
+    assert text_service.get_cache_info() == {'hits': 0, 'misses': 0, 'size': 0, 'max_size': 2}
+
+
+def test_render_text_object(text_service):
+    """测试按文本对象渲染"""
+    from src.core.text_object import TextObject
+
+    text_object = TextObject("AB", "Arial", 12, (0, 0), letter_spacing=1)
+    bitmap = text_service.render_text_object(text_object)
+
+    font = QFont("Arial")
+    font.setPixelSize(12)
+    expected = text_service.render_text("AB", font, letter_spacing=1)
+    assert np.array_equal(bitmap, expected)
+
+
+def _render_line_reference(text_service, text, font, squeeze_halfwidth, letter_spacing):
+    """参考实现：在整行图像上逐字符调用 QPainter.drawText"""
+    from PyQt6.QtCore import Qt, QRect
+    from PyQt6.QtGui import QImage, QPainter, QColor
+
+    widths = [text_service._calculate_char_width(c, font, squeeze_halfwidth) for c in text]
+    total_width = sum(widths) + letter_spacing * (len(text) - 1)
+    height = text_service._get_atlas(font).height
+
+    image = QImage(total_width, height, QImage.Format.Format_ARGB32)
+    image.fill(Qt.GlobalColor.white)
+    painter = QPainter(image)
+    painter.setFont(font)
+    painter.setPen(QColor(0, 0, 0))
+    x_offset = 0
+    for char, width in zip(text, widths):
+        rect = QRect(x_offset, 0, width, height)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, char)
+        x_offset += width + letter_spacing
+    painter.end()
+    return text_service._image_to_bitmap(image)
+
+
+@pytest.mark.parametrize("text,squeeze,spacing", [
+    ("Hello World", False, 0),
+    ("Hello World", True, 0),
+    ("AB12中文", True, 2),
+    ("中文测试", False, 1),
+])
+def test_glyph_atlas_matches_reference(text_service, text, squeeze, spacing):
+    """测试字形图集拼接结果与逐字符 QPainter 渲染一致"""
+    font = QFont("Arial", 12)
+    expected = _render_line_reference(text_service, text, font, squeeze, spacing)
+    result = text_service._render_single_line(text, font, squeeze, spacing)
+
+    assert result.shape == expected.shape
+    assert np.array_equal(result, expected)
+
+
+def test_glyph_atlas_memoization(text_service):
+    """测试同一字体的字符宽度和字形只计算一次"""
+    font = QFont("Arial", 12)
+    text_service._render_single_line("aaa", font, False, 0)
+    atlas = text_service._get_atlas(font)
+
+    assert text_service._get_atlas(QFont("Arial", 12)) is atlas
+    assert list(atlas._advances) == ["a"]
+    assert len(atlas._glyphs) == 1
+
+    # 清空缓存同时清空图集
+    text_service.clear_cache()
+    assert text_service._get_atlas(font) is not atlas